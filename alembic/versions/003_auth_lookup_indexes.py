@@ -0,0 +1,49 @@
+"""Expression indexes for organization auth lookups.
+
+Login and the auth fallback resolve an organization from
+``additional_information->>'supabase_user_id'`` and ``contact->>'email'``.
+Databases created before those indexes were added to the setup scripts
+sequentially scan ``organizations`` for every lookup.
+
+``user_roles`` lookups now compare ``user_id`` as a uuid and use the existing
+``idx_user_roles_user_id``; it is (re)created here in case it is missing.
+
+Indexes are built CONCURRENTLY so the migration does not block writes.
+Plans before/after can be compared with
+``app/scripts/benchmark_auth_lookup_indexes.py``.
+
+Revision ID: 003_auth_lookup_indexes
+Revises: 002_service_rota_schema
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "003_auth_lookup_indexes"
+down_revision: Union[str, None] = "002_service_rota_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_organizations_supabase_user_id "
+            "ON organizations ((additional_information->>'supabase_user_id'))"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_organizations_contact_email "
+            "ON organizations ((contact->>'email'))"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_roles_user_id "
+            "ON user_roles (user_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_organizations_contact_email")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_organizations_supabase_user_id")
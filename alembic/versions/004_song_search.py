@@ -0,0 +1,52 @@
+"""Full-text and trigram search for songs.
+
+Adds a stored ``search_vector`` (title weighted A, artist B, lyrics C) with a
+GIN index, and pg_trgm GIN indexes on title/artist for fuzzy and prefix
+matching. The 'simple' text search configuration is used because song
+libraries mix languages and stemming English words would mangle the rest.
+
+Adding a stored generated column rewrites ``songs`` once.
+
+Revision ID: 004_song_search
+Revises: 003_auth_lookup_indexes
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "004_song_search"
+down_revision: Union[str, None] = "003_auth_lookup_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        ALTER TABLE songs ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(artist, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(lyrics, '')), 'C')
+        ) STORED
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_songs_search_vector ON songs USING GIN (search_vector)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_songs_title_trgm ON songs USING GIN (title gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_songs_artist_trgm ON songs USING GIN (artist gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_songs_artist_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_songs_title_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_songs_search_vector")
+    op.execute("ALTER TABLE songs DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,35 @@
+"""Composite index for expense reports and listings.
+
+``/expense/summary`` and the organization expense listing filter on
+``organization_id`` and range/sort on ``expense_date``. With separate
+single-column indexes Postgres has to bitmap-combine them or sort; the
+composite index serves both the date range and the order directly.
+
+Built CONCURRENTLY so the migration does not block writes.
+
+Revision ID: 005_expense_summary_index
+Revises: 004_song_search
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "005_expense_summary_index"
+down_revision: Union[str, None] = "004_song_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_expenses_org_expense_date "
+            "ON expenses (organization_id, expense_date)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_expenses_org_expense_date")
@@ -0,0 +1,63 @@
+"""Monthly account ledger rollups.
+
+``account_monthly_rollups`` keeps paid in/out totals and entry counts per
+organization, UTC month and payment type. The account service updates it in
+the same transaction as every insert/update/delete on ``accounts``, so
+``/account/ledger`` reads one row per month instead of the whole history.
+
+Existing data is backfilled here. ``accounts`` also gets an
+(organization_id, date) index for the partial-month part of balance-as-of.
+
+Revision ID: 006_account_monthly_rollups
+Revises: 005_expense_summary_index
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "006_account_monthly_rollups"
+down_revision: Union[str, None] = "005_expense_summary_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS account_monthly_rollups (
+            organization_id UUID NOT NULL,
+            month DATE NOT NULL,
+            payment_type VARCHAR(10) NOT NULL DEFAULT '',
+            paid_in DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            paid_out DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            entry_count INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+            PRIMARY KEY (organization_id, month, payment_type)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO account_monthly_rollups (organization_id, month, payment_type, paid_in, paid_out, entry_count)
+        SELECT
+            organization_id,
+            date_trunc('month', date AT TIME ZONE 'UTC')::DATE,
+            COALESCE(payment_type, ''),
+            SUM(COALESCE(paid_in, 0)),
+            SUM(COALESCE(paid_out, 0)),
+            COUNT(*)
+        FROM accounts
+        GROUP BY 1, 2, 3
+        ON CONFLICT (organization_id, month, payment_type) DO NOTHING
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_accounts_org_date ON accounts (organization_id, date)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_accounts_org_date")
+    op.execute("DROP TABLE IF EXISTS account_monthly_rollups")
@@ -0,0 +1,239 @@
+"""Denormalized user role overview projection.
+
+``user_role_overviews`` holds one row per ``user_roles`` row with the role's
+details copied in, so ``/user-role/get-overview`` reads one indexed table
+instead of joining on every request. Triggers on ``user_roles`` (insert,
+update, delete) and ``roles`` (update) keep it current; role deletes cascade
+through ``user_roles``. ``user_role_overview_versions`` is bumped by
+statement triggers, once per organization a statement changed, and backs the
+endpoint's ETag.
+
+Same objects as ``app/scripts/create_user_role_overviews.sql``.
+
+Revision ID: 007_user_role_overviews
+Revises: 006_account_monthly_rollups
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "007_user_role_overviews"
+down_revision: Union[str, None] = "006_account_monthly_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSION_TRIGGER_EVENTS = (
+    ("INSERT", "NEW TABLE AS new_rows"),
+    ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("DELETE", "OLD TABLE AS old_rows"),
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_role_overviews (
+            id UUID PRIMARY KEY,
+            organization_id UUID NOT NULL,
+            user_id UUID NOT NULL,
+            role_id UUID,
+            team_id UUID,
+            created_at TIMESTAMP WITH TIME ZONE,
+            updated_at TIMESTAMP WITH TIME ZONE,
+            role_name TEXT,
+            role_description TEXT,
+            role_type TEXT,
+            role_permissions JSONB,
+            role_team_id UUID,
+            role_organization_id UUID,
+            role_created_at TIMESTAMP WITH TIME ZONE,
+            role_updated_at TIMESTAMP WITH TIME ZONE
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_role_overviews_organization_id ON user_role_overviews(organization_id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_role_overviews_user_id ON user_role_overviews(user_id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_role_overviews_role_id ON user_role_overviews(role_id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_role_overviews_team_id ON user_role_overviews(team_id)"
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_role_overview_versions (
+            organization_id UUID PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 1,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_user_role_overview_version(org UUID)
+        RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO user_role_overview_versions (organization_id) VALUES (org)
+            ON CONFLICT (organization_id) DO UPDATE
+                SET version = user_role_overview_versions.version + 1, updated_at = NOW();
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_user_role_overview()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM user_role_overviews WHERE id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO user_role_overviews
+                SELECT
+                    NEW.id, NEW.organization_id, NEW.user_id, NEW.role_id, NEW.team_id,
+                    NEW.created_at, NEW.updated_at,
+                    r.name, r.description, r.type, r.permissions, r.team_id,
+                    r.organization_id, r.created_at, r.updated_at
+                FROM (SELECT 1) AS one
+                LEFT JOIN roles r ON r.id = NEW.role_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trigger_sync_user_role_overview ON user_roles")
+    op.execute(
+        """
+        CREATE TRIGGER trigger_sync_user_role_overview
+            AFTER INSERT OR UPDATE OR DELETE ON user_roles
+            FOR EACH ROW
+            EXECUTE FUNCTION sync_user_role_overview()
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_user_role_overview_versions()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM bump_user_role_overview_version(o.org)
+                FROM (SELECT DISTINCT organization_id AS org FROM new_rows ORDER BY 1) AS o;
+            ELSIF TG_OP = 'UPDATE' THEN
+                PERFORM bump_user_role_overview_version(o.org)
+                FROM (
+                    SELECT organization_id AS org FROM old_rows
+                    UNION SELECT organization_id FROM new_rows
+                    ORDER BY 1
+                ) AS o;
+            ELSE
+                PERFORM bump_user_role_overview_version(o.org)
+                FROM (SELECT DISTINCT organization_id AS org FROM old_rows ORDER BY 1) AS o;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Transition tables are only allowed on single-event triggers.
+    for event, referencing in VERSION_TRIGGER_EVENTS:
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_user_role_overview_version_{event.lower()} ON user_roles")
+        op.execute(
+            f"""
+            CREATE TRIGGER trigger_user_role_overview_version_{event.lower()}
+                AFTER {event} ON user_roles
+                REFERENCING {referencing}
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION bump_user_role_overview_versions()
+            """
+        )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_user_role_overview_role()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE user_role_overviews SET
+                role_name = NEW.name,
+                role_description = NEW.description,
+                role_type = NEW.type,
+                role_permissions = NEW.permissions,
+                role_team_id = NEW.team_id,
+                role_organization_id = NEW.organization_id,
+                role_created_at = NEW.created_at,
+                role_updated_at = NEW.updated_at
+            WHERE role_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trigger_sync_user_role_overview_role ON roles")
+    op.execute(
+        """
+        CREATE TRIGGER trigger_sync_user_role_overview_role
+            AFTER UPDATE ON roles
+            FOR EACH ROW
+            EXECUTE FUNCTION sync_user_role_overview_role()
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_user_role_overview_role_versions()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM bump_user_role_overview_version(o.org)
+            FROM (
+                SELECT DISTINCT ov.organization_id AS org
+                FROM user_role_overviews ov JOIN new_rows r ON r.id = ov.role_id
+                ORDER BY 1
+            ) AS o;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trigger_user_role_overview_version_role ON roles")
+    op.execute(
+        """
+        CREATE TRIGGER trigger_user_role_overview_version_role
+            AFTER UPDATE ON roles
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_user_role_overview_role_versions()
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_role_overviews
+        SELECT
+            ur.id, ur.organization_id, ur.user_id, ur.role_id, ur.team_id,
+            ur.created_at, ur.updated_at,
+            r.name, r.description, r.type, r.permissions, r.team_id,
+            r.organization_id, r.created_at, r.updated_at
+        FROM user_roles ur
+        LEFT JOIN roles r ON r.id = ur.role_id
+        ON CONFLICT (id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trigger_user_role_overview_version_role ON roles")
+    op.execute("DROP TRIGGER IF EXISTS trigger_sync_user_role_overview_role ON roles")
+    for event, _ in VERSION_TRIGGER_EVENTS:
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_user_role_overview_version_{event.lower()} ON user_roles")
+    op.execute("DROP TRIGGER IF EXISTS trigger_sync_user_role_overview ON user_roles")
+    op.execute("DROP FUNCTION IF EXISTS bump_user_role_overview_role_versions()")
+    op.execute("DROP FUNCTION IF EXISTS sync_user_role_overview_role()")
+    op.execute("DROP FUNCTION IF EXISTS bump_user_role_overview_versions()")
+    op.execute("DROP FUNCTION IF EXISTS sync_user_role_overview()")
+    op.execute("DROP FUNCTION IF EXISTS bump_user_role_overview_version(UUID)")
+    op.execute("DROP TABLE IF EXISTS user_role_overview_versions")
+    op.execute("DROP TABLE IF EXISTS user_role_overviews")
@@ -0,0 +1,148 @@
+"""Per-organization resource version counters for conditional GETs.
+
+``resource_versions`` keeps one counter per (organization, resource), bumped
+by statement triggers on songs, teams, checklist templates/items and the
+service rota tables: once per organization a statement writes to, however
+many rows it touches. List endpoints derive their ETag from it and return 304 when the
+client's If-None-Match still matches, skipping the list query.
+
+Same objects as ``app/scripts/create_resource_versions.sql``.
+
+Revision ID: 008_resource_versions
+Revises: 007_user_role_overviews
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "008_resource_versions"
+down_revision: Union[str, None] = "007_user_role_overviews"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, trigger function call)
+VERSIONED_TABLES = (
+    ("songs", "bump_resource_version('songs')"),
+    ("teams", "bump_resource_version('teams')"),
+    ("checklist_templates", "bump_resource_version('checklist_templates')"),
+    ("checklist_items", "bump_checklist_item_version()"),
+    ("rota_services", "bump_resource_version('rota_services')"),
+    ("rota_availability", "bump_resource_version('rota_availability')"),
+    ("rota_assignments", "bump_resource_version('rota_assignments')"),
+)
+TRIGGER_EVENTS = (
+    ("INSERT", "NEW TABLE AS new_rows"),
+    ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("DELETE", "OLD TABLE AS old_rows"),
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS resource_versions (
+            organization_id TEXT NOT NULL,
+            resource TEXT NOT NULL,
+            version BIGINT NOT NULL DEFAULT 1,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+            PRIMARY KEY (organization_id, resource)
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION touch_resource_version(org TEXT, res TEXT)
+        RETURNS VOID AS $$
+        BEGIN
+            IF org IS NULL THEN
+                RETURN;
+            END IF;
+            INSERT INTO resource_versions (organization_id, resource) VALUES (org, res)
+            ON CONFLICT (organization_id, resource) DO UPDATE
+                SET version = resource_versions.version + 1, updated_at = NOW();
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_resource_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM touch_resource_version(o.org, TG_ARGV[0])
+                FROM (SELECT DISTINCT organization_id::text AS org FROM new_rows ORDER BY 1) AS o;
+            ELSIF TG_OP = 'UPDATE' THEN
+                PERFORM touch_resource_version(o.org, TG_ARGV[0])
+                FROM (
+                    SELECT organization_id::text AS org FROM old_rows
+                    UNION SELECT organization_id::text FROM new_rows
+                    ORDER BY 1
+                ) AS o;
+            ELSE
+                PERFORM touch_resource_version(o.org, TG_ARGV[0])
+                FROM (SELECT DISTINCT organization_id::text AS org FROM old_rows ORDER BY 1) AS o;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_checklist_item_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM touch_resource_version(o.org, 'checklist_templates')
+                FROM (
+                    SELECT DISTINCT t.organization_id::text AS org
+                    FROM new_rows i JOIN checklist_templates t ON t.id = i.template_id
+                    ORDER BY 1
+                ) AS o;
+            ELSIF TG_OP = 'UPDATE' THEN
+                PERFORM touch_resource_version(o.org, 'checklist_templates')
+                FROM (
+                    SELECT t.organization_id::text AS org
+                    FROM (SELECT template_id FROM old_rows UNION SELECT template_id FROM new_rows) AS i
+                    JOIN checklist_templates t ON t.id = i.template_id
+                    GROUP BY 1
+                    ORDER BY 1
+                ) AS o;
+            ELSE
+                PERFORM touch_resource_version(o.org, 'checklist_templates')
+                FROM (
+                    SELECT DISTINCT t.organization_id::text AS org
+                    FROM old_rows i JOIN checklist_templates t ON t.id = i.template_id
+                    ORDER BY 1
+                ) AS o;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Transition tables are only allowed on single-event triggers.
+    for table, function in VERSIONED_TABLES:
+        for event, referencing in TRIGGER_EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS trigger_resource_version_{event.lower()} ON {table}")
+            op.execute(
+                f"""
+                CREATE TRIGGER trigger_resource_version_{event.lower()}
+                    AFTER {event} ON {table}
+                    REFERENCING {referencing}
+                    FOR EACH STATEMENT EXECUTE FUNCTION {function}
+                """
+            )
+
+
+def downgrade() -> None:
+    for table, _ in reversed(VERSIONED_TABLES):
+        for event, _ in TRIGGER_EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS trigger_resource_version_{event.lower()} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_checklist_item_version()")
+    op.execute("DROP FUNCTION IF EXISTS bump_resource_version()")
+    op.execute("DROP FUNCTION IF EXISTS touch_resource_version(TEXT, TEXT)")
+    op.execute("DROP TABLE IF EXISTS resource_versions")
@@ -0,0 +1,55 @@
+"""Durable outbound mail queue.
+
+``mail_outbox`` holds one row per message. Requests enqueue and return 202;
+the mail worker claims due rows, sends them over pooled SMTP connections and
+retries failures with backoff.
+
+Same objects as ``app/scripts/create_mail_outbox_table.sql``.
+
+Revision ID: 009_mail_outbox
+Revises: 008_resource_versions
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "009_mail_outbox"
+down_revision: Union[str, None] = "008_resource_versions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS mail_outbox (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            organization_id UUID,
+            to_email TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            html BOOLEAN NOT NULL DEFAULT FALSE,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INT NOT NULL DEFAULT 0,
+            next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            last_error TEXT,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+            sent_at TIMESTAMP WITH TIME ZONE
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_mail_outbox_due
+            ON mail_outbox (next_attempt_at)
+            WHERE status IN ('queued', 'sending')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_mail_outbox_due")
+    op.execute("DROP TABLE IF EXISTS mail_outbox")
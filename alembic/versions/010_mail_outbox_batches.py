@@ -0,0 +1,36 @@
+"""Group bulk template sends in the mail outbox.
+
+Adds ``mail_outbox.batch_id`` so every recipient of one bulk send can be
+tracked together (``GET /mail/outbox/batch/{batch_id}``).
+
+Same objects as ``app/scripts/create_mail_outbox_table.sql``.
+
+Revision ID: 010_mail_outbox_batches
+Revises: 009_mail_outbox
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "010_mail_outbox_batches"
+down_revision: Union[str, None] = "009_mail_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE mail_outbox ADD COLUMN IF NOT EXISTS batch_id UUID")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_mail_outbox_batch_id
+            ON mail_outbox (batch_id)
+            WHERE batch_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_mail_outbox_batch_id")
+    op.execute("ALTER TABLE mail_outbox DROP COLUMN IF EXISTS batch_id")
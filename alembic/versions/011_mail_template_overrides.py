@@ -0,0 +1,49 @@
+"""Organization overrides of mail templates.
+
+``mail_templates.organization_id`` is NULL for the global template of a key
+and set for an organization's override of it. The single unique key becomes
+one unique global template per key plus one override per organization and
+key; the seed scripts target the global index with
+``ON CONFLICT (key) WHERE organization_id IS NULL``.
+
+Same objects as ``app/scripts/create_mail_table.sql``.
+
+Revision ID: 011_mail_template_overrides
+Revises: 010_mail_outbox_batches
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "011_mail_template_overrides"
+down_revision: Union[str, None] = "010_mail_outbox_batches"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE mail_templates ADD COLUMN IF NOT EXISTS organization_id UUID")
+    op.execute("ALTER TABLE mail_templates DROP CONSTRAINT IF EXISTS mail_templates_key_key")
+    op.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_mail_templates_global_key
+            ON mail_templates (key)
+            WHERE organization_id IS NULL
+        """
+    )
+    op.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_mail_templates_org_key
+            ON mail_templates (organization_id, key)
+            WHERE organization_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_mail_templates_org_key")
+    op.execute("DROP INDEX IF EXISTS uq_mail_templates_global_key")
+    op.execute("DELETE FROM mail_templates WHERE organization_id IS NOT NULL")
+    op.execute("ALTER TABLE mail_templates ADD CONSTRAINT mail_templates_key_key UNIQUE (key)")
@@ -6,15 +6,20 @@ Matches the pattern used by /team/get: frontend sends Authorization Bearer token
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
 from fastapi import Header, HTTPException, Query, Request, status
 from jose import JWTError, jwt
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.core.config import settings
+from app.queries.organization import GET_ORGANIZATION_ID_BY_SUPABASE_USER_ID_QUERY
+from app.queries.user_role import GET_ORGANIZATION_ID_BY_USER_ID_QUERY
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +33,33 @@ class AuthContext(BaseModel):
     organization_id: UUID
     user_id: str
     token: str
+    # PermissionMatrix, when the route resolved one (see app.api.permission_matrix)
+    permissions: Any = Field(default=None, exclude=True)
+
+
+# token fingerprint + requested org scope -> resolved AuthContext
+_auth_cache: TTLCache[tuple[str, UUID | None, UUID | None], AuthContext] = TTLCache(
+    "auth_context",
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+# user key (sub/email) -> organization id resolved from the database
+_org_cache: TTLCache[str, UUID] = TTLCache(
+    "auth_user_organization",
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_ORG_CACHE_TTL_SECONDS,
+)
+
+
+def _token_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _token_exp(payload: dict) -> float | None:
+    try:
+        return float(payload["exp"])
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
 def _parse_uuid(value) -> UUID | None:
@@ -122,33 +154,33 @@ def resolve_organization_id(
 
 async def lookup_organization_id_for_user(request: Request, user_key: str) -> UUID | None:
     """Resolve organization from DB when JWT/query do not include org (team/get parity)."""
+    if not user_key:
+        return None
+    cached = _org_cache.get(user_key)
+    if cached is not None:
+        return cached
     pool = getattr(request.app.state, "db", None)
-    if pool is None or not user_key:
+    if pool is None:
         return None
     try:
         async with pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT id FROM organizations
-                WHERE additional_information->>'supabase_user_id' = $1
-                LIMIT 1
-                """,
-                user_key,
-            )
+            row = await conn.fetchrow(GET_ORGANIZATION_ID_BY_SUPABASE_USER_ID_QUERY, user_key)
             if row:
-                return _parse_uuid(row["id"])
-
-            row = await conn.fetchrow(
-                """
-                SELECT organization_id FROM user_roles
-                WHERE user_id::text = $1 OR user_id::text = $2
-                LIMIT 1
-                """,
-                user_key,
-                user_key,
-            )
+                org_id = _parse_uuid(row["id"])
+                if org_id:
+                    _org_cache.set(user_key, org_id)
+                return org_id
+
+            # user_roles.user_id is a uuid; non-uuid keys (e.g. email) can never match it.
+            user_uuid = _parse_uuid(user_key)
+            if user_uuid is None:
+                return None
+            row = await conn.fetchrow(GET_ORGANIZATION_ID_BY_USER_ID_QUERY, user_uuid)
             if row:
-                return _parse_uuid(row["organization_id"])
+                org_id = _parse_uuid(row["organization_id"])
+                if org_id:
+                    _org_cache.set(user_key, org_id)
+                return org_id
     except Exception as exc:
         logger.warning("Organization lookup failed for user %s: %s", user_key, exc)
     return None
@@ -176,6 +208,11 @@ async def get_auth_context(
         )
 
     token = token.strip()
+    cache_key = (_token_fingerprint(token), organization_id, x_organization_id)
+    cached = _auth_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     payload = decode_bearer_token(token)
     if payload is None:
         raise HTTPException(
@@ -205,7 +242,9 @@ async def get_auth_context(
 
     user_id = _extract_user_id(payload) or "unknown"
     logger.info("Auth OK user_id=%s organization_id=%s", user_id, org_id)
-    return AuthContext(organization_id=org_id, user_id=user_id, token=token)
+    auth = AuthContext(organization_id=org_id, user_id=user_id, token=token)
+    _auth_cache.set(cache_key, auth, expires_at=_token_exp(payload))
+    return auth
 
 
 async def get_checklist_context(
@@ -0,0 +1,93 @@
+"""Conditional GET helpers (ETag / If-None-Match).
+
+A resource's ETag is derived from a cheap version of the data (for example a
+counter bumped by triggers) plus whatever else shapes the response, such as
+the query filters. When the client's ``If-None-Match`` matches, the handler
+returns ``304 Not Modified`` without loading or serializing the data.
+
+List endpoints use ``resource_etag`` (per-organization counters in
+``resource_versions``) with ``conditional``::
+
+    etag = await resource_etag(request, org_id, ("songs",), sorted(filters.items()))
+    return await conditional(request, etag, lambda: controller.fetch(filters))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+
+from app.queries.resource_version import GET_RESOURCE_VERSIONS_QUERY
+
+logger = logging.getLogger(__name__)
+
+# Clients must revalidate, but may reuse their copy after a 304.
+CACHE_CONTROL = "private, no-cache"
+# The same URL serves a different organization's data per token/header.
+VARY = "Authorization, X-Organization-Id"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over ``parts`` (versions, filters); order matters."""
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored.
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY})
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.headers["Vary"] = VARY
+    return response
+
+
+async def resource_etag(
+    request: Request, organization_id: Any, resources: tuple[str, ...], *parts: Any
+) -> str | None:
+    """ETag for an organization's view of ``resources`` (``resource_versions``
+    counters) plus ``parts``. The organization is part of the tag: counters
+    of different organizations can be equal. None when the counters can't be read, in which
+    case the response is served uncached rather than failing."""
+    db = getattr(request.app.state, "db", None)
+    if db is None or organization_id is None:
+        return None
+    try:
+        version = await db.fetchval(GET_RESOURCE_VERSIONS_QUERY, str(organization_id), list(resources))
+    except Exception as exc:
+        logger.warning("Resource version lookup failed for %s: %s", resources, exc)
+        return None
+    return make_etag(organization_id, *resources, version, *parts)
+
+
+async def conditional(
+    request: Request, etag: str | None, render: Callable[[], Awaitable[Response]]
+) -> Response:
+    """304 if the client already has ``etag``, otherwise ``render()`` with the
+    ETag attached to successful responses."""
+    if etag is None:
+        return await render()
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = await render()
+    if response.status_code == 200:
+        with_etag(response, etag)
+    return response
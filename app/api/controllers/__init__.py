@@ -1,49 +1,49 @@
-from .user import UserController
-from .team import TeamController
-from .role import RoleController
-from .module import ModuleController
-from .organization import OrganizationController
-from .teacher import TeacherController
-from .inventory import InventoryController
-from .plan import PlanController
-from .permission import PermissionController
-from .file import FileController
-from .user_role import UserRoleController
-from .mail import MailTemplateController
-from .classes import ClassController
-from .student import StudentController
-from .account import AccountController
-from .song import SongController
-from .rota import RotaController
-from .rota_song import RotaSongController
-from .expense import ExpenseController
-from .checklist_template import ChecklistTemplateController
-from .checklist_item import ChecklistItemController
-from .checklist_record import ChecklistRecordController
-from .checklist_item_status import ChecklistItemStatusController
-
-__all__ = [
-    "UserController", 
-    "TeamController", 
-    "RoleController", 
-    "ModuleController", 
-    "OrganizationController",
-    "TeacherController",
-    "InventoryController",
-    "PlanController",
-    "PermissionController",
-    "FileController",
-    "UserRoleController",
-    "MailTemplateController",
-    "ClassController",
-    "StudentController",
-    "AccountController",
-    "SongController",
-    "RotaController",
-    "RotaSongController",
-    "ExpenseController",
-    "ChecklistTemplateController",
-    "ChecklistItemController",
-    "ChecklistRecordController",
-    "ChecklistItemStatusController",
-    ]
+"""Controller classes, imported on first access.
+
+``from app.api.controllers import X`` only imports the module defining ``X``, so
+loading one route group does not drag in every other controller (and Mongo,
+jose, ... with them).
+"""
+
+import importlib
+
+_EXPORTS = {
+    "UserController": "user",
+    "TeamController": "team",
+    "RoleController": "role",
+    "ModuleController": "module",
+    "OrganizationController": "organization",
+    "TeacherController": "teacher",
+    "InventoryController": "inventory",
+    "PlanController": "plan",
+    "PermissionController": "permission",
+    "FileController": "file",
+    "UserRoleController": "user_role",
+    "MailTemplateController": "mail",
+    "ClassController": "classes",
+    "StudentController": "student",
+    "AccountController": "account",
+    "SongController": "song",
+    "RotaController": "rota",
+    "RotaSongController": "rota_song",
+    "ExpenseController": "expense",
+    "ChecklistTemplateController": "checklist_template",
+    "ChecklistItemController": "checklist_item",
+    "ChecklistRecordController": "checklist_record",
+    "ChecklistItemStatusController": "checklist_item_status",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,9 @@
-from fastapi import Request, HTTPException
+from fastapi import Request, HTTPException, UploadFile
 from fastapi.encoders import jsonable_encoder
 from app.api.services import AccountService
-from fastapi.responses import JSONResponse
+from app.db.bulk import read_csv
+from app.db.listing import PageRequest
+from fastapi.responses import JSONResponse, StreamingResponse
 import logging
 import uuid
 from datetime import datetime
@@ -37,15 +39,16 @@ class AccountController:
         
         return formatted_data
 
-    async def fetch_account_controller(self, filters: dict = {}) -> JSONResponse:
+    async def fetch_account_controller(self, filters: dict = {}, page: PageRequest = None) -> JSONResponse:
         """Get list of accounts"""
         try:
-            accounts = await self.account_service.get_account_data(filters)
-            formatted_accounts = [self._format_response_data(dict(account)) for account in accounts]
+            result = await self.account_service.get_account_page(filters, page or PageRequest())
+            formatted_accounts = [self._format_response_data(dict(account)) for account in result.items]
             return JSONResponse(status_code=200, content={
                 "success": True,
                 "data": formatted_accounts,
-                "count": len(formatted_accounts)
+                "count": len(formatted_accounts),
+                "next_cursor": result.next_cursor,
             })
         except HTTPException as e:
             return JSONResponse(status_code=e.status_code, content={
@@ -59,6 +62,44 @@ class AccountController:
                 "error": {"message": "Failed to retrieve account data", "details": str(err)}
             })
 
+    def export_account_controller(self, filters: dict, order: str = None):
+        """Stream account entries as a JSON array download"""
+        try:
+            body = self.account_service.stream_accounts(filters, order)
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "error": {"message": e.detail}
+            })
+        return StreamingResponse(
+            body,
+            media_type="application/json",
+            headers={"Content-Disposition": 'attachment; filename="accounts.json"'},
+        )
+
+    async def account_ledger_controller(self, organization_id: str, as_of: str = None) -> JSONResponse:
+        """Monthly ledger with the balance as of a day"""
+        try:
+            ledger = await self.account_service.get_account_ledger(organization_id, as_of)
+            return JSONResponse(status_code=200, content={
+                "success": True,
+                "data": ledger["months"],
+                "count": len(ledger["months"]),
+                "as_of": ledger["as_of"],
+                "balance": ledger["balance"],
+            })
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "error": {"message": e.detail} if isinstance(e.detail, str) else e.detail
+            })
+        except Exception as err:
+            logging.error(f"Error in account_ledger_controller: {err}")
+            return JSONResponse(status_code=500, content={
+                "success": False,
+                "error": {"message": "Failed to retrieve account ledger", "details": str(err)}
+            })
+
     async def get_account_by_id_controller(self, account_id: str) -> JSONResponse:
         """Get a single account by ID"""
         try:
@@ -107,6 +148,63 @@ class AccountController:
                 "error": {"message": str(err)}
             })
 
+    async def save_bulk_account_controller(self, request: Request) -> JSONResponse:
+        """Create many account entries from a JSON array"""
+        try:
+            body = await request.json()
+        except ValueError as json_err:
+            return JSONResponse(status_code=400, content={
+                "success": False,
+                "message": "Invalid JSON in request body",
+                "error": str(json_err)
+            })
+        accounts = body if isinstance(body, list) else body.get("accounts", [])
+        if not accounts:
+            return JSONResponse(status_code=400, content={
+                "success": False,
+                "error": {"message": "accounts array is required and cannot be empty"}
+            })
+        return await self._bulk_save(accounts)
+
+    async def import_account_csv_controller(self, file: UploadFile, organization_id: str = None) -> JSONResponse:
+        """Create account entries from a CSV upload (e.g. a bank statement export)"""
+        try:
+            accounts = read_csv(await file.read())
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "error": {"message": e.detail}
+            })
+        if not accounts:
+            return JSONResponse(status_code=400, content={
+                "success": False,
+                "error": {"message": "CSV file has no account rows"}
+            })
+        return await self._bulk_save(accounts, organization_id)
+
+    async def _bulk_save(self, accounts: list, organization_id: str = None) -> JSONResponse:
+        try:
+            result = await self.account_service.save_bulk_account_data(accounts, organization_id)
+            for item in result["data"]:
+                if item.get("data"):
+                    item["data"] = self._format_response_data(dict(item["data"]))
+            return JSONResponse(status_code=201, content={
+                "message": f"Bulk save complete: {result['successful']} succeeded, {result['failed']} failed",
+                **result
+            })
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "error": {"message": e.detail} if isinstance(e.detail, str) else e.detail
+            })
+        except Exception as err:
+            logging.error(f"Error in bulk account save: {err}")
+            return JSONResponse(status_code=500, content={
+                "success": False,
+                "message": "Bulk save failed",
+                "error": {"message": str(err)}
+            })
+
     async def update_account_controller(self, account_id: str, request: Request) -> JSONResponse:
         """Update an existing account"""
         body = await request.json()
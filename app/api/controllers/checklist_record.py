@@ -1,5 +1,6 @@
 from fastapi import Request, HTTPException
 from app.api.services.checklist_record import ChecklistRecordService
+from app.db.listing import PageRequest
 from fastapi.responses import JSONResponse
 import logging
 import uuid
@@ -21,11 +22,16 @@ class ChecklistRecordController:
                 out[k] = v.isoformat()
         return out
 
-    async def fetch(self, filters: dict = None) -> JSONResponse:
+    async def fetch(self, filters: dict = None, page: PageRequest = None) -> JSONResponse:
         try:
-            rows = await self.service.get_data(filters)
+            filters = filters or {}
+            if "id" in filters:
+                rows, next_cursor = await self.service.get_data(filters), None
+            else:
+                result = await self.service.get_page(filters, page or PageRequest())
+                rows, next_cursor = result.items, result.next_cursor
             data = [self._format(dict(r)) for r in rows]
-            return JSONResponse(200, {"success": True, "data": data, "count": len(data)})
+            return JSONResponse(200, {"success": True, "data": data, "count": len(data), "next_cursor": next_cursor})
         except HTTPException as e:
             return JSONResponse(e.status_code, {"success": False, "error": {"message": e.detail}})
         except Exception as err:
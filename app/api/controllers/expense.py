@@ -1,6 +1,8 @@
-from fastapi import Request, HTTPException
+from fastapi import Request, HTTPException, UploadFile
 from app.api.services.expense import ExpenseService
-from fastapi.responses import JSONResponse
+from app.db.bulk import read_csv
+from app.db.listing import PageRequest
+from fastapi.responses import JSONResponse, StreamingResponse
 import logging
 from datetime import datetime
 from decimal import Decimal
@@ -21,14 +23,20 @@ class ExpenseController:
                 formatted[key] = value.isoformat()
         return formatted
 
-    async def fetch_expense_controller(self, filters: dict = None) -> JSONResponse:
+    async def fetch_expense_controller(self, filters: dict = None, page: PageRequest = None) -> JSONResponse:
         try:
-            rows = await self.expense_service.get_expense_data(filters)
+            filters = filters or {}
+            if "id" in filters:
+                rows, next_cursor = await self.expense_service.get_expense_data(filters), None
+            else:
+                result = await self.expense_service.get_expense_page(filters, page or PageRequest())
+                rows, next_cursor = result.items, result.next_cursor
             formatted = [self._format_response_data(dict(r)) for r in rows]
             return JSONResponse(status_code=200, content={
                 "success": True,
                 "data": formatted,
-                "count": len(formatted)
+                "count": len(formatted),
+                "next_cursor": next_cursor,
             })
         except HTTPException as e:
             return JSONResponse(status_code=e.status_code, content={"success": False, "error": {"message": e.detail}})
@@ -39,6 +47,36 @@ class ExpenseController:
                 "error": {"message": "Failed to retrieve expense data", "details": str(err)}
             })
 
+    def export_expense_controller(self, filters: dict, sort: str = None, order: str = None):
+        try:
+            body = self.expense_service.stream_expenses(filters, sort, order)
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={"success": False, "error": {"message": e.detail}})
+        return StreamingResponse(
+            body,
+            media_type="application/json",
+            headers={"Content-Disposition": 'attachment; filename="expenses.json"'},
+        )
+
+    async def expense_summary_controller(self, organization_id: str, **options) -> JSONResponse:
+        try:
+            summary = await self.expense_service.get_expense_summary(organization_id, **options)
+            return JSONResponse(status_code=200, content={
+                "success": True,
+                "data": summary["groups"],
+                "count": len(summary["groups"]),
+                "total": float(summary["total"]),
+                "expense_count": summary["expense_count"],
+            })
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={"success": False, "error": {"message": e.detail}})
+        except Exception as err:
+            logging.error(f"Error in expense_summary_controller: {err}")
+            return JSONResponse(status_code=500, content={
+                "success": False,
+                "error": {"message": "Failed to retrieve expense summary", "details": str(err)}
+            })
+
     async def get_expense_by_id_controller(self, expense_id: int) -> JSONResponse:
         try:
             filters = {"id": expense_id}
@@ -100,14 +138,7 @@ class ExpenseController:
                     "error": {"message": "expenses array is required and cannot be empty"}
                 })
             result = await self.expense_service.save_bulk_expense_data(expenses)
-            for item in result.get("data", []):
-                if "data" in item and item["data"]:
-                    item["data"] = self._format_response_data(dict(item["data"]))
-            return JSONResponse(status_code=201, content={
-                "success": result.get("success", True),
-                "message": f"Bulk save complete: {result.get('successful', 0)} succeeded, {result.get('failed', 0)} failed",
-                **result
-            })
+            return self._bulk_response(result)
         except HTTPException as e:
             return JSONResponse(status_code=e.status_code, content={"success": False, "error": {"message": e.detail}})
         except Exception as err:
@@ -118,6 +149,36 @@ class ExpenseController:
                 "error": {"message": str(err)}
             })
 
+    async def import_expense_csv_controller(self, file: UploadFile, organization_id: str = None) -> JSONResponse:
+        try:
+            rows = read_csv(await file.read())
+            if not rows:
+                return JSONResponse(status_code=400, content={
+                    "success": False,
+                    "error": {"message": "CSV file has no expense rows"}
+                })
+            result = await self.expense_service.save_bulk_expense_data(rows, organization_id)
+            return self._bulk_response(result)
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={"success": False, "error": {"message": e.detail}})
+        except Exception as err:
+            logging.error(f"Error in import_expense_csv_controller: {err}")
+            return JSONResponse(status_code=500, content={
+                "success": False,
+                "message": "Import failed",
+                "error": {"message": str(err)}
+            })
+
+    def _bulk_response(self, result: dict) -> JSONResponse:
+        for item in result.get("data", []):
+            if "data" in item and item["data"]:
+                item["data"] = self._format_response_data(dict(item["data"]))
+        return JSONResponse(status_code=201, content={
+            "success": result.get("success", True),
+            "message": f"Bulk save complete: {result.get('successful', 0)} succeeded, {result.get('failed', 0)} failed",
+            **result
+        })
+
     async def update_expense_controller(self, expense_id: int, request: Request) -> JSONResponse:
         try:
             body = await request.json()
@@ -1,4 +1,4 @@
-from fastapi import Request
+from fastapi import HTTPException, Request
 from fastapi.encoders import jsonable_encoder
 from app.api.services.mail import MailTemplateService
 from fastapi.responses import JSONResponse
@@ -70,77 +70,116 @@ class MailTemplateController:
                 "error": str(err)
             })
 
-    # async def send_mail_controller(self, request: Request):
-    #     """Send email using a template by key, with optional content overrides"""
-    #     body = await request.json()
-    #     try:
-    #         template_key = body.get("template_key")
-    #         to = body.get("to")
-    #         subject_override = body.get("subject")  # Optional override
-    #         body_override = body.get("body")  # Optional override
-    #         user_data = body.get("user_data")  # Optional user data for template variables
-    #         extra_variables = body.get("extra_variables")  # Optional extra variables like reset_link, organization_name
-            
-    #         if not template_key:
-    #             return JSONResponse(status_code=400, content={
-    #                 "success": False,
-    #                 "message": "template_key is required"
-    #             })
-            
-    #         if not to:
-    #             return JSONResponse(status_code=400, content={
-    #                 "success": False,
-    #                 "message": "to (recipient email) is required"
-    #             })
-            
-    #         result = await self.mail_template_service.send_mail_with_template(
-    #             template_key=template_key,
-    #             to=to,
-    #             subject_override=subject_override,
-    #             body_override=body_override,
-    #             user_data=user_data,
-    #             extra_variables=extra_variables
-    #         )
-    #         return JSONResponse(status_code=200, content=result)
-    #     except Exception as err:
-    #         return JSONResponse(status_code=400, content={
-    #             "success": False,
-    #             "message": "Send mail failed",
-    #             "error": str(err)
-    #         })
+    async def _json_body(self, request: Request):
+        try:
+            return await request.json(), None
+        except ValueError as json_err:
+            return None, JSONResponse(status_code=400, content={
+                "success": False,
+                "message": "Invalid JSON in request body. Please ensure the request body contains valid JSON.",
+                "error": str(json_err)
+            })
 
-    # async def send_bulk_mail_controller(self, request: Request):
-    #     """Send emails to multiple users using a template by key"""
-    #     body = await request.json()
-    #     try:
-    #         template_key = body.get("template_key")
-    #         users = body.get("users", [])
-    #         extra_variables = body.get("extra_variables")  # Optional extra variables like reset_link, organization_name
-            
-    #         if not template_key:
-    #             return JSONResponse(status_code=400, content={
-    #                 "success": False,
-    #                 "message": "template_key is required"
-    #             })
-            
-    #         if not users or not isinstance(users, list):
-    #             return JSONResponse(status_code=400, content={
-    #                 "success": False,
-    #                 "message": "users (array of user objects) is required"
-    #             })
-            
-    #         result = await self.mail_template_service.send_bulk_mail_with_template(
-    #             template_key=template_key,
-    #             users=users,
-    #             extra_variables=extra_variables
-    #         )
-    #         return JSONResponse(status_code=200, content=result)
-    #     except Exception as err:
-    #         return JSONResponse(status_code=400, content={
-    #             "success": False,
-    #             "message": "Send bulk mail failed",
-    #             "error": str(err)
-    #         })
+    async def send_mail_controller(self, request: Request):
+        """Queue an email rendered from a template by key, with optional content overrides"""
+        body, error = await self._json_body(request)
+        if error:
+            return error
+        try:
+            template_key = body.get("template_key")
+            to = body.get("to")
+
+            if not template_key:
+                return JSONResponse(status_code=400, content={
+                    "success": False,
+                    "message": "template_key is required"
+                })
+
+            if not to:
+                return JSONResponse(status_code=400, content={
+                    "success": False,
+                    "message": "to (recipient email) is required"
+                })
+
+            result = await self.mail_template_service.send_mail_with_template(
+                template_key=template_key,
+                to=to,
+                subject_override=body.get("subject"),
+                body_override=body.get("body"),
+                user_data=body.get("user_data"),
+                extra_variables=body.get("extra_variables"),
+                organization_id=body.get("organization_id"),
+                html=body.get("html", False),
+            )
+            return JSONResponse(status_code=202, content=jsonable_encoder(result))
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "message": "Send mail failed",
+                "error": e.detail
+            })
+        except Exception as err:
+            return JSONResponse(status_code=400, content={
+                "success": False,
+                "message": "Send mail failed",
+                "error": str(err)
+            })
+
+    async def send_bulk_mail_controller(self, request: Request):
+        """Queue personalised emails from a template for many users"""
+        body, error = await self._json_body(request)
+        if error:
+            return error
+        try:
+            template_key = body.get("template_key")
+            users = body.get("users", [])
+
+            if not template_key:
+                return JSONResponse(status_code=400, content={
+                    "success": False,
+                    "message": "template_key is required"
+                })
+
+            if not users or not isinstance(users, list):
+                return JSONResponse(status_code=400, content={
+                    "success": False,
+                    "message": "users (array of user objects) is required"
+                })
+
+            result = await self.mail_template_service.send_bulk_mail_with_template(
+                template_key=template_key,
+                users=users,
+                extra_variables=body.get("extra_variables"),
+                organization_id=body.get("organization_id"),
+                html=body.get("html", False),
+            )
+            return JSONResponse(status_code=202, content=jsonable_encoder(result))
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "message": "Send bulk mail failed",
+                "error": e.detail
+            })
+        except Exception as err:
+            return JSONResponse(status_code=400, content={
+                "success": False,
+                "message": "Send bulk mail failed",
+                "error": str(err)
+            })
+
+    async def mail_batch_status_controller(self, batch_id: str):
+        """Per-recipient delivery status of a bulk send"""
+        try:
+            status = await self.mail_template_service.get_outbox_batch_status(batch_id)
+            return JSONResponse(status_code=200, content={
+                "success": True,
+                "data": jsonable_encoder(status)
+            })
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "error": {"message": e.detail}
+            })
 
     # async def send_simple_email_controller(self, request: Request):
     #     """Send a simple email without using templates. Supports both Gmail and SES."""
@@ -207,8 +246,22 @@ class MailTemplateController:
     #         })
 
 
+    async def mail_status_controller(self, message_id: str):
+        """Delivery status of a queued email"""
+        try:
+            status = await self.mail_template_service.get_outbox_status(message_id)
+            return JSONResponse(status_code=200, content={
+                "success": True,
+                "data": jsonable_encoder(status)
+            })
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "error": {"message": e.detail}
+            })
+
     async def send_email_gmail_controller(self, request: Request):
-        """Send an email using Gmail SMTP"""
+        """Queue an email for sending over Gmail SMTP; responds 202 with its message_id"""
         try:
             # Parse JSON with error handling
             try:
@@ -230,6 +283,7 @@ class MailTemplateController:
             subject = request_body.get("subject")
             email_body = request_body.get("body")
             html = request_body.get("html", False)
+            organization_id = request_body.get("organization_id")
             
             if not to:
                 return JSONResponse(status_code=400, content={
@@ -249,9 +303,11 @@ class MailTemplateController:
                     "message": "body is required"
                 })
             
-            result = await self.mail_template_service.send_email_gmail(to=to, subject=subject, body=email_body, html=html)
+            result = await self.mail_template_service.send_email_gmail(
+                to=to, subject=subject, body=email_body, html=html, organization_id=organization_id
+            )
             data = jsonable_encoder(result)
-            return JSONResponse(status_code=200, content=data)
+            return JSONResponse(status_code=202, content=data)
         except Exception as err:
             return JSONResponse(status_code=400, content={
                 "success": False,
@@ -1,5 +1,6 @@
 from fastapi import Request, HTTPException
 from app.api.services.song import SongService
+from app.db.listing import PageRequest
 from fastapi.responses import JSONResponse
 import logging
 from datetime import datetime
@@ -21,15 +22,21 @@ class SongController:
 
         return formatted_data
 
-    async def fetch_song_controller(self, filters: dict = None) -> JSONResponse:
+    async def fetch_song_controller(self, filters: dict = None, page: PageRequest = None) -> JSONResponse:
         """Get list of songs"""
         try:
-            songs = await self.song_service.get_song_data(filters)
+            filters = filters or {}
+            if "id" in filters:
+                songs, next_cursor = await self.song_service.get_song_data(filters), None
+            else:
+                result = await self.song_service.get_song_page(filters, page or PageRequest())
+                songs, next_cursor = result.items, result.next_cursor
             formatted_songs = [self._format_response_data(dict(song)) for song in songs]
             return JSONResponse(status_code=200, content={
                 "success": True,
                 "data": formatted_songs,
-                "count": len(formatted_songs)
+                "count": len(formatted_songs),
+                "next_cursor": next_cursor,
             })
         except HTTPException as e:
             return JSONResponse(status_code=e.status_code, content={
@@ -43,6 +50,21 @@ class SongController:
                 "error": {"message": "Failed to retrieve song data", "details": str(err)}
             })
 
+    async def autocomplete_song_controller(self, organization_id: int, prefix: str, limit: int) -> JSONResponse:
+        """Prefix suggestions for the song picker"""
+        try:
+            suggestions = await self.song_service.autocomplete_songs(organization_id, prefix, limit)
+            return JSONResponse(status_code=200, content={
+                "success": True,
+                "data": suggestions,
+                "count": len(suggestions)
+            })
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={
+                "success": False,
+                "error": {"message": e.detail}
+            })
+
     async def get_song_by_id_controller(self, song_id: int) -> JSONResponse:
         """Get a single song by ID"""
         try:
@@ -1,19 +1,26 @@
 from fastapi import Request
 from fastapi.encoders import jsonable_encoder
+from app.api.conditional import etag_matches, make_etag, not_modified, with_etag
 from app.api.services.user_role import UserRoleService
 from fastapi.responses import JSONResponse
+from app.db.listing import PageRequest
 
 class UserRoleController:
     def __init__(self, user_role_service: UserRoleService):
         self.user_role_service = user_role_service
 
-    async def fetch_user_role_controller(self, filters: dict = {}):
+    async def fetch_user_role_controller(self, filters: dict = {}, page: PageRequest = None):
         try:
-            user_roles = await self.user_role_service.get_user_role_data(filters)
+            if "id" in filters:
+                user_roles, next_cursor = await self.user_role_service.get_user_role_data(filters), None
+            else:
+                result = await self.user_role_service.get_user_role_page(filters, page or PageRequest())
+                user_roles, next_cursor = result.items, result.next_cursor
             data = jsonable_encoder(user_roles)
             return JSONResponse(status_code=200, content={
                 "success": True,
-                "data": data
+                "data": data,
+                "next_cursor": next_cursor,
             })
         except Exception as err:
             return JSONResponse(status_code=400, content={
@@ -120,14 +127,22 @@ class UserRoleController:
                 "error": str(err)
             })
 
-    async def fetch_user_role_overview_controller(self, filters: dict = {}):
+    async def fetch_user_role_overview_controller(self, filters: dict = {}, request: Request = None):
         try:
+            etag = None
+            if request is not None and "organization_id" in filters and "id" not in filters:
+                # Read the version first: a write racing the fetch then only makes the ETag stale.
+                version = await self.user_role_service.get_user_role_overview_version(filters["organization_id"])
+                etag = make_etag("user-role-overview", version, sorted(filters.items()))
+                if etag_matches(request, etag):
+                    return not_modified(etag)
             user_roles = await self.user_role_service.get_user_role_overview_data(filters)
             data = jsonable_encoder(user_roles)
-            return JSONResponse(status_code=200, content={
+            response = JSONResponse(status_code=200, content={
                 "success": True,
                 "data": data
             })
+            return with_etag(response, etag) if etag else response
         except Exception as err:
             return JSONResponse(status_code=400, content={
                 "success": False,
@@ -1,14 +1,26 @@
 from bson import ObjectId
-from fastapi import Request
+from fastapi import Query, Request
 import uuid
 from decimal import Decimal
 from datetime import date, datetime
 import logging
+from typing import Optional
+
+from app.db.listing import PageRequest
 
 def get_db(request: Request):
     return request.app.state.db
 
 
+def get_page_request(
+    limit: Optional[int] = Query(None, ge=1, description="Page size (capped by LISTING_MAX_LIMIT)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: Optional[str] = Query(None, description="Sort key"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$", description="asc or desc"),
+) -> PageRequest:
+    return PageRequest(limit=limit, cursor=cursor, sort=sort, order=order)
+
+
 def parse_expiry_to_seconds(expiry: str) -> int:
     """
     Converts expiry string like '30d', '12h', '3600' to seconds.
@@ -0,0 +1,179 @@
+"""Effective permissions of a user within an organization.
+
+``user_roles -> roles -> permissions`` is read with one query per
+(organization, user) and folded into a ``PermissionMatrix``: one bitmask of
+actions per (module, team). Matrices are cached in-process; the permission,
+role and user role services invalidate them on every write, and the TTL
+bounds staleness across workers.
+
+Routers check access with the ``require_permission`` dependency or by calling
+``can()`` on the matrix from ``get_permission_matrix``.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.api.auth_context import AuthContext, get_auth_context
+from app.core.config import settings
+from app.queries.permission import GET_EFFECTIVE_PERMISSIONS_QUERY
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = {"view": 1, "edit": 2, "create": 4, "delete": 8}
+ALL_ACTIONS = 15
+
+# With IAM_AUTH_ENABLED=false every caller is "anonymous" and keeps full access.
+# Tokens without a usable user claim ("unknown", "legacy-user") get no grants:
+# bearer tokens are not always signature-checked, so they must not escalate.
+BYPASS_USER_IDS = frozenset({"anonymous"})
+
+_WORD_SEPARATORS = re.compile(r"[\s_-]+")
+
+
+def _normalize(name: str | None) -> str:
+    return _WORD_SEPARATORS.sub("_", (name or "").strip().lower())
+
+
+@dataclass(frozen=True)
+class PermissionMatrix:
+    # (module id or normalized module name, team id or None for org-wide) -> action bits
+    grants: dict[tuple[str, str | None], int] = field(default_factory=dict)
+    # module key -> OR of its grants over every team (for checks without a team)
+    any_team: dict[str, int] = field(default_factory=dict)
+    roles: frozenset[str] = frozenset()
+    superuser: bool = False
+
+    @classmethod
+    def from_rows(cls, rows) -> "PermissionMatrix":
+        grants: dict[tuple[str, str | None], int] = {}
+        any_team: dict[str, int] = {}
+        roles: set[str] = set()
+        for row in rows:
+            for role in (row["role_name"], row["role_type"]):
+                if role:
+                    roles.add(_normalize(role))
+            if row["module_id"] is None:
+                continue
+            bits = sum(bit for action, bit in ACTIONS.items() if row[action])
+            if not bits:
+                continue
+            team = str(row["team_id"]) if row["team_id"] else None
+            keys = [str(row["module_id"])]
+            if row["module_name"]:
+                keys.append(_normalize(row["module_name"]))
+            for key in keys:
+                grants[(key, team)] = grants.get((key, team), 0) | bits
+                any_team[key] = any_team.get(key, 0) | bits
+        return cls(grants=grants, any_team=any_team, roles=frozenset(roles))
+
+    def can(self, module: str | UUID, action: str, team: str | UUID | None = None) -> bool:
+        """Whether ``action`` is allowed on ``module`` (id or name).
+
+        Org-wide grants apply to every team. Without ``team`` a grant on any
+        team is enough.
+        """
+        if self.superuser:
+            return True
+        bit = ACTIONS.get(action)
+        if bit is None:
+            raise ValueError(f"Unknown action {action!r}; expected one of {', '.join(ACTIONS)}")
+        key = str(module)
+        if not isinstance(module, UUID):
+            key = key if key in self.any_team else _normalize(key)
+        if team is None:
+            return bool(self.any_team.get(key, 0) & bit)
+        bits = self.grants.get((key, None), 0) | self.grants.get((key, str(team)), 0)
+        return bool(bits & bit)
+
+    def has_role(self, *names: str) -> bool:
+        return self.superuser or any(_normalize(name) in self.roles for name in names)
+
+
+SUPERUSER = PermissionMatrix(superuser=True)
+NO_PERMISSIONS = PermissionMatrix()
+
+_matrix_cache: TTLCache[tuple[UUID, str], PermissionMatrix] = TTLCache(
+    "permission_matrix",
+    maxsize=settings.PERMISSION_CACHE_MAX_ENTRIES,
+    ttl=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
+
+
+def _as_uuid(value) -> UUID | None:
+    try:
+        return value if isinstance(value, UUID) else UUID(str(value))
+    except (ValueError, TypeError):
+        return None
+
+
+async def load_permission_matrix(pool, organization_id: UUID | str, user_id: str) -> PermissionMatrix:
+    """The cached matrix for ``user_id`` in ``organization_id``; one query on a miss."""
+    if user_id in BYPASS_USER_IDS:
+        return SUPERUSER
+    org_id = _as_uuid(organization_id)
+    user_uuid = _as_uuid(user_id)
+    if org_id is None or user_uuid is None:
+        # user_roles.user_id is a uuid; e-mail style subjects have no roles.
+        return NO_PERMISSIONS
+    key = (org_id, str(user_uuid))
+    matrix = _matrix_cache.get(key)
+    if matrix is None:
+        rows = await pool.fetch(GET_EFFECTIVE_PERMISSIONS_QUERY, org_id, user_uuid)
+        matrix = PermissionMatrix.from_rows(rows)
+        _matrix_cache.set(key, matrix)
+    return matrix
+
+
+def invalidate_permissions(organization_id: UUID | str | None = None) -> None:
+    """Drop cached matrices of one organization, or all of them when it is unknown."""
+    org_id = _as_uuid(organization_id) if organization_id else None
+    if org_id is None:
+        _matrix_cache.clear()
+        return
+    _matrix_cache.invalidate(lambda key: key[0] == org_id)
+
+
+async def get_permission_matrix(
+    request: Request,
+    auth: AuthContext = Depends(get_auth_context),
+) -> PermissionMatrix:
+    """FastAPI dependency: the caller's effective permissions."""
+    if auth.user_id in BYPASS_USER_IDS:
+        return SUPERUSER
+    try:
+        return await load_permission_matrix(request.app.state.db, auth.organization_id, auth.user_id)
+    except Exception as exc:
+        logger.error("Permission lookup failed for user %s: %s", auth.user_id, exc)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "Permissions are temporarily unavailable"},
+        )
+
+
+def require_permission(module: str, action: str):
+    """Dependency factory: 403 unless the caller may ``action`` on ``module``.
+
+    A ``team_id`` query parameter, when present, scopes the check to that team.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action {action!r}")
+
+    async def dependency(
+        request: Request,
+        matrix: PermissionMatrix = Depends(get_permission_matrix),
+    ) -> PermissionMatrix:
+        if not matrix.can(module, action, request.query_params.get("team_id")):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"error": f"Not allowed to {action} {module}"},
+            )
+        return matrix
+
+    return dependency
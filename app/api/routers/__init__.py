@@ -1,29 +1,9 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, FastAPI
 
-from .root import root_router
-from fastapi import APIRouter
-from .user import user_router
-from .team import team_router
-from .role import role_router
-from .module import module_router
-from .organization import organization_router
-from .teacher import teacher_router
-from .inventory import inventory_router
-from .plan import plan_router
-from .permission import permission_router
-from .file import file_router
-from .user_role import user_role_router
-from .mail import mail_template_router
-from .classes import class_router
-from .student import student_router
-from .account import account_router
-from .song import song_router
-from .service_rota import router as service_rota_router
-from .rota_song import rota_song_router
-from .expense import expense_router
-from .checklist import router as checklist_router
+from app.core.config import settings
 from .health import router as health_router
+from .lazy import RouterGroup, include_lazily
+from .root import root_router
 
 router = APIRouter()
 
@@ -34,33 +14,49 @@ router.include_router(health_router, prefix="/health-check")
 async def health():
     from datetime import datetime
     return {"status": "ok", "time": datetime.utcnow().isoformat()}
-router.include_router(user_router, prefix="/user")
-router.include_router(team_router, prefix="/team")
-router.include_router(module_router, prefix="/module")
-router.include_router(role_router, prefix="/role")
-router.include_router(plan_router, prefix="/plan")
-router.include_router(organization_router, prefix="/organization")
-router.include_router(organization_router, prefix="/auth/api/organization")
-router.include_router(teacher_router, prefix="/teacher")
-router.include_router(inventory_router, prefix="/inventory")
-router.include_router(permission_router, prefix="/permission")
-router.include_router(file_router, prefix="/file")
-router.include_router(user_role_router, prefix="/user-role")
-router.include_router(mail_template_router, prefix="/mail")
-router.include_router(class_router, prefix="/class")
-router.include_router(student_router, prefix="/student")
-router.include_router(account_router, prefix="/account")
-router.include_router(song_router, prefix="/song")
-router.include_router(service_rota_router)
-# Legacy Mongo rota (deprecated — use service_rota module)
-# router.include_router(rota_router, prefix="/rota")
-router.include_router(rota_song_router, prefix="/rota-song")
-router.include_router(expense_router, prefix="/expense")
-router.include_router(checklist_router)
-# Legacy granular checklist routes (superseded by /checklist/* contract)
-# router.include_router(checklist_template_router, prefix="/checklist-template")
-# router.include_router(checklist_item_router, prefix="/checklist-item")
-# router.include_router(checklist_record_router, prefix="/checklist-record")
-# router.include_router(checklist_item_status_router, prefix="/checklist-item-status")
-router.include_router(root_router)
 
+
+# Route groups in mount order; root_router's catch-all is always added last.
+ROUTER_GROUPS = (
+    RouterGroup("/user", "app.api.routers.user", "user_router"),
+    RouterGroup("/team", "app.api.routers.team", "team_router"),
+    RouterGroup("/module", "app.api.routers.module", "module_router"),
+    RouterGroup("/role", "app.api.routers.role", "role_router"),
+    RouterGroup("/plan", "app.api.routers.plan", "plan_router"),
+    RouterGroup("/organization", "app.api.routers.organization", "organization_router"),
+    # Legacy IAM path for the same routes; kept out of the schema so operation ids stay unique.
+    RouterGroup("/auth/api/organization", "app.api.routers.organization", "organization_router", include_in_schema=False),
+    RouterGroup("/teacher", "app.api.routers.teacher", "teacher_router"),
+    RouterGroup("/inventory", "app.api.routers.inventory", "inventory_router"),
+    RouterGroup("/permission", "app.api.routers.permission", "permission_router"),
+    RouterGroup("/file", "app.api.routers.file", "file_router"),
+    RouterGroup("/user-role", "app.api.routers.user_role", "user_role_router"),
+    RouterGroup("/mail", "app.api.routers.mail", "mail_template_router"),
+    RouterGroup("/class", "app.api.routers.classes", "class_router"),
+    RouterGroup("/student", "app.api.routers.student", "student_router"),
+    RouterGroup("/account", "app.api.routers.account", "account_router"),
+    RouterGroup("/song", "app.api.routers.song", "song_router"),
+    RouterGroup("/rota", "app.api.routers.service_rota", own_prefix=True),
+    # Legacy Mongo rota (deprecated — use service_rota module)
+    # RouterGroup("/rota", "app.api.routers.rota", "rota_router"),
+    RouterGroup("/rota-song", "app.api.routers.rota_song", "rota_song_router"),
+    RouterGroup("/expense", "app.api.routers.expense", "expense_router"),
+    RouterGroup("/checklist", "app.api.routers.checklist", own_prefix=True),
+    # Legacy granular checklist routes (superseded by /checklist/* contract)
+    # RouterGroup("/checklist-template", "app.api.routers.checklist_template"),
+    # RouterGroup("/checklist-item", "app.api.routers.checklist_item"),
+    # RouterGroup("/checklist-record", "app.api.routers.checklist_record"),
+    # RouterGroup("/checklist-item-status", "app.api.routers.checklist_item_status"),
+)
+
+
+def include_routers(app: FastAPI, *, lazy: bool | None = None) -> None:
+    """Add every route to ``app``; with ``ROUTERS_LAZY`` each group is imported on its first request."""
+    lazy = settings.ROUTERS_LAZY if lazy is None else lazy
+    app.include_router(router)
+    if lazy:
+        include_lazily(app, ROUTER_GROUPS)
+    else:
+        for group in ROUTER_GROUPS:
+            app.include_router(group.load(), prefix=group.include_prefix, include_in_schema=group.include_in_schema)
+    app.include_router(root_router)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, File, Form, Query, Request, UploadFile
 from fastapi.responses import JSONResponse
 from typing import Optional
 from app.api.controllers import AccountController
 from app.api.services import AccountService
-from app.api.dependencies import get_db
+from app.api.dependencies import get_db, get_page_request
+from app.db.listing import PageRequest
 
 account_router = APIRouter(tags=["Account"])
 
@@ -18,14 +19,47 @@ async def save_account(request: Request, account_controller: AccountController =
     """Create a new account entry."""
     return await account_controller.save_account_controller(request)
 
+@account_router.post("/bulk-save", status_code=201)
+async def save_bulk_accounts(request: Request, account_controller: AccountController = Depends(get_account_controller)):
+    """Create many account entries: { "accounts": [...] } or a bare array."""
+    return await account_controller.save_bulk_account_controller(request)
+
+@account_router.post("/import", status_code=201)
+async def import_accounts(
+    file: UploadFile = File(..., description="CSV with a header row: date, type, payment_type, description, paid_out, paid_in, organization_id"),
+    organization_id: Optional[str] = Form(None, description="Used for rows without an organization_id"),
+    account_controller: AccountController = Depends(get_account_controller)
+):
+    """Import account entries from a CSV upload. Responds like /bulk-save."""
+    return await account_controller.import_account_csv_controller(file, organization_id)
+
 @account_router.get("/get")
 async def get_accounts(
     organization_id: str = Query(..., description="Organization ID (required)"),
+    page: PageRequest = Depends(get_page_request),
     account_controller: AccountController = Depends(get_account_controller)
 ):
-    """Get list of accounts filtered by organization_id."""
+    """Get list of accounts filtered by organization_id, newest first, paginated by cursor."""
     filters = {"organization_id": organization_id}
-    return await account_controller.fetch_account_controller(filters)
+    return await account_controller.fetch_account_controller(filters, page)
+
+@account_router.get("/export")
+async def export_accounts(
+    organization_id: str = Query(..., description="Organization ID (required)"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$"),
+    account_controller: AccountController = Depends(get_account_controller)
+):
+    """Stream every account entry of an organization as a JSON array."""
+    return account_controller.export_account_controller({"organization_id": organization_id}, order)
+
+@account_router.get("/ledger")
+async def get_account_ledger(
+    organization_id: str = Query(..., description="Organization ID (required)"),
+    as_of: Optional[str] = Query(None, description="Balance at the end of this day (YYYY-MM-DD), default today"),
+    account_controller: AccountController = Depends(get_account_controller)
+):
+    """Monthly opening/paid in/paid out/closing balances and the balance as of a day."""
+    return await account_controller.account_ledger_controller(organization_id, as_of)
 
 @account_router.put("/update/{account_id}")
 async def update_account(
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, Query, Request
 from typing import Optional
 from app.api.controllers.checklist_record import ChecklistRecordController
 from app.api.services.checklist_record import ChecklistRecordService
-from app.api.dependencies import get_db
+from app.api.dependencies import get_db, get_page_request
+from app.db.listing import PageRequest
 
 router = APIRouter(tags=["ChecklistRecord"])
 
@@ -21,6 +22,7 @@ async def get_records(
     id: Optional[str] = Query(None),
     template_id: Optional[str] = Query(None),
     team_id: Optional[str] = Query(None),
+    page: PageRequest = Depends(get_page_request),
 ):
     filters = {}
     if id:
@@ -29,7 +31,7 @@ async def get_records(
         filters["template_id"] = template_id
     if team_id:
         filters["team_id"] = team_id
-    return await controller.fetch(filters)
+    return await controller.fetch(filters, page)
 
 
 @router.post("/save")
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, File, Form, Query, Request, UploadFile
 from typing import Optional
 from app.api.controllers.expense import ExpenseController
 from app.api.services.expense import ExpenseService
-from app.api.dependencies import get_db
+from app.api.dependencies import get_db, get_page_request
+from app.db.listing import PageRequest
 
 expense_router = APIRouter(tags=["Expense"])
 
@@ -24,8 +25,13 @@ async def get_expenses(
     expense_date: Optional[str] = Query(None, description="Filter by date (YYYY-MM-DD)"),
     category: Optional[str] = Query(None, description="Filter by category"),
     title: Optional[str] = Query(None, description="Search by title"),
+    page: PageRequest = Depends(get_page_request),
 ):
-    """Get expenses with optional filters."""
+    """Get expenses with optional filters.
+
+    Results are paginated (sort: date, amount, title); pass ``next_cursor``
+    back as ``cursor`` for the next page.
+    """
     filters = {}
     if id is not None:
         filters["id"] = id
@@ -39,7 +45,50 @@ async def get_expenses(
         filters["category"] = category
     if title:
         filters["title"] = title
-    return await expense_controller.fetch_expense_controller(filters)
+    return await expense_controller.fetch_expense_controller(filters, page)
+
+
+@expense_router.get("/export")
+async def export_expenses(
+    expense_controller: ExpenseController = Depends(get_expense_controller),
+    organization_id: str = Query(..., description="Organization ID"),
+    team_id: Optional[str] = Query(None, description="Team ID"),
+    sort: Optional[str] = Query(None, description="date, amount or title"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$"),
+):
+    """Stream every expense of an organization as a JSON array."""
+    filters = {"organization_id": organization_id}
+    if team_id:
+        filters["team_id"] = team_id
+    return expense_controller.export_expense_controller(filters, sort, order)
+
+
+@expense_router.get("/summary")
+async def get_expense_summary(
+    expense_controller: ExpenseController = Depends(get_expense_controller),
+    organization_id: str = Query(..., description="Organization ID"),
+    period: str = Query("month", pattern="^(day|week|month|year)$", description="Period bucket"),
+    group_by: str = Query("period", description="Comma-separated: period, category, team"),
+    start_date: Optional[str] = Query(None, description="From date, inclusive (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="To date, inclusive (YYYY-MM-DD)"),
+    team_id: Optional[str] = Query(None, description="Only this team's expenses"),
+    running_total: bool = Query(False, description="Add a running total across periods"),
+):
+    """Expense totals aggregated in the database.
+
+    Each group has ``total`` and ``expense_count`` plus the requested
+    dimensions; ``running_total`` accumulates over periods within each
+    category/team group.
+    """
+    return await expense_controller.expense_summary_controller(
+        organization_id,
+        period=period,
+        group_by=group_by,
+        start_date=start_date,
+        end_date=end_date,
+        team_id=team_id,
+        running_total=running_total,
+    )
 
 
 @expense_router.post("/bulk-save")
@@ -55,6 +104,16 @@ async def save_bulk_expense(
     return await expense_controller.save_bulk_expense_controller(request)
 
 
+@expense_router.post("/import")
+async def import_expenses(
+    file: UploadFile = File(..., description="CSV with a header row: title, amount, category, expense_date, description, organization_id, team_id"),
+    organization_id: Optional[str] = Form(None, description="Used for rows without an organization_id"),
+    expense_controller: ExpenseController = Depends(get_expense_controller)
+):
+    """Import expenses from a CSV upload. Responds like /bulk-save."""
+    return await expense_controller.import_expense_csv_controller(file, organization_id)
+
+
 @expense_router.get("/{expense_id}")
 async def get_expense_by_id(
     expense_id: int,
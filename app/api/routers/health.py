@@ -1,6 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from datetime import datetime
 
+from app.db.pool import pool_stats
+from app.db.query_registry import registry
+from app.db.session import peek_engine
+from app.utils.cache import cache_stats
+
 router = APIRouter(tags=["Health"])
 
 @router.get("/", summary="Health Check")
@@ -10,3 +15,30 @@ async def health_check():
         "code": 200,
         "message": "success"
     }
+
+
+@router.get("/cache", summary="In-process cache statistics")
+async def cache_health():
+    return {
+        "timeZone": datetime.utcnow().isoformat(),
+        "code": 200,
+        "caches": cache_stats(),
+    }
+
+
+@router.get("/pool", summary="Shared database pool statistics")
+async def pool_health():
+    return {
+        "timeZone": datetime.utcnow().isoformat(),
+        "code": 200,
+        "pool": pool_stats(peek_engine()),
+    }
+
+
+@router.get("/queries", summary="Per-query call counts and latency")
+async def query_health(limit: int = Query(50, ge=1, le=500)):
+    return {
+        "timeZone": datetime.utcnow().isoformat(),
+        "code": 200,
+        **registry.stats(limit),
+    }
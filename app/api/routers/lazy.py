@@ -0,0 +1,121 @@
+"""Route groups imported on first use.
+
+Every router module pulls in its controller and service, and through them
+motor/pymongo, jose and friends; importing all of them costs each worker a
+large share of its cold start. A ``RouterGroup`` names a router by module
+path instead, and ``LazyRouterGroup`` stands in for it in the app's route
+table. The first request under the group's prefix imports the module and
+splices the real routes in place of the stand-in, so later requests,
+route order and 404/405 handling are exactly as if the router had been
+included eagerly. Generating the OpenAPI schema loads every group first.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+
+from fastapi import APIRouter, FastAPI
+from starlette.datastructures import URLPath
+from starlette.routing import BaseRoute, Match, NoMatchFound, get_route_path
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouterGroup:
+    # Path prefix the group's routes live under; also what the stand-in matches.
+    prefix: str
+    module: str
+    attr: str = "router"
+    # The router declares the prefix itself (APIRouter(prefix=...)).
+    own_prefix: bool = False
+    include_in_schema: bool = True
+
+    @property
+    def include_prefix(self) -> str:
+        return "" if self.own_prefix else self.prefix
+
+    def load(self) -> APIRouter:
+        return getattr(importlib.import_module(self.module), self.attr)
+
+    def routes(self) -> list[BaseRoute]:
+        """The group's routes with prefixes applied, as ``include_router`` would add them."""
+        holder = APIRouter()
+        holder.include_router(
+            self.load(), prefix=self.include_prefix, include_in_schema=self.include_in_schema
+        )
+        return holder.routes
+
+
+class LazyRouterGroup(BaseRoute):
+    def __init__(self, app: FastAPI, group: RouterGroup):
+        self.app = app
+        self.group = group
+        self._routes: list[BaseRoute] | None = None
+
+    def load(self) -> list[BaseRoute]:
+        """Import the group and replace this stand-in with its routes (once)."""
+        if self._routes is None:
+            started = time.perf_counter()
+            self._routes = self.group.routes()
+            table = self.app.router.routes
+            if self in table:
+                index = table.index(self)
+                table[index:index + 1] = self._routes
+            logger.info(
+                "Loaded route group %s (%s) in %.1f ms",
+                self.group.prefix, self.group.module, (time.perf_counter() - started) * 1000,
+            )
+        return self._routes
+
+    def _covers(self, scope: Scope) -> bool:
+        path = get_route_path(scope)
+        prefix = self.group.prefix
+        return path == prefix or path.startswith(prefix + "/")
+
+    def _match(self, scope: Scope) -> tuple[Match, BaseRoute | None]:
+        partial = None
+        for route in self.load():
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return match, route
+            if match == Match.PARTIAL and partial is None:
+                partial = route
+        return (Match.PARTIAL, partial) if partial is not None else (Match.NONE, None)
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket") or not self._covers(scope):
+            return Match.NONE, {}
+        match, _ = self._match(scope)
+        return match, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Same dispatch the router would have done had the routes been there already.
+        _, route = self._match(scope)
+        _, child_scope = route.matches(scope)
+        scope["route"] = route
+        scope.update(child_scope)
+        await route.handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params) -> URLPath:
+        raise NoMatchFound(name, path_params)
+
+
+def include_lazily(app: FastAPI, groups: tuple[RouterGroup, ...]) -> list[LazyRouterGroup]:
+    """Add a stand-in per group; ``app.openapi()`` loads them all before building the schema."""
+    stand_ins = [LazyRouterGroup(app, group) for group in groups]
+    app.router.routes.extend(stand_ins)
+    build_openapi = app.openapi
+
+    def openapi():
+        if app.openapi_schema is None:
+            for stand_in in stand_ins:
+                stand_in.load()
+        return build_openapi()
+
+    app.openapi = openapi
+    return stand_ins
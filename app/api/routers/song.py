@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, Query, Request
 from typing import Optional
+from app.api.conditional import conditional, resource_etag
 from app.api.controllers.song import SongController
 from app.api.services.song import SongService
-from app.api.dependencies import get_db
+from app.api.dependencies import get_db, get_page_request
+from app.db.listing import PageRequest
 
 song_router = APIRouter(tags=["Song"])
 
@@ -17,9 +19,11 @@ def get_song_controller(song_service=Depends(get_song_service)):
 
 @song_router.get("/get")
 async def get_songs(
+    request: Request,
     song_controller: SongController = Depends(get_song_controller),
     id: Optional[int] = Query(None, description="Song ID"),
     organization_id: Optional[int] = Query(None, description="Organization ID"),
+    q: Optional[str] = Query(None, description="Ranked search over title, artist and lyrics (needs organization_id)"),
     title: Optional[str] = Query(None, description="Search by title"),
     artist: Optional[str] = Query(None, description="Search by artist"),
     scale: Optional[str] = Query(None, description="Search by scale"),
@@ -27,15 +31,21 @@ async def get_songs(
     chords: Optional[str] = Query(None, description="Search by chords"),
     rhythm: Optional[str] = Query(None, description="Search by rhythm"),
     lyrics: Optional[str] = Query(None, description="Search by lyrics"),
+    page: PageRequest = Depends(get_page_request),
 ):
     """
     Get songs with optional filters.
+    Paginated (sort: created, title); pass next_cursor back as cursor.
+    With q, returns the best matches ranked, with highlights (limit applies, no cursor).
+    With organization_id the response carries an ETag for If-None-Match.
     """
     filters = {}
     if id is not None:
         filters["id"] = id
     if organization_id is not None:
         filters["organization_id"] = organization_id
+    if q and q.strip():
+        filters["q"] = q
     if title:
         filters["title"] = title
     if artist:
@@ -51,7 +61,19 @@ async def get_songs(
     if lyrics:
         filters["lyrics"] = lyrics
 
-    return await song_controller.fetch_song_controller(filters)
+    etag = await resource_etag(request, organization_id, ("songs",), sorted(request.query_params.multi_items()))
+    return await conditional(request, etag, lambda: song_controller.fetch_song_controller(filters, page))
+
+
+@song_router.get("/autocomplete")
+async def autocomplete_songs(
+    organization_id: int = Query(..., description="Organization ID"),
+    prefix: str = Query(..., min_length=1, description="Typed prefix of a title or artist"),
+    limit: int = Query(10, ge=1, le=50),
+    song_controller: SongController = Depends(get_song_controller),
+):
+    """Suggest songs whose title (or a word in it) or artist starts with prefix."""
+    return await song_controller.autocomplete_song_controller(organization_id, prefix, limit)
 
 
 @song_router.get("/{song_id}")
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, Query, Request
 from typing import List, Optional
 from app.api.controllers import UserRoleController
 from app.api.services import UserRoleService
-from app.api.dependencies import get_db
+from app.api.dependencies import get_db, get_page_request
+from app.db.listing import PageRequest
 
 user_role_router = APIRouter(tags=["UserRole"])
 
@@ -19,7 +20,8 @@ async def get_all_user_roles(user_role_controller: UserRoleController = Depends(
     user_id: Optional[str] = Query(None),
     role_id: Optional[str] = Query(None),
     role_ids: Optional[List[str]] = Query(None),
-    team_id: Optional[str] = Query(None)):
+    team_id: Optional[str] = Query(None),
+    page: PageRequest = Depends(get_page_request)):
     filters = {}
     if id:
         filters["id"] = id
@@ -33,7 +35,7 @@ async def get_all_user_roles(user_role_controller: UserRoleController = Depends(
         filters["role_id"] = role_id
     if team_id:
         filters["team_id"] = team_id
-    return await user_role_controller.fetch_user_role_controller(filters)
+    return await user_role_controller.fetch_user_role_controller(filters, page)
 
 @user_role_router.post("/save")
 async def save_user_role(request: Request, user_role_controller: UserRoleController = Depends(get_user_role_controller)):
@@ -56,12 +58,14 @@ async def update_roles(request: Request, user_role_controller: UserRoleControlle
     return await user_role_controller.update_roles_controller(request)
 
 @user_role_router.get("/get-overview")
-async def get_user_roles_overview(user_role_controller: UserRoleController = Depends(get_user_role_controller),
+async def get_user_roles_overview(request: Request, user_role_controller: UserRoleController = Depends(get_user_role_controller),
     id: str = Query(None),
     organization_id: str = Query(None),
     user_id: str = Query(None),
     role_id: str = Query(None),
     team_id: str = Query(None)):
+    """User roles with role details. With organization_id the response carries an
+    ETag; send it back as If-None-Match to get 304 while nothing changed."""
     filters = {}
     if id:
         filters["id"] = id
@@ -73,5 +77,5 @@ async def get_user_roles_overview(user_role_controller: UserRoleController = Dep
         filters["role_id"] = role_id
     if team_id:
         filters["team_id"] = team_id
-    return await user_role_controller.fetch_user_role_overview_controller(filters)
+    return await user_role_controller.fetch_user_role_overview_controller(filters, request)
 
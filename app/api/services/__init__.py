@@ -1,49 +1,49 @@
-from .user import UserService
-from .team import TeamService
-from .role import RoleService
-from .module import ModuleService
-from .organization import OrganizationService
-from .teacher import TeacherService
-from .inventory import InventoryService
-from .plan import PlanService
-from .permission import PermissionService
-from .file import FileService
-from .user_role import UserRoleService
-from .mail import MailTemplateService
-from .classes import ClassService
-from .student import StudentService
-from .account import AccountService
-from .song import SongService
-from .rota import RotaService
-from .rota_song import RotaSongService
-from .expense import ExpenseService
-from .checklist_template import ChecklistTemplateService
-from .checklist_item import ChecklistItemService
-from .checklist_record import ChecklistRecordService
-from .checklist_item_status import ChecklistItemStatusService
-
-__all__ = [
-    "UserService", 
-    "TeamService", 
-    "RoleService", 
-    "ModuleService", 
-    "OrganizationService",
-    "TeacherService",
-    "InventoryService",
-    "PlanService",
-    "PermissionService",
-    "FileService",
-    "UserRoleService",
-    "MailTemplateService",
-    "ClassService",
-    "StudentService",
-    "AccountService",
-    "SongService",
-    "RotaService",
-    "RotaSongService",
-    "ExpenseService",
-    "ChecklistTemplateService",
-    "ChecklistItemService",
-    "ChecklistRecordService",
-    "ChecklistItemStatusService",
-]
+"""Service classes, imported on first access.
+
+``from app.api.services import X`` only imports the module defining ``X``, so
+loading one route group does not drag in every other service (and Mongo,
+jose, ... with them).
+"""
+
+import importlib
+
+_EXPORTS = {
+    "UserService": "user",
+    "TeamService": "team",
+    "RoleService": "role",
+    "ModuleService": "module",
+    "OrganizationService": "organization",
+    "TeacherService": "teacher",
+    "InventoryService": "inventory",
+    "PlanService": "plan",
+    "PermissionService": "permission",
+    "FileService": "file",
+    "UserRoleService": "user_role",
+    "MailTemplateService": "mail",
+    "ClassService": "classes",
+    "StudentService": "student",
+    "AccountService": "account",
+    "SongService": "song",
+    "RotaService": "rota",
+    "RotaSongService": "rota_song",
+    "ExpenseService": "expense",
+    "ChecklistTemplateService": "checklist_template",
+    "ChecklistItemService": "checklist_item",
+    "ChecklistRecordService": "checklist_record",
+    "ChecklistItemStatusService": "checklist_item_status",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,17 +2,50 @@ from typing import List
 from fastapi import HTTPException
 import asyncpg
 import logging
-from datetime import datetime
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
 from app.api import dependencies
+from app.db.bulk import bulk_report, check_batch_size
+from app.db.listing import InvalidListingParams, Listing, Page, PageRequest, SortKey, fetch_page, stream_json_array
 from app.queries.account import (
     GET_ACCOUNTS_QUERY,
     GET_ACCOUNT_BY_ID_QUERY,
+    GET_ACCOUNT_FOR_UPDATE_QUERY,
     GET_ACCOUNTS_BY_ORGANIZATION_QUERY,
     INSERT_ACCOUNT_QUERY,
     UPDATE_ACCOUNT_QUERY,
     DELETE_ACCOUNT_QUERY,
+    APPLY_ACCOUNT_ROLLUP_QUERY,
+    GET_ACCOUNT_LEDGER_QUERY,
+    GET_ACCOUNT_BALANCE_AS_OF_QUERY,
+    GET_ACCOUNTS_BY_IDS_QUERY,
+    APPLY_ACCOUNT_ROLLUPS_FOR_IDS_QUERY,
 )
 
+ACCOUNT_LISTING = Listing(
+    sorts={"date": (SortKey("date", "timestamptz"), SortKey("id", "uuid"))},
+    default_sort="date",
+)
+
+ACCOUNT_COPY_COLUMNS = (
+    "id", "date", "type", "payment_type", "description", "paid_out", "paid_in", "organization_id",
+)
+
+
+async def _apply_rollup(conn, row, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) an account row's amounts in its monthly rollup."""
+    await conn.execute(
+        APPLY_ACCOUNT_ROLLUP_QUERY,
+        row["organization_id"],
+        row["date"],
+        row["payment_type"],
+        row["paid_in"],
+        row["paid_out"],
+        sign,
+    )
+
+
 class AccountService:
     def __init__(self, db_pool: asyncpg.Pool):
         self.db_pool = db_pool
@@ -104,7 +137,6 @@ class AccountService:
                 errors.append({"field": "organization_id", "message": "Organization ID is required"})
             else:
                 try:
-                    import uuid
                     uuid.UUID(str(data['organization_id']))
                 except (ValueError, AttributeError):
                     errors.append({"field": "organization_id", "message": "Organization ID must be a valid UUID"})
@@ -120,27 +152,49 @@ class AccountService:
         
         return data
 
+    def _listing_query(self, filters: dict) -> tuple[str, list]:
+        if "organization_id" in filters:
+            return GET_ACCOUNTS_BY_ORGANIZATION_QUERY, [filters["organization_id"]]
+        return GET_ACCOUNTS_QUERY, []
+
     async def get_account_data(self, filters: dict = {}) -> List[dict]:
         """Get account data with filtering"""
+        if "id" not in filters:
+            return (await self.get_account_page(filters, PageRequest())).items
         try:
             async with self.db_pool.acquire() as conn:
-                if "id" in filters:
-                    account = await conn.fetchrow(GET_ACCOUNT_BY_ID_QUERY, filters["id"])
-                    if account:
-                        return [dependencies.convert_db_types(dict(account))]
-                    return []
-                elif "organization_id" in filters:
-                    rows = await conn.fetch(
-                        GET_ACCOUNTS_BY_ORGANIZATION_QUERY,
-                        filters["organization_id"]
-                    )
-                    return [dependencies.convert_db_types(dict(row)) for row in rows]
-                rows = await conn.fetch(GET_ACCOUNTS_QUERY)
-                return [dependencies.convert_db_types(dict(row)) for row in rows]
+                account = await conn.fetchrow(GET_ACCOUNT_BY_ID_QUERY, filters["id"])
+                if account:
+                    return [dependencies.convert_db_types(dict(account))]
+                return []
         except Exception as e:
             logging.error(f"❌ Error fetching account data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
+    async def get_account_page(self, filters: dict, page: PageRequest) -> Page:
+        """One page of accounts, newest first by default"""
+        query, args = self._listing_query(filters)
+        try:
+            async with self.db_pool.acquire() as conn:
+                result = await fetch_page(conn, query, args, ACCOUNT_LISTING, page)
+        except InvalidListingParams as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logging.error(f"❌ Error fetching account data: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+        result.items = [dependencies.convert_db_types(dict(row)) for row in result.items]
+        return result
+
+    def stream_accounts(self, filters: dict, order: str = None):
+        """Async iterator of JSON bytes for every matching account entry (exports)"""
+        query, args = self._listing_query(filters)
+        try:
+            return stream_json_array(
+                self.db_pool, query, args, ACCOUNT_LISTING, dependencies.convert_db_types, order=order
+            )
+        except InvalidListingParams as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     async def save_account_data(self, account_data: dict) -> dict:
         """Save new account"""
         try:
@@ -159,16 +213,19 @@ class AccountService:
                 paid_in = validated_data.get('paid_in', 0)
                 organization_id = validated_data.get('organization_id')
                 
-                row = await conn.fetchrow(
-                    INSERT_ACCOUNT_QUERY,
-                    date,
-                    type_value,
-                    payment_type,
-                    description,
-                    paid_out,
-                    paid_in,
-                    organization_id
-                )
+                async with conn.transaction():
+                    row = await conn.fetchrow(
+                        INSERT_ACCOUNT_QUERY,
+                        date,
+                        type_value,
+                        payment_type,
+                        description,
+                        paid_out,
+                        paid_in,
+                        organization_id
+                    )
+                    if row:
+                        await _apply_rollup(conn, row, 1)
                 if row:
                     return dependencies.convert_db_types(dict(row))
                 return {}
@@ -178,6 +235,56 @@ class AccountService:
             logging.error(f"❌ Error saving account data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
+    async def save_bulk_account_data(self, accounts: list, organization_id: str = None) -> dict:
+        """Validate every entry, then COPY the valid ones in a single transaction.
+
+        ``organization_id`` fills in entries that do not carry their own (CSV
+        uploads). The monthly rollups are updated in the same transaction.
+        """
+        check_batch_size(accounts)
+        entries: list = [None] * len(accounts)
+        valid = []
+        for index, item in enumerate(accounts):
+            if not isinstance(item, dict):
+                entries[index] = {"status": "failed", "error": "account entry must be an object"}
+                continue
+            item = dict(item)
+            if organization_id and not item.get('organization_id'):
+                item['organization_id'] = organization_id
+            try:
+                data = self._validate_account_data(item, is_update=False)
+                valid.append((index, (
+                    uuid.uuid4(),
+                    self._parse_datetime(data['date']),
+                    data['type'],
+                    data.get('payment_type') or None,
+                    data['description'],
+                    Decimal(str(data['paid_out'])),
+                    Decimal(str(data['paid_in'])),
+                    str(data['organization_id']),
+                )))
+            except HTTPException as e:
+                entries[index] = {"status": "failed", "error": e.detail}
+
+        if valid:
+            ids = [values[0] for _, values in valid]
+            try:
+                async with self.db_pool.acquire() as conn:
+                    async with conn.transaction():
+                        await conn.copy_records_to_table(
+                            "accounts", records=[values for _, values in valid], columns=ACCOUNT_COPY_COLUMNS
+                        )
+                        await conn.execute(APPLY_ACCOUNT_ROLLUPS_FOR_IDS_QUERY, ids)
+                        rows = {r["id"]: r for r in await conn.fetch(GET_ACCOUNTS_BY_IDS_QUERY, ids)}
+                for account_id, (index, _) in zip(ids, valid):
+                    entries[index] = {"status": "success", "data": dependencies.convert_db_types(dict(rows[account_id]))}
+            except Exception as e:
+                # The batch is loaded atomically, so a database error fails every valid entry.
+                logging.error(f"❌ Error bulk saving account data: {e}")
+                for index, _ in valid:
+                    entries[index] = {"status": "failed", "error": f"Database query error: {str(e)}"}
+        return bulk_report(entries)
+
     async def update_account_data(self, account_id: str, account_data: dict) -> dict:
         """Update existing account"""
         if not account_id:
@@ -188,40 +295,41 @@ class AccountService:
             validated_data = self._validate_account_data(account_data, is_update=True)
             
             async with self.db_pool.acquire() as conn:
-                # Check if account exists
-                existing = await conn.fetchrow(GET_ACCOUNT_BY_ID_QUERY, account_id)
-                if not existing:
-                    raise HTTPException(status_code=404, detail="Account not found")
-                
-                # Merge existing data with update data
-                merged_data = dict(existing)
-                merged_data.update(validated_data)
-                
-                # Parse date
-                date = self._parse_datetime(merged_data['date'])
-                
-                # Extract values
-                type_value = merged_data.get('type', '').lower()
-                payment_type = merged_data.get('payment_type')
-                description = merged_data.get('description', '')
-                paid_out = merged_data.get('paid_out', 0)
-                paid_in = merged_data.get('paid_in', 0)
-                organization_id = merged_data.get('organization_id')
-                
-                row = await conn.fetchrow(
-                    UPDATE_ACCOUNT_QUERY,
-                    date,
-                    type_value,
-                    payment_type,
-                    description,
-                    paid_out,
-                    paid_in,
-                    organization_id,
-                    account_id
-                )
-                if row:
-                    return dependencies.convert_db_types(dict(row))
-                raise HTTPException(status_code=404, detail="Account not found")
+                async with conn.transaction():
+                    # Lock the row so the rollup delta removes exactly the values being replaced
+                    existing = await conn.fetchrow(GET_ACCOUNT_FOR_UPDATE_QUERY, account_id)
+                    if not existing:
+                        raise HTTPException(status_code=404, detail="Account not found")
+
+                    # Merge existing data with update data
+                    merged_data = dict(existing)
+                    merged_data.update(validated_data)
+
+                    # Parse date
+                    date = self._parse_datetime(merged_data['date'])
+
+                    # Extract values
+                    type_value = merged_data.get('type', '').lower()
+                    payment_type = merged_data.get('payment_type')
+                    description = merged_data.get('description', '')
+                    paid_out = merged_data.get('paid_out', 0)
+                    paid_in = merged_data.get('paid_in', 0)
+                    organization_id = merged_data.get('organization_id')
+
+                    row = await conn.fetchrow(
+                        UPDATE_ACCOUNT_QUERY,
+                        date,
+                        type_value,
+                        payment_type,
+                        description,
+                        paid_out,
+                        paid_in,
+                        organization_id,
+                        account_id
+                    )
+                    await _apply_rollup(conn, existing, -1)
+                    await _apply_rollup(conn, row, 1)
+                return dependencies.convert_db_types(dict(row))
         except HTTPException:
             raise
         except Exception as e:
@@ -232,8 +340,11 @@ class AccountService:
         """Delete account"""
         try:
             async with self.db_pool.acquire() as conn:
-                result = await conn.execute(DELETE_ACCOUNT_QUERY, account_id)
-                if result and result.startswith("DELETE 1"):
+                async with conn.transaction():
+                    row = await conn.fetchrow(DELETE_ACCOUNT_QUERY, account_id)
+                    if row:
+                        await _apply_rollup(conn, row, -1)
+                if row:
                     return ""
                 raise HTTPException(status_code=404, detail="Account not found")
         except HTTPException:
@@ -242,3 +353,51 @@ class AccountService:
             logging.error(f"❌ Error deleting account data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
+    async def get_account_ledger(self, organization_id: str, as_of: str = None) -> dict:
+        """Monthly ledger (opening, paid_in, paid_out, closing) and the balance as of a day.
+
+        Read from the monthly rollups, so the cost grows with the number of
+        months rather than the number of entries. ``as_of`` (YYYY-MM-DD,
+        inclusive) defaults to today (UTC).
+        """
+        if as_of:
+            try:
+                as_of_day = date.fromisoformat(as_of[:10])
+            except ValueError:
+                raise HTTPException(status_code=400, detail="as_of must be a date (YYYY-MM-DD)")
+        else:
+            as_of_day = datetime.now(timezone.utc).date()
+        month_start = as_of_day.replace(day=1)
+        end = datetime.combine(as_of_day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+        try:
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(GET_ACCOUNT_LEDGER_QUERY, organization_id, month_start)
+                balance = await conn.fetchval(
+                    GET_ACCOUNT_BALANCE_AS_OF_QUERY, organization_id, month_start, end
+                )
+        except Exception as e:
+            logging.error(f"❌ Error fetching account ledger: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+
+        months = []
+        for row in rows:
+            net = row["paid_in"] - row["paid_out"]
+            months.append(dependencies.convert_db_types({
+                "month": row["month"],
+                "opening": row["closing"] - net,
+                "paid_in": row["paid_in"],
+                "paid_out": row["paid_out"],
+                "closing": row["closing"],
+                "entry_count": row["entry_count"],
+            }))
+            months[-1]["payment_type_counts"] = {
+                payment_type or "unspecified": count
+                for payment_type, count in zip(row["payment_types"], row["payment_type_counts"])
+                if count
+            }
+        return {
+            "months": months,
+            "as_of": as_of_day.isoformat(),
+            "balance": float(balance if balance is not None else Decimal(0)),
+        }
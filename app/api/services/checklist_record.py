@@ -4,6 +4,7 @@ import asyncpg
 import logging
 from datetime import datetime, date
 from app.api import dependencies
+from app.db.listing import InvalidListingParams, Listing, Page, PageRequest, SortKey, fetch_page
 from app.queries.checklist_record import (
     GET_CHECKLIST_RECORDS_QUERY,
     GET_CHECKLIST_RECORD_BY_ID_QUERY,
@@ -14,6 +15,11 @@ from app.queries.checklist_record import (
     DELETE_CHECKLIST_RECORD_QUERY,
 )
 
+CHECKLIST_RECORD_LISTING = Listing(
+    sorts={"date": (SortKey("date", "date"), SortKey("id", "uuid"))},
+    default_sort="date",
+)
+
 
 class ChecklistRecordService:
     def __init__(self, db_pool: asyncpg.Pool):
@@ -36,24 +42,37 @@ class ChecklistRecordService:
                     return None
         return None
 
+    def _listing_query(self, filters: dict) -> tuple[str, list]:
+        if "template_id" in filters:
+            return GET_CHECKLIST_RECORDS_BY_TEMPLATE_QUERY, [filters["template_id"]]
+        if "team_id" in filters:
+            return GET_CHECKLIST_RECORDS_BY_TEAM_QUERY, [filters["team_id"]]
+        return GET_CHECKLIST_RECORDS_QUERY, []
+
     async def get_data(self, filters: dict = None) -> List[dict]:
         filters = filters or {}
+        if "id" not in filters:
+            return (await self.get_page(filters, PageRequest())).items
+        try:
+            async with self.db_pool.acquire() as conn:
+                row = await conn.fetchrow(GET_CHECKLIST_RECORD_BY_ID_QUERY, filters["id"])
+                return [dependencies.convert_db_types(dict(row))] if row else []
+        except Exception as e:
+            logging.error(f"❌ Error fetching checklist record: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def get_page(self, filters: dict, page: PageRequest) -> Page:
+        query, args = self._listing_query(filters or {})
         try:
             async with self.db_pool.acquire() as conn:
-                if "id" in filters:
-                    row = await conn.fetchrow(GET_CHECKLIST_RECORD_BY_ID_QUERY, filters["id"])
-                    return [dependencies.convert_db_types(dict(row))] if row else []
-                elif "template_id" in filters:
-                    rows = await conn.fetch(GET_CHECKLIST_RECORDS_BY_TEMPLATE_QUERY, filters["template_id"])
-                    return [dependencies.convert_db_types(dict(r)) for r in rows]
-                elif "team_id" in filters:
-                    rows = await conn.fetch(GET_CHECKLIST_RECORDS_BY_TEAM_QUERY, filters["team_id"])
-                    return [dependencies.convert_db_types(dict(r)) for r in rows]
-                rows = await conn.fetch(GET_CHECKLIST_RECORDS_QUERY)
-                return [dependencies.convert_db_types(dict(r)) for r in rows]
+                result = await fetch_page(conn, query, args, CHECKLIST_RECORD_LISTING, page)
+        except InvalidListingParams as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logging.error(f"❌ Error fetching checklist record: {e}")
             raise HTTPException(status_code=500, detail=str(e))
+        result.items = [dependencies.convert_db_types(dict(r)) for r in result.items]
+        return result
 
     async def save_data(self, data: dict) -> dict:
         try:
@@ -5,6 +5,8 @@ import logging
 from datetime import datetime, date
 from decimal import Decimal
 from app.api import dependencies
+from app.db.bulk import as_uuid, bulk_report, check_batch_size
+from app.db.listing import InvalidListingParams, Listing, Page, PageRequest, SortKey, fetch_page, stream_json_array
 from app.queries.expense import (
     GET_EXPENSES_QUERY,
     GET_EXPENSE_BY_ID_QUERY,
@@ -14,8 +16,30 @@ from app.queries.expense import (
     INSERT_EXPENSE_QUERY,
     UPDATE_EXPENSE_QUERY,
     DELETE_EXPENSE_QUERY,
+    EXPENSE_SUMMARY_QUERY,
+    ALLOCATE_EXPENSE_IDS_QUERY,
+    GET_EXPENSES_BY_IDS_QUERY,
 )
 
+EXPENSE_LISTING = Listing(
+    sorts={
+        # id follows creation order, standing in for the old created_at tie-break.
+        "date": (SortKey("expense_date", "date"), SortKey("id", "int4")),
+        "amount": (SortKey("amount", "numeric"), SortKey("id", "int4")),
+        "title": (SortKey("title", "text"), SortKey("id", "int4")),
+    },
+    default_sort="date",
+)
+
+EXPENSE_COPY_COLUMNS = (
+    "id", "title", "amount", "category", "expense_date", "description", "organization_id", "team_id",
+)
+
+SUMMARY_PERIODS = ("day", "week", "month", "year")
+SUMMARY_DIMENSIONS = ("period", "category", "team")
+# expenses.amount is DECIMAL(12, 2)
+MAX_EXPENSE_AMOUNT = Decimal("10000000000")
+
 
 class ExpenseService:
     def __init__(self, db_pool: asyncpg.Pool):
@@ -47,102 +71,218 @@ class ExpenseService:
         except Exception:
             return None
 
+    def _listing_query(self, filters: dict) -> tuple[str, list]:
+        if "team_id" in filters:
+            return GET_EXPENSES_BY_TEAM_QUERY, [filters["team_id"]]
+        if "organization_id" in filters:
+            if any(k in filters for k in ["expense_date", "team_id", "category", "title"]):
+                exp_date = self._parse_date(filters.get("expense_date")) or filters.get("expense_date")
+                return SEARCH_EXPENSES_QUERY, [
+                    filters["organization_id"],
+                    exp_date,
+                    filters.get("team_id"),
+                    filters.get("category"),
+                    filters.get("title"),
+                ]
+            return GET_EXPENSES_BY_ORGANIZATION_QUERY, [filters["organization_id"]]
+        return GET_EXPENSES_QUERY, []
+
     async def get_expense_data(self, filters: dict = None) -> List[dict]:
         filters = filters or {}
+        if "id" not in filters:
+            return (await self.get_expense_page(filters, PageRequest())).items
         try:
             async with self.db_pool.acquire() as conn:
-                if "id" in filters:
-                    row = await conn.fetchrow(GET_EXPENSE_BY_ID_QUERY, filters["id"])
-                    if row:
-                        return [dependencies.convert_db_types(dict(row))]
-                    return []
-                elif "team_id" in filters:
-                    rows = await conn.fetch(GET_EXPENSES_BY_TEAM_QUERY, filters["team_id"])
-                    return [dependencies.convert_db_types(dict(r)) for r in rows]
-                elif "organization_id" in filters:
-                    if any(k in filters for k in ["expense_date", "team_id", "category", "title"]):
-                        exp_date = self._parse_date(filters.get("expense_date")) or filters.get("expense_date")
-                        rows = await conn.fetch(
-                            SEARCH_EXPENSES_QUERY,
-                            filters["organization_id"],
-                            exp_date,
-                            filters.get("team_id"),
-                            filters.get("category"),
-                            filters.get("title")
-                        )
-                    else:
-                        rows = await conn.fetch(
-                            GET_EXPENSES_BY_ORGANIZATION_QUERY,
-                            filters["organization_id"]
-                        )
-                    return [dependencies.convert_db_types(dict(r)) for r in rows]
-
-                rows = await conn.fetch(GET_EXPENSES_QUERY)
-                return [dependencies.convert_db_types(dict(r)) for r in rows]
+                row = await conn.fetchrow(GET_EXPENSE_BY_ID_QUERY, filters["id"])
+                if row:
+                    return [dependencies.convert_db_types(dict(row))]
+                return []
         except Exception as e:
             logging.error(f"❌ Error fetching expense data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
-    async def save_expense_data(self, data: dict) -> dict:
+    async def get_expense_page(self, filters: dict, page: PageRequest) -> Page:
+        query, args = self._listing_query(filters or {})
         try:
             async with self.db_pool.acquire() as conn:
-                title = (data.get('title') or '').strip()
-                amount = self._parse_decimal(data.get('amount'))
-                category = data.get('category')
-                expense_date = self._parse_date(data.get('expense_date') or data.get('date'))
-                description = data.get('description')
-                organization_id = data.get('organization_id')
-                team_id = data.get('team_id')
-
-                if not organization_id:
-                    raise HTTPException(status_code=400, detail="organization_id is required")
-                if not title:
-                    raise HTTPException(status_code=400, detail="title is required and cannot be empty")
-                if amount is None or amount < 0:
-                    raise HTTPException(status_code=400, detail="amount is required and must be >= 0")
-                if expense_date is None:
-                    raise HTTPException(status_code=400, detail="expense_date is required and must be a valid date")
+                result = await fetch_page(conn, query, args, EXPENSE_LISTING, page)
+        except InvalidListingParams as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logging.error(f"❌ Error fetching expense data: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+        result.items = [dependencies.convert_db_types(dict(r)) for r in result.items]
+        return result
 
-                row = await conn.fetchrow(
-                    INSERT_EXPENSE_QUERY,
-                    title,
-                    amount,
-                    category,
-                    expense_date,
-                    description,
+    def stream_expenses(self, filters: dict, sort: str | None = None, order: str | None = None):
+        """Async iterator of JSON bytes for every matching expense (exports)."""
+        query, args = self._listing_query(filters or {})
+        try:
+            return stream_json_array(
+                self.db_pool, query, args, EXPENSE_LISTING, dependencies.convert_db_types,
+                sort=sort, order=order,
+            )
+        except InvalidListingParams as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def get_expense_summary(
+        self,
+        organization_id: str,
+        *,
+        period: str = "month",
+        group_by: str = "period",
+        start_date=None,
+        end_date=None,
+        team_id: str | None = None,
+        running_total: bool = False,
+    ) -> dict:
+        """Expense totals grouped in SQL by period, category and/or team.
+
+        ``group_by`` is a comma-separated subset of ``period,category,team``.
+        Returns ``{"groups": [...], "total": ..., "expense_count": ...}``.
+        """
+        dimensions = {d.strip() for d in (group_by or "").split(",") if d.strip()}
+        unknown = dimensions - set(SUMMARY_DIMENSIONS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"group_by must be a subset of: {', '.join(SUMMARY_DIMENSIONS)}",
+            )
+        if period not in SUMMARY_PERIODS:
+            raise HTTPException(
+                status_code=400, detail=f"period must be one of: {', '.join(SUMMARY_PERIODS)}"
+            )
+        start = self._parse_date(start_date)
+        end = self._parse_date(end_date)
+        if (start_date and start is None) or (end_date and end is None):
+            raise HTTPException(status_code=400, detail="start_date/end_date must be valid dates (YYYY-MM-DD)")
+        if start and end and start > end:
+            raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+        try:
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(
+                    EXPENSE_SUMMARY_QUERY,
                     organization_id,
-                    team_id
+                    period if "period" in dimensions else None,
+                    start,
+                    end,
+                    "category" in dimensions,
+                    "team" in dimensions,
+                    team_id,
                 )
+        except Exception as e:
+            logging.error(f"❌ Error fetching expense summary: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+
+        groups = []
+        total = Decimal(0)
+        expense_count = 0
+        for row in rows:
+            group = {"total": row["total"], "expense_count": row["expense_count"]}
+            if "period" in dimensions:
+                group["period"] = row["period"]
+            if "category" in dimensions:
+                group["category"] = row["category"]
+            if "team" in dimensions:
+                group["team_id"] = row["team_id"]
+            if running_total:
+                group["running_total"] = row["running_total"]
+            groups.append(dependencies.convert_db_types(group))
+            total += row["total"]
+            expense_count += row["expense_count"]
+        return {"groups": groups, "total": total, "expense_count": expense_count}
+
+    def _expense_values(self, data: dict) -> tuple:
+        """Validated INSERT values (title ... team_id) or HTTPException(400).
+
+        Checks every column against the table's types and sizes, so a bulk
+        COPY never fails on one bad row and takes the valid ones with it.
+        """
+        title = data.get('title')
+        amount = self._parse_decimal(data.get('amount'))
+        category = data.get('category')
+        expense_date = self._parse_date(data.get('expense_date') or data.get('date'))
+        description = data.get('description')
+        raw_organization_id = data.get('organization_id')
+        raw_team_id = data.get('team_id') or None
+        organization_id = as_uuid(raw_organization_id)
+        team_id = as_uuid(raw_team_id)
+
+        if not raw_organization_id:
+            raise HTTPException(status_code=400, detail="organization_id is required")
+        if organization_id is None:
+            raise HTTPException(status_code=400, detail="organization_id must be a valid UUID")
+        if raw_team_id is not None and team_id is None:
+            raise HTTPException(status_code=400, detail="team_id must be a valid UUID")
+        if not isinstance(title, str) or not title.strip():
+            raise HTTPException(status_code=400, detail="title is required and cannot be empty")
+        title = title.strip()
+        if len(title) > 255:
+            raise HTTPException(status_code=400, detail="title must be at most 255 characters")
+        if amount is None or not amount.is_finite() or amount < 0:
+            raise HTTPException(status_code=400, detail="amount is required and must be >= 0")
+        if amount >= MAX_EXPENSE_AMOUNT:
+            raise HTTPException(status_code=400, detail=f"amount must be less than {MAX_EXPENSE_AMOUNT}")
+        if expense_date is None:
+            raise HTTPException(status_code=400, detail="expense_date is required and must be a valid date")
+        if category is not None and (not isinstance(category, str) or len(category) > 100):
+            raise HTTPException(status_code=400, detail="category must be a string of at most 100 characters")
+        if description is not None and not isinstance(description, str):
+            raise HTTPException(status_code=400, detail="description must be a string")
+        return title, amount, category, expense_date, description, organization_id, team_id
+
+    async def save_expense_data(self, data: dict) -> dict:
+        values = self._expense_values(data)
+        try:
+            async with self.db_pool.acquire() as conn:
+                row = await conn.fetchrow(INSERT_EXPENSE_QUERY, *values)
                 if row:
                     return dependencies.convert_db_types(dict(row))
                 return {}
-        except HTTPException:
-            raise
         except Exception as e:
             logging.error(f"❌ Error saving expense data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
-    async def save_bulk_expense_data(self, expenses: list) -> dict:
-        """Save multiple expenses. Returns success/failure counts and details."""
-        results = {"success": True, "total": len(expenses), "successful": 0, "failed": 0, "data": []}
-        for item in expenses:
+    async def save_bulk_expense_data(self, expenses: list, organization_id: str = None) -> dict:
+        """Validate every expense, then COPY the valid ones in a single transaction.
+
+        ``organization_id`` fills in rows that do not carry their own (CSV
+        uploads). Returns success/failure counts and one entry per input row.
+        """
+        check_batch_size(expenses)
+        entries: list = [None] * len(expenses)
+        valid = []
+        for index, item in enumerate(expenses):
+            if not isinstance(item, dict):
+                entries[index] = {"status": "failed", "error": "expense must be an object"}
+                continue
+            if organization_id and not item.get('organization_id'):
+                item = {**item, 'organization_id': organization_id}
             try:
-                row = await self.save_expense_data(item)
-                if row:
-                    results["successful"] += 1
-                    results["data"].append({"status": "success", "data": row})
-                else:
-                    results["failed"] += 1
-                    results["data"].append({"status": "failed", "error": "No data returned"})
+                valid.append((index, self._expense_values(item)))
             except HTTPException as e:
-                results["failed"] += 1
-                results["data"].append({"status": "failed", "error": e.detail})
-                results["success"] = False
+                entries[index] = {"status": "failed", "error": e.detail}
+
+        if valid:
+            try:
+                async with self.db_pool.acquire() as conn:
+                    async with conn.transaction():
+                        ids = [r["id"] for r in await conn.fetch(ALLOCATE_EXPENSE_IDS_QUERY, len(valid))]
+                        await conn.copy_records_to_table(
+                            "expenses",
+                            records=[(expense_id, *values) for expense_id, (_, values) in zip(ids, valid)],
+                            columns=EXPENSE_COPY_COLUMNS,
+                        )
+                        rows = {r["id"]: r for r in await conn.fetch(GET_EXPENSES_BY_IDS_QUERY, ids)}
+                for expense_id, (index, _) in zip(ids, valid):
+                    entries[index] = {"status": "success", "data": dependencies.convert_db_types(dict(rows[expense_id]))}
             except Exception as e:
-                results["failed"] += 1
-                results["data"].append({"status": "failed", "error": str(e)})
-                results["success"] = False
-        return results
+                # The batch is loaded atomically, so a database error fails every valid row.
+                logging.error(f"❌ Error bulk saving expense data: {e}")
+                for index, _ in valid:
+                    entries[index] = {"status": "failed", "error": f"Database query error: {str(e)}"}
+        return bulk_report(entries)
 
     async def update_expense_data(self, expense_id: int, data: dict, organization_id) -> dict:
         if expense_id is None:
@@ -1,3 +1,4 @@
+import uuid
 from typing import List
 from fastapi import HTTPException
 import asyncpg
@@ -13,14 +14,35 @@ from app.queries.mail_template import (
     UPDATE_MAIL_TEMPLATE_QUERY,
     DELETE_MAIL_TEMPLATE_QUERY,
 )
-from app.utils.mail import send_email_gmail #send_gmail, send_ses_email, 
+from app.queries.mail_outbox import GET_MAIL_BATCH_STATUS_QUERY, GET_MAIL_STATUS_QUERY
+from app.utils.mail_queue import enqueue_mail, header_error
+from app.utils.mail_template import (
+    CompiledMailTemplate,
+    compile_mail_template,
+    get_template_variants,
+    invalidate_mail_templates,
+    recipient_variables,
+)
 
 class MailTemplateService:
     def __init__(self, db_pool: asyncpg.Pool):
         self.db_pool = db_pool
 
+    async def _template_variants(self, key: str):
+        """Global template and organization overrides for ``key``, from the template cache"""
+        async def load():
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(GET_MAIL_TEMPLATE_BY_KEY_QUERY, key)
+                return [dict(row) for row in rows]
+        return await get_template_variants(key, load)
+
     async def get_mail_template_data(self, filters: dict = {}) -> List[dict]:
         try:
+            if "key" in filters and "id" not in filters:
+                template = (await self._template_variants(filters["key"])).resolve(filters.get("organization_id"))
+                if template:
+                    return [dict(template)]
+                return []
             async with self.db_pool.acquire() as conn:
                 if "id" in filters:
                     template_id = filters.get("id")
@@ -28,11 +50,6 @@ class MailTemplateService:
                     if template:
                         return [dict(template)]
                     return []
-                elif "key" in filters:
-                    template = await conn.fetchrow(GET_MAIL_TEMPLATE_BY_KEY_QUERY, filters["key"])
-                    if template:
-                        return [dict(template)]
-                    return []
                 elif "organization_id" in filters:
                     rows = await conn.fetch(GET_MAIL_TEMPLATES_BY_ORGANIZATION_QUERY, filters["organization_id"])
                     return [dict(row) for row in rows]
@@ -51,7 +68,8 @@ class MailTemplateService:
                 organization_id = template_data.get("organization_id")
                 
                 row = await conn.fetchrow(INSERT_MAIL_TEMPLATE_QUERY, key, subject, body, organization_id)
-                return dict(row) if row else {}
+            invalidate_mail_templates(key)
+            return dict(row) if row else {}
         except Exception as e:
             print(f"❌ Error saving mail template data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
@@ -72,7 +90,9 @@ class MailTemplateService:
                 row = await conn.fetchrow(UPDATE_MAIL_TEMPLATE_QUERY, key, subject, body, organization_id, template_id)
                 if not row:
                     raise ValueError("Mail Template not found")
-                return dict(row)
+            # The key itself may have changed, so drop every cached key.
+            invalidate_mail_templates()
+            return dict(row)
         except ValueError:
             raise
         except Exception as e:
@@ -83,178 +103,136 @@ class MailTemplateService:
         try:
             async with self.db_pool.acquire() as conn:
                 result = await conn.execute(DELETE_MAIL_TEMPLATE_QUERY, template_id)
-                if result and result.startswith("DELETE"):
-                    return ""
-                return "Mail Template not found"
+            if result and result.startswith("DELETE"):
+                invalidate_mail_templates()
+                return ""
+            return "Mail Template not found"
         except Exception as e:
             print(f"❌ Error deleting mail template data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
-    async def get_template_by_key(self, key: str) -> dict:
-        """Get a mail template by its key"""
+    async def get_template_by_key(self, key: str, organization_id: str = None) -> dict:
+        """
+        Get a mail template by its key: the organization's override when it has
+        one, else the global template. Served from the template cache.
+        """
         try:
-            async with self.db_pool.acquire() as conn:
-                template = await conn.fetchrow(GET_MAIL_TEMPLATE_BY_KEY_QUERY, key)
-                if not template:
-                    raise HTTPException(status_code=404, detail=f"Mail template with key '{key}' not found")
-                return dict(template)
-        except HTTPException:
-            raise
+            template = (await self._template_variants(key)).resolve(organization_id)
         except Exception as e:
             print(f"❌ Error fetching mail template by key: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+        if not template:
+            raise HTTPException(status_code=404, detail=f"Mail template with key '{key}' not found")
+        return dict(template)
 
-    # def _replace_template_variables(self, text: str, variables: dict) -> str:
-    #     """Replace template variables like {{name}}, {{email}} in text"""
-    #     result = text
-    #     for key, value in variables.items():
-    #         placeholder = f"{{{{{key}}}}}"
-    #         result = result.replace(placeholder, str(value))
-    #     return result
+    async def send_mail_with_template(self, template_key: str, to: str, subject_override: str = None, body_override: str = None, user_data: dict = None, extra_variables: dict = None, organization_id: str = None, html: bool = False) -> dict:
+        """
+        Render a mail template by key for one recipient and queue it.
+        subject/body overrides are templates themselves and get the same variables.
+        """
+        template = await self.get_template_by_key(template_key, organization_id)
+        if subject_override is not None or body_override is not None:
+            template = {
+                **template,
+                "id": None,
+                "subject": template.get("subject", "") if subject_override is None else subject_override,
+                "body": template.get("body", "") if body_override is None else body_override,
+            }
+            compiled = CompiledMailTemplate(template)
+        else:
+            compiled = compile_mail_template(template)
+        subject, body = compiled.render(recipient_variables({"email": to, **(user_data or {})}, extra_variables))
+        try:
+            message_ids = await enqueue_mail(
+                self.db_pool,
+                [{"to": to, "subject": subject, "body": body, "html": html}],
+                organization_id,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            print(f"❌ Error queueing mail with template: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to queue email: {str(e)}")
+        return {
+            "success": True,
+            "message": "Email queued",
+            "template_key": template_key,
+            "message_id": message_ids[0],
+            "status": "queued",
+            "recipient": to,
+            "subject": subject,
+        }
 
-    # async def send_mail_with_template(self, template_key: str, to: str, subject_override: str = None, body_override: str = None, user_data: dict = None, extra_variables: dict = None) -> dict:
-    #     """
-    #     Get a mail template by key, optionally override subject/body, and send the email.
-        
-    #     Args:
-    #         template_key: The key of the template to use
-    #         to: Recipient email address
-    #         subject_override: Optional subject to override template subject
-    #         body_override: Optional body to override template body
-    #         user_data: Optional user data for template variable replacement
-    #         extra_variables: Optional extra variables like reset_link, organization_name, etc.
-        
-    #     Returns:
-    #         dict with success message
-    #     """
-    #     try:
-    #         # Get template by key
-    #         template = await self.get_template_by_key(template_key)
-            
-    #         # Use override values if provided, otherwise use template values
-    #         subject = subject_override if subject_override is not None else template.get("subject", "")
-    #         body = body_override if body_override is not None else template.get("body", "")
-            
-    #         # Prepare variables for replacement
-    #         variables = {}
-            
-    #         # Add user_data variables if provided
-    #         if user_data:
-    #             variables.update({
-    #                 "email": user_data.get("email", to),
-    #                 "phone": user_data.get("phone", ""),
-    #                 "name": user_data.get("name", "") or (user_data.get("first_name", "") + " " + user_data.get("last_name", "")).strip(),
-    #                 "first_name": user_data.get("first_name", ""),
-    #                 "last_name": user_data.get("last_name", ""),
-    #             })
-            
-    #         # Add extra variables if provided (like reset_link, organization_name, etc.)
-    #         if extra_variables:
-    #             variables.update(extra_variables)
-            
-    #         # Replace variables in subject and body if we have any variables
-    #         if variables:
-    #             subject = self._replace_template_variables(subject, variables)
-    #             body = self._replace_template_variables(body, variables)
-            
-    #         # Send the email
-    #         result = await send_gmail(to=to, subject=subject, body=body)
-    #         return {
-    #             "success": True,
-    #             "message": "Email sent successfully",
-    #             "template_key": template_key,
-    #             "recipient": to,
-    #             "subject": subject,
-    #             "details": result
-    #         }
-    #     except HTTPException:
-    #         raise
-    #     except Exception as e:
-    #         print(f"❌ Error sending mail with template: {e}")
-    #         raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
+    async def send_bulk_mail_with_template(self, template_key: str, users: List[dict], extra_variables: dict = None, organization_id: str = None, html: bool = False) -> dict:
+        """
+        Queue a personalised email from one template for every user.
+        The template is compiled once; recipients are rendered and queued in
+        batches of MAIL_BULK_BATCH_SIZE (one INSERT each), and the mail worker
+        sends them concurrently over the SMTP pool. Every recipient gets a
+        message_id; the whole send shares batch_id for /mail/outbox/batch.
+        """
+        if len(users) > settings.MAIL_BULK_MAX_RECIPIENTS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.MAIL_BULK_MAX_RECIPIENTS} recipients can be sent to at once",
+            )
+        template = await self.get_template_by_key(template_key, organization_id)
+        compiled = compile_mail_template(template)
+        batch_id = uuid.uuid4()
+        details = []
+        queued = 0
+        batch_size = max(1, settings.MAIL_BULK_BATCH_SIZE)
+        for start in range(0, len(users), batch_size):
+            messages, message_details = [], []
+            for user in users[start:start + batch_size]:
+                user_email = user.get("email") if isinstance(user, dict) else None
+                if not user_email:
+                    details.append({"user": user, "status": "failed", "error": "Email address not found in user data"})
+                    continue
+                subject, body = compiled.render(recipient_variables(user, extra_variables))
+                error = header_error(user_email, subject)
+                if error:
+                    details.append({"user": user_email, "status": "failed", "error": error})
+                    continue
+                messages.append({"to": user_email, "subject": subject, "body": body, "html": html})
+                entry = {"user": user_email, "status": "queued"}
+                message_details.append(entry)
+                details.append(entry)
+            if not messages:
+                continue
+            try:
+                message_ids = await enqueue_mail(self.db_pool, messages, organization_id, batch_id)
+            except Exception as e:
+                print(f"❌ Error queueing bulk mail batch: {e}")
+                for entry in message_details:
+                    entry.update(status="failed", error=f"Failed to queue email: {str(e)}")
+                continue
+            for entry, message_id in zip(message_details, message_ids):
+                entry["message_id"] = message_id
+            queued += len(message_ids)
+        return {
+            "success": queued > 0,
+            "template_key": template_key,
+            "batch_id": str(batch_id),
+            "total_users": len(users),
+            "queued": queued,
+            "failed": len(users) - queued,
+            "details": details,
+        }
 
-    # async def send_bulk_mail_with_template(self, template_key: str, users: List[dict], extra_variables: dict = None) -> dict:
-    #     """
-    #     Send emails to multiple users using a template by key.
-    #     Each user will receive the template with their personalized data (email, name, etc.)
-        
-    #     Args:
-    #         template_key: The key of the template to use
-    #         users: List of user objects, each should have at least 'email' field
-    #         extra_variables: Optional extra variables like reset_link, organization_name, etc. (shared across all users)
-        
-    #     Returns:
-    #         dict with success/failure counts and details
-    #     """
-    #     try:
-    #         # Get template by key
-    #         template = await self.get_template_by_key(template_key)
-            
-    #         results = {
-    #             "success": True,
-    #             "template_key": template_key,
-    #             "total_users": len(users),
-    #             "successful": 0,
-    #             "failed": 0,
-    #             "details": []
-    #         }
-            
-    #         # Process each user
-    #         for user in users:
-    #             user_email = user.get("email")
-    #             user_phone = user.get("phone")
-    #             if not user_email:
-    #                 results["failed"] += 1
-    #                 results["details"].append({
-    #                     "user": user,
-    #                     "status": "failed",
-    #                     "error": "Email address not found in user data"
-    #                 })
-    #                 continue
-                
-    #             try:
-    #                 # Prepare variables for replacement
-    #                 organization_name = user.get("organization", {}).get("name", "");
-    #                 variables = {
-    #                     "email": user_email,
-    #                     "phone": user_phone or "",
-    #                     "first_name": user.get("first_name", ""),
-    #                     "last_name": user.get("last_name", ""),
-    #                     "organization_name": organization_name,
-    #                     "reset_link": (extra_variables.get("reset_link", "") if extra_variables else "") or (settings.THE_CHURCH_MANAGER_APP)+"/pages/authentication/forgotpassword/",
-    #                 }
-                    
-    #                 # Add extra variables if provided (like reset_link, organization_name, etc.)
-    #                 if extra_variables:
-    #                     variables.update(extra_variables)
-                    
-    #                 # Replace variables in subject and body
-    #                 subject = self._replace_template_variables(template.get("subject", ""), variables)
-    #                 body = self._replace_template_variables(template.get("body", ""), variables)
-                    
-    #                 # Send the email
-    #                 await send_gmail(to=user_email, subject=subject, body=body)
-                    
-    #                 results["successful"] += 1
-    #                 results["details"].append({
-    #                     "user": user_email,
-    #                     "status": "success",
-    #                 })
-    #             except Exception as e:
-    #                 results["failed"] += 1
-    #                 results["details"].append({
-    #                     "user": user_email,
-    #                     "status": "failed",
-    #                     "error": str(e)
-    #                 })
-    #                 print(f"❌ Error sending email to {user_email}: {e}")
-            
-    #         return results
-    #     except HTTPException:
-    #         raise
-    #     except Exception as e:
-    #         print(f"❌ Error sending bulk mail with template: {e}")
-    #         raise HTTPException(status_code=500, detail=f"Failed to send bulk emails: {str(e)}")
+    async def get_outbox_batch_status(self, batch_id: str) -> dict:
+        """Per-recipient delivery status of a bulk send, with counts per status"""
+        try:
+            rows = await self.db_pool.fetch(GET_MAIL_BATCH_STATUS_QUERY, batch_id)
+        except Exception as e:
+            print(f"❌ Error fetching mail batch status: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+        if not rows:
+            raise HTTPException(status_code=404, detail="Mail batch not found")
+        counts = {}
+        for row in rows:
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+        return {"batch_id": batch_id, "total": len(rows), "counts": counts, "recipients": [dict(row) for row in rows]}
 
     # async def send_simple_email(self, to: str, subject: str, body: str, provider: str = "gmail", from_email: str = None) -> dict:
     #     """
@@ -291,20 +269,37 @@ class MailTemplateService:
     #         raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
 
 
-    async def send_email_gmail(self, to: str, subject: str, body: str, html: bool = False) -> dict:
-
+    async def send_email_gmail(self, to: str, subject: str, body: str, html: bool = False, organization_id: str = None) -> dict:
+        """Queue an email for the mail worker; it is sent in the background."""
         try:
-            result = await send_email_gmail(to_email=to, subject=subject, body=body, html=html)
-            
+            message_ids = await enqueue_mail(
+                self.db_pool,
+                [{"to": to, "subject": subject, "body": body, "html": html}],
+                organization_id,
+            )
             return {
                 "success": True,
-                "message": "Email sent successfully",
+                "message": "Email queued",
+                "message_id": message_ids[0],
+                "status": "queued",
                 "recipient": to,
                 "subject": subject,
             }
         except HTTPException:
             raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
-            print(f"❌ Error sending email: {e}")
-            raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
+            print(f"❌ Error queueing email: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to queue email: {str(e)}")
 
+    async def get_outbox_status(self, message_id: str) -> dict:
+        """Delivery status of a queued email"""
+        try:
+            row = await self.db_pool.fetchrow(GET_MAIL_STATUS_QUERY, message_id)
+        except Exception as e:
+            print(f"❌ Error fetching mail status: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+        if not row:
+            raise HTTPException(status_code=404, detail="Queued email not found")
+        return dict(row)
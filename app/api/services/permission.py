@@ -2,6 +2,8 @@ from typing import List
 from fastapi import HTTPException
 import asyncpg
 
+from app.api.permission_matrix import invalidate_permissions
+from app.db.bulk import as_uuid, save_by_id
 from app.queries.permission import (
     GET_PERMISSIONS_QUERY,
     GET_PERMISSION_BY_ID_QUERY,
@@ -11,6 +13,7 @@ from app.queries.permission import (
     GET_PERMISSIONS_BY_TEAM_QUERY,
     INSERT_PERMISSION_QUERY,
     INSERT_BULK_PERMISSIONS_QUERY,
+    UPDATE_BULK_PERMISSIONS_QUERY,
     UPDATE_PERMISSION_QUERY,
     DELETE_PERMISSION_QUERY,
 )
@@ -61,6 +64,7 @@ class PermissionService:
             view, edit, create, delete = self._extract_permission_flags(permission_data)
             
             row = await conn.fetchrow(INSERT_PERMISSION_QUERY, organization_id, role_id, module_id, team_id, view, edit, create, delete)
+            invalidate_permissions(organization_id)
             return dict(row) if row else {}
 
     def _extract_permission_flags(self, data: dict) -> tuple:
@@ -73,66 +77,34 @@ class PermissionService:
 
     async def save_bulk_permission_data(self, permissions_data: list[dict], organization_id: str) -> list[dict]:
         """
-        Save or update multiple permissions.
-        - Updates permissions that already have id.
-        - Creates new permissions that don't.
-        Returns the full list of updated/created permission documents.
+        Save or update multiple permissions in one transaction.
+        - Updates permissions that already have id (one statement for all of them).
+        - Creates new permissions that don't, or whose id was not found (one statement).
+        Returns the full list of updated/created permission documents, in input order.
         """
-        updated_permissions = []
+        items = []
+        for permission in permissions_data:
+            view, edit, create, delete = self._extract_permission_flags(permission)
+            items.append((
+                as_uuid(permission.get("id")),
+                (
+                    permission.get("organization_id") or organization_id,
+                    permission.get("role_id") or None,
+                    permission.get("module_id") or None,
+                    permission.get("team_id") or None,
+                    bool(view), bool(edit), bool(create), bool(delete),
+                ),
+            ))
         async with self.db_pool.acquire() as conn:
             async with conn.transaction():
-                for permission in permissions_data:
-                    permission_id = permission.get("id")
-                    
-                    if permission_id:
-                        # Update existing permission
-                        try:
-                            update_data = {k: v for k, v in permission.items() if k not in ("id")}
-                            org_id = update_data.get("organization_id", organization_id)
-                            role_id = update_data.get("role_id")
-                            module_id = update_data.get("module_id")
-                            team_id = update_data.get("team_id")
-                            view, edit, create, delete = self._extract_permission_flags(update_data)
-                            
-                            row = await conn.fetchrow(UPDATE_PERMISSION_QUERY, org_id, role_id, module_id, team_id, view, edit, create, delete, permission_id)
-                            if row:
-                                updated_permissions.append(dict(row))
-                            else:
-                                # Fallback: if not found, insert as new
-                                org_id = permission.get("organization_id", organization_id)
-                                role_id = permission.get("role_id")
-                                module_id = permission.get("module_id")
-                                team_id = permission.get("team_id")
-                                view, edit, create, delete = self._extract_permission_flags(permission)
-                                
-                                row = await conn.fetchrow(INSERT_PERMISSION_QUERY, org_id, role_id, module_id, team_id, view, edit, create, delete)
-                                if row:
-                                    updated_permissions.append(dict(row))
-                        except Exception as e:
-                            print(f"⚠️ Error updating permission {permission_id}: {e}")
-                            # Fallback: insert as new
-                            org_id = permission.get("organization_id", organization_id)
-                            role_id = permission.get("role_id")
-                            module_id = permission.get("module_id")
-                            team_id = permission.get("team_id")
-                            view, edit, create, delete = self._extract_permission_flags(permission)
-                            
-                            row = await conn.fetchrow(INSERT_PERMISSION_QUERY, org_id, role_id, module_id, team_id, view, edit, create, delete)
-                            if row:
-                                updated_permissions.append(dict(row))
-                    else:
-                        # No id → new permission
-                        org_id = permission.get("organization_id", organization_id)
-                        role_id = permission.get("role_id")
-                        module_id = permission.get("module_id")
-                        team_id = permission.get("team_id")
-                        view, edit, create, delete = self._extract_permission_flags(permission)
-                        
-                        row = await conn.fetchrow(INSERT_PERMISSION_QUERY, org_id, role_id, module_id, team_id, view, edit, create, delete)
-                        if row:
-                            updated_permissions.append(dict(row))
-        
-        return updated_permissions
+                rows = await save_by_id(
+                    conn, items,
+                    update_query=UPDATE_BULK_PERMISSIONS_QUERY,
+                    insert_query=INSERT_BULK_PERMISSIONS_QUERY,
+                )
+        # Items may carry their own organization_id.
+        invalidate_permissions(None if any(p.get("organization_id") for p in permissions_data) else organization_id)
+        return [dict(row) for row in rows]
 
     async def update_permission_data(self, permission_data: dict) -> dict:
         permission_id = permission_data.get("id")
@@ -149,6 +121,8 @@ class PermissionService:
             view, edit, create, delete = self._extract_permission_flags(update_data)
             
             row = await conn.fetchrow(UPDATE_PERMISSION_QUERY, organization_id, role_id, module_id, team_id, view, edit, create, delete, permission_id)
+            # The permission may have moved between organizations.
+            invalidate_permissions()
             if not row:
                 raise ValueError("Permission not found")
             return dict(row)
@@ -156,6 +130,7 @@ class PermissionService:
     async def delete_permission_data(self, permission_id: str) -> str:
         async with self.db_pool.acquire() as conn:
             result = await conn.execute(DELETE_PERMISSION_QUERY, permission_id)
+            invalidate_permissions()
             if result and result.startswith("DELETE"):
                 return ""
             return "Permission not found"
@@ -3,6 +3,7 @@ from fastapi import HTTPException
 import asyncpg
 import json
 
+from app.api.permission_matrix import invalidate_permissions
 from app.queries.role import (
     GET_ROLES_QUERY,
     GET_ROLE_BY_ID_QUERY,
@@ -98,6 +99,8 @@ class RoleService:
                 permissions = json.dumps([])
             
             row = await conn.fetchrow(UPDATE_ROLE_QUERY, name, description, team_id, organization_id, type, permissions, role_id)
+            # Role names decide rota roles; the role may also have changed organization.
+            invalidate_permissions()
             if not row:
                 raise ValueError("Role not found")
             return dict(row)
@@ -105,6 +108,7 @@ class RoleService:
     async def delete_role_data(self, role_id: str) -> str:
         async with self.db_pool.acquire() as conn:
             result = await conn.execute(DELETE_ROLE_QUERY, role_id)
+            invalidate_permissions()
             if result and result.startswith("DELETE"):
                 return ""
             return "Role not found"
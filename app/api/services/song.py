@@ -3,57 +3,130 @@ from fastapi import HTTPException
 import asyncpg
 import logging
 from app.api import dependencies
+from app.db.listing import InvalidListingParams, Listing, Page, PageRequest, SortKey, fetch_page
 from app.queries.song import (
     GET_SONGS_QUERY,
     GET_SONG_BY_ID_QUERY,
     GET_SONGS_BY_ORGANIZATION_QUERY,
     SEARCH_SONGS_QUERY,
+    FULLTEXT_SEARCH_SONGS_QUERY,
+    AUTOCOMPLETE_SONGS_QUERY,
     INSERT_SONG_QUERY,
     UPDATE_SONG_QUERY,
     DELETE_SONG_QUERY,
 )
 
+SONG_LISTING = Listing(
+    sorts={
+        # Serial id follows creation order, matching the old created_at ordering.
+        "created": (SortKey("id", "int4"),),
+        "title": (SortKey("title", "text"), SortKey("id", "int4")),
+    },
+    default_sort="created",
+)
+
+# Ranking internals of FULLTEXT_SEARCH_SONGS_QUERY; rank/highlights are reshaped in _search_result.
+_SEARCH_COLUMNS = ("tsq", "rank", "similarity", "title_highlight", "artist_highlight", "lyrics_highlight")
+
+
+def _song_dict(row) -> dict:
+    song = dict(row)
+    for column in _SEARCH_COLUMNS:
+        song.pop(column, None)
+    return dependencies.convert_db_types(song)
+
+
+def _search_result(row) -> dict:
+    song = _song_dict(row)
+    song["rank"] = round(float(row["rank"]), 6)
+    song["highlights"] = {
+        "title": row["title_highlight"],
+        "artist": row["artist_highlight"] or None,
+        "lyrics": row["lyrics_highlight"] or None,
+    }
+    return song
+
+
+def _like_prefix(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class SongService:
     def __init__(self, db_pool: asyncpg.Pool):
         self.db_pool = db_pool
 
+    def _listing_query(self, filters: dict) -> tuple[str, list]:
+        if "organization_id" in filters:
+            if any(key in filters for key in ["title", "artist", "scale", "tempo", "chords", "rhythm", "lyrics"]):
+                return SEARCH_SONGS_QUERY, [
+                    filters["organization_id"],
+                    filters.get("title"),
+                    filters.get("artist"),
+                    filters.get("scale"),
+                    filters.get("tempo"),
+                    filters.get("chords"),
+                    filters.get("rhythm"),
+                    filters.get("lyrics"),
+                ]
+            return GET_SONGS_BY_ORGANIZATION_QUERY, [filters["organization_id"]]
+        return GET_SONGS_QUERY, []
+
     async def get_song_data(self, filters: dict = None) -> List[dict]:
         """Get song data with filtering"""
         filters = filters or {}
+        if "id" not in filters:
+            return (await self.get_song_page(filters, PageRequest())).items
         try:
             async with self.db_pool.acquire() as conn:
-                if "id" in filters:
-                    song = await conn.fetchrow(GET_SONG_BY_ID_QUERY, filters["id"])
-                    if song:
-                        return [dependencies.convert_db_types(dict(song))]
-                    return []
-                elif "organization_id" in filters:
-                    if any(key in filters for key in ["title", "artist", "scale", "tempo", "chords", "rhythm", "lyrics"]):
-                        rows = await conn.fetch(
-                            SEARCH_SONGS_QUERY,
-                            filters["organization_id"],
-                            filters.get("title"),
-                            filters.get("artist"),
-                            filters.get("scale"),
-                            filters.get("tempo"),
-                            filters.get("chords"),
-                            filters.get("rhythm"),
-                            filters.get("lyrics")
-                        )
-                    else:
-                        rows = await conn.fetch(
-                            GET_SONGS_BY_ORGANIZATION_QUERY,
-                            filters["organization_id"]
-                        )
-                    return [dependencies.convert_db_types(dict(row)) for row in rows]
-
-                rows = await conn.fetch(GET_SONGS_QUERY)
-                return [dependencies.convert_db_types(dict(row)) for row in rows]
+                song = await conn.fetchrow(GET_SONG_BY_ID_QUERY, filters["id"])
+                if song:
+                    return [_song_dict(song)]
+                return []
         except Exception as e:
             logging.error(f"❌ Error fetching song data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
+    async def get_song_page(self, filters: dict, page: PageRequest) -> Page:
+        """One page of songs matching ``filters``"""
+        filters = filters or {}
+        if filters.get("q") and "organization_id" in filters:
+            return Page(items=await self.search_songs(filters["organization_id"], filters["q"], page.effective_limit))
+        query, args = self._listing_query(filters or {})
+        try:
+            async with self.db_pool.acquire() as conn:
+                result = await fetch_page(conn, query, args, SONG_LISTING, page)
+        except InvalidListingParams as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logging.error(f"❌ Error fetching song data: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+        result.items = [_song_dict(row) for row in result.items]
+        return result
+
+    async def search_songs(self, organization_id: int, q: str, limit: int) -> List[dict]:
+        """Ranked full-text + fuzzy search with highlighted title/artist/lyrics"""
+        try:
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(FULLTEXT_SEARCH_SONGS_QUERY, organization_id, q.strip(), limit)
+                return [_search_result(row) for row in rows]
+        except Exception as e:
+            logging.error(f"❌ Error searching songs: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+
+    async def autocomplete_songs(self, organization_id: int, prefix: str, limit: int = 10) -> List[dict]:
+        """Title/artist suggestions for a typed prefix"""
+        prefix = (prefix or "").strip()
+        if not prefix:
+            return []
+        try:
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(AUTOCOMPLETE_SONGS_QUERY, organization_id, _like_prefix(prefix), limit)
+                return [dependencies.convert_db_types(dict(row)) for row in rows]
+        except Exception as e:
+            logging.error(f"❌ Error autocompleting songs: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+
     async def save_song_data(self, song_data: dict) -> dict:
         """Save new song"""
         try:
@@ -89,7 +162,7 @@ class SongService:
                     organization_id
                 )
                 if row:
-                    return dependencies.convert_db_types(dict(row))
+                    return _song_dict(row)
                 return {}
         except HTTPException:
             raise
@@ -141,7 +214,7 @@ class SongService:
                     organization_id
                 )
                 if row:
-                    return dependencies.convert_db_types(dict(row))
+                    return _song_dict(row)
                 raise HTTPException(status_code=404, detail="Song not found or not authorized")
         except HTTPException:
             raise
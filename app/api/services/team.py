@@ -2,12 +2,14 @@ from typing import List
 from fastapi import HTTPException
 import asyncpg
 
+from app.db.bulk import as_uuid, save_by_id
 from app.queries.team import (
     GET_TEAMS_QUERY,
     GET_TEAM_BY_ID_QUERY,
     GET_TEAMS_BY_ORGANIZATION_QUERY,
     INSERT_TEAM_QUERY,
     INSERT_BULK_TEAMS_QUERY,
+    UPDATE_BULK_TEAMS_QUERY,
     UPDATE_TEAM_QUERY,
     DELETE_TEAM_QUERY,
 )
@@ -41,52 +43,24 @@ class TeamService:
 
     async def save_bulk_team_data(self, teams_data: list[dict], organization_id: str) -> list[dict]:
         """
-        Save or update multiple teams.
-        - Updates teams that already have id.
-        - Creates new teams that don't.
-        Returns the full list of updated/created team documents.
+        Save or update multiple teams in one transaction.
+        - Updates teams that already have id (one statement for all of them).
+        - Creates new teams that don't, or whose id was not found (one statement).
+        Returns the full list of updated/created team documents, in input order.
         """
-        updated_teams = []
+        items = [
+            (
+                as_uuid(team.get("id")),
+                (team.get("name", ""), team.get("description", ""), team.get("organization_id") or organization_id),
+            )
+            for team in teams_data
+        ]
         async with self.db_pool.acquire() as conn:
             async with conn.transaction():
-                for team in teams_data:
-                    team_id = team.get("id")
-                    
-                    if team_id:
-                        # Update existing team
-                        try:
-                            update_data = {k: v for k, v in team.items() if k not in ("id")}
-                            name = update_data.get("name", "")
-                            description = update_data.get("description", "")
-                            org_id = update_data.get("organization_id", organization_id)
-                            
-                            row = await conn.fetchrow(UPDATE_TEAM_QUERY, name, description, org_id, team_id)
-                            if row:
-                                updated_teams.append(dict(row))
-                            else:
-                                # Fallback: if not found, insert as new
-                                name = team.get("name", "")
-                                description = team.get("description", "")
-                                row = await conn.fetchrow(INSERT_TEAM_QUERY, name, description, organization_id)
-                                if row:
-                                    updated_teams.append(dict(row))
-                        except Exception as e:
-                            print(f"⚠️ Error updating team {team_id}: {e}")
-                            # Fallback: insert as new
-                            name = team.get("name", "")
-                            description = team.get("description", "")
-                            row = await conn.fetchrow(INSERT_TEAM_QUERY, name, description, organization_id)
-                            if row:
-                                updated_teams.append(dict(row))
-                    else:
-                        # No id → new team
-                        name = team.get("name", "")
-                        description = team.get("description", "")
-                        row = await conn.fetchrow(INSERT_TEAM_QUERY, name, description, organization_id)
-                        if row:
-                            updated_teams.append(dict(row))
-        
-        return updated_teams
+                rows = await save_by_id(
+                    conn, items, update_query=UPDATE_BULK_TEAMS_QUERY, insert_query=INSERT_BULK_TEAMS_QUERY
+                )
+        return [dict(row) for row in rows]
 
     async def update_team_data(self, team_data: dict) -> dict:
         team_id = team_data.get("id")
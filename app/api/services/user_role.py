@@ -2,6 +2,9 @@ from typing import List
 from fastapi import HTTPException
 import asyncpg
 
+from app.api.permission_matrix import invalidate_permissions
+from app.db.bulk import as_uuid, save_by_id
+from app.db.listing import InvalidListingParams, Listing, Page, PageRequest, SortKey, fetch_page
 from app.queries.user_role import (
     GET_USER_ROLES_QUERY,
     GET_USER_ROLE_BY_ID_QUERY,
@@ -19,68 +22,81 @@ from app.queries.user_role import (
     GET_USER_ROLES_OVERVIEW_BY_USER_AND_ORGANIZATION_QUERY,
     GET_USER_ROLES_OVERVIEW_BY_ROLE_QUERY,
     GET_USER_ROLES_OVERVIEW_BY_TEAM_QUERY,
+    GET_USER_ROLE_OVERVIEW_VERSION_QUERY,
     INSERT_USER_ROLE_QUERY,
     INSERT_BULK_USER_ROLES_QUERY,
+    UPDATE_BULK_USER_ROLES_QUERY,
     UPDATE_USER_ROLE_QUERY,
     DELETE_USER_ROLE_QUERY,
     DELETE_USER_ROLE_BY_USER_AND_ROLE_QUERY,
 )
 
+USER_ROLE_LISTING = Listing(
+    sorts={"id": (SortKey("id", "uuid"),)},
+    default_sort="id",
+    default_order="asc",
+)
+
+
 class UserRoleService:
     def __init__(self, db_pool: asyncpg.Pool):
         self.db_pool = db_pool
 
+    def _listing_query(self, filters: dict) -> tuple[str, list] | None:
+        """Query and args for ``filters``; None when the filter cannot match anything."""
+        role_ids = filters.get("role_ids")
+        if isinstance(role_ids, str):
+            # Handle comma-separated string
+            role_ids = [r.strip() for r in role_ids.split(",") if r.strip()]
+        if "user_id" in filters and "organization_id" in filters:
+            return GET_USER_ROLES_BY_USER_AND_ORGANIZATION_QUERY, [filters["user_id"], filters["organization_id"]]
+        if "organization_id" in filters and "role_ids" in filters:
+            if not role_ids:
+                return None
+            return GET_USER_ROLES_BY_ORGANIZATION_AND_ROLE_IDS_QUERY, [filters["organization_id"], role_ids]
+        if "organization_id" in filters:
+            return GET_USER_ROLES_BY_ORGANIZATION_QUERY, [filters["organization_id"]]
+        if "user_id" in filters:
+            return GET_USER_ROLES_BY_USER_QUERY, [filters["user_id"]]
+        if "role_ids" in filters:
+            if not role_ids:
+                return None
+            return GET_USER_ROLES_BY_ROLE_IDS_QUERY, [role_ids]
+        if "role_id" in filters:
+            return GET_USER_ROLES_BY_ROLE_QUERY, [filters["role_id"]]
+        if "team_id" in filters:
+            return GET_USER_ROLES_BY_TEAM_QUERY, [filters["team_id"]]
+        return GET_USER_ROLES_QUERY, []
+
     async def get_user_role_data(self, filters: dict = {}) -> List[dict]:
+        if "id" not in filters:
+            return (await self.get_user_role_page(filters, PageRequest())).items
         try:
             async with self.db_pool.acquire() as conn:
-                if "id" in filters:
-                    user_role_id = filters.get("id")
-                    user_role = await conn.fetchrow(GET_USER_ROLE_BY_ID_QUERY, user_role_id)
-                    if user_role:
-                        return [dict(user_role)]
-                    return []
-                elif "user_id" in filters and "organization_id" in filters:
-                    # Both user_id and organization_id provided - use combined query
-                    rows = await conn.fetch(GET_USER_ROLES_BY_USER_AND_ORGANIZATION_QUERY, filters["user_id"], filters["organization_id"])
-                    return [dict(row) for row in rows]
-                elif "organization_id" in filters and "role_ids" in filters:
-                    # Both organization_id and role_ids provided - use combined query
-                    role_ids = filters["role_ids"]
-                    if isinstance(role_ids, str):
-                        # Handle comma-separated string
-                        role_ids = [r.strip() for r in role_ids.split(",") if r.strip()]
-                    if role_ids:
-                        rows = await conn.fetch(GET_USER_ROLES_BY_ORGANIZATION_AND_ROLE_IDS_QUERY, filters["organization_id"], role_ids)
-                        return [dict(row) for row in rows]
-                    return []
-                elif "organization_id" in filters:
-                    rows = await conn.fetch(GET_USER_ROLES_BY_ORGANIZATION_QUERY, filters["organization_id"])
-                    return [dict(row) for row in rows]
-                elif "user_id" in filters:
-                    rows = await conn.fetch(GET_USER_ROLES_BY_USER_QUERY, filters["user_id"])
-                    return [dict(row) for row in rows]
-                elif "role_ids" in filters:
-                    # Multiple role_ids provided - use array query
-                    role_ids = filters["role_ids"]
-                    if isinstance(role_ids, str):
-                        # Handle comma-separated string
-                        role_ids = [r.strip() for r in role_ids.split(",") if r.strip()]
-                    if role_ids:
-                        rows = await conn.fetch(GET_USER_ROLES_BY_ROLE_IDS_QUERY, role_ids)
-                        return [dict(row) for row in rows]
-                    return []
-                elif "role_id" in filters:
-                    rows = await conn.fetch(GET_USER_ROLES_BY_ROLE_QUERY, filters["role_id"])
-                    return [dict(row) for row in rows]
-                elif "team_id" in filters:
-                    rows = await conn.fetch(GET_USER_ROLES_BY_TEAM_QUERY, filters["team_id"])
-                    return [dict(row) for row in rows]
-                rows = await conn.fetch(GET_USER_ROLES_QUERY)
-                return [dict(row) for row in rows]
+                user_role = await conn.fetchrow(GET_USER_ROLE_BY_ID_QUERY, filters.get("id"))
+                if user_role:
+                    return [dict(user_role)]
+                return []
         except Exception as e:
             print(f"❌ Error fetching user role data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
+    async def get_user_role_page(self, filters: dict, page: PageRequest) -> Page:
+        listing_query = self._listing_query(filters)
+        if listing_query is None:
+            return Page(items=[])
+        query, args = listing_query
+        try:
+            async with self.db_pool.acquire() as conn:
+                result = await fetch_page(conn, query, args, USER_ROLE_LISTING, page)
+        except InvalidListingParams as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            print(f"❌ Error fetching user role data: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+        result.items = [dict(row) for row in result.items]
+        return result
+
     async def save_user_role_data(self, user_role_data: dict) -> dict:
         try:
             async with self.db_pool.acquire() as conn:
@@ -91,6 +107,7 @@ class UserRoleService:
                 team_id = user_role_data.get("team_id")
                 
                 row = await conn.fetchrow(INSERT_USER_ROLE_QUERY, organization_id, user_id, role_id, team_id)
+                invalidate_permissions(organization_id)
                 return dict(row) if row else {}
         except Exception as e:
             print(f"❌ Error saving user role data: {e}")
@@ -98,22 +115,31 @@ class UserRoleService:
 
     async def save_bulk_user_role_data(self, user_roles_data: list[dict]) -> list[dict]:
         """
-        Bulk insert user roles and return the inserted user role documents.
+        Bulk save user roles in one transaction and return the saved user role documents.
+        Entries with an existing id are updated, the rest inserted (one statement each).
         """
         try:
-            rows = []
+            items = [
+                (
+                    as_uuid(user_role.get("id")),
+                    (
+                        user_role.get("organization_id"),
+                        user_role.get("user_id"),
+                        user_role.get("role_id"),
+                        user_role.get("team_id") or None,
+                    ),
+                )
+                for user_role in user_roles_data
+            ]
             async with self.db_pool.acquire() as conn:
                 async with conn.transaction():
-                    for user_role in user_roles_data:
-                        organization_id = user_role.get("organization_id")
-                        user_id = user_role.get("user_id")
-                        role_id = user_role.get("role_id")
-                        team_id = user_role.get("team_id")
-                        
-                        row = await conn.fetchrow(INSERT_USER_ROLE_QUERY, organization_id, user_id, role_id, team_id)
-                        if row:
-                            rows.append(dict(row))
-            return rows
+                    rows = await save_by_id(
+                        conn, items,
+                        update_query=UPDATE_BULK_USER_ROLES_QUERY,
+                        insert_query=INSERT_BULK_USER_ROLES_QUERY,
+                    )
+            invalidate_permissions()
+            return [dict(row) for row in rows]
         except Exception as e:
             print(f"❌ Error saving bulk user role data: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
@@ -132,6 +158,7 @@ class UserRoleService:
                 team_id = update_data.get("team_id")
                 
                 row = await conn.fetchrow(UPDATE_USER_ROLE_QUERY, organization_id, user_id, role_id, team_id, user_role_id)
+                invalidate_permissions()
                 if not row:
                     raise ValueError("User Role not found")
                 return dict(row)
@@ -145,6 +172,7 @@ class UserRoleService:
         try:
             async with self.db_pool.acquire() as conn:
                 result = await conn.execute(DELETE_USER_ROLE_QUERY, user_role_id)
+                invalidate_permissions()
                 if result and result.startswith("DELETE"):
                     return ""
                 return "User Role not found"
@@ -206,6 +234,17 @@ class UserRoleService:
         except Exception as e:
             print(f"❌ Error syncing user roles: {e}")
             raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+        finally:
+            invalidate_permissions(organization_id)
+
+    async def get_user_role_overview_version(self, organization_id: str) -> int:
+        """Change counter of the organization's overview projection (0 if never changed)."""
+        try:
+            async with self.db_pool.acquire() as conn:
+                return await conn.fetchval(GET_USER_ROLE_OVERVIEW_VERSION_QUERY, organization_id)
+        except Exception as e:
+            print(f"❌ Error fetching user role overview version: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
     async def get_user_role_overview_data(self, filters: dict = {}) -> List[dict]:
         """
@@ -0,0 +1,97 @@
+"""Per-organization cache of built checklist templates.
+
+Each organization's templates are loaded once (templates, items and teams)
+and kept as ``ChecklistTemplateOut`` objects, newest first. Template writes
+in this process invalidate the organization's entry. With
+``CHECKLIST_TEMPLATE_CACHE_SHARED`` every read also compares the entry with
+the organization's ``resource_versions`` counters (one primary-key lookup on
+the request's own session connection), so writes made by other workers, and
+team renames, are picked up immediately. Without it the TTL bounds staleness
+across workers.
+
+Cached objects are shared between requests and must not be mutated.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.checklist.schemas import ChecklistTemplateOut
+from app.core.config import settings
+from app.queries.resource_version import GET_RESOURCE_VERSIONS_QUERY
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Templates carry their team's name, so team changes count as well.
+TEMPLATE_RESOURCES = ("checklist_templates", "teams")
+
+
+@dataclass(frozen=True)
+class OrgTemplates:
+    version: str | None
+    templates: tuple[ChecklistTemplateOut, ...]
+    by_id: dict[UUID, ChecklistTemplateOut] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, version: str | None, templates: list[ChecklistTemplateOut]) -> OrgTemplates:
+        return cls(version, tuple(templates), {t.id: t for t in templates})
+
+    def for_team(self, team_id: UUID | None) -> list[ChecklistTemplateOut]:
+        if team_id is None:
+            return list(self.templates)
+        return [t for t in self.templates if t.team_id == team_id]
+
+
+_template_cache: TTLCache[UUID, OrgTemplates] = TTLCache(
+    "checklist_templates",
+    maxsize=settings.CHECKLIST_TEMPLATE_CACHE_MAX_ORGS,
+    ttl=settings.CHECKLIST_TEMPLATE_CACHE_TTL_SECONDS,
+)
+
+
+async def _shared_version(session: AsyncSession, organization_id: UUID) -> str | None:
+    if not settings.CHECKLIST_TEMPLATE_CACHE_SHARED:
+        return None
+    try:
+        # The session's connection, not a second checkout while the request
+        # holds one; the savepoint keeps a failed lookup from aborting it.
+        async with session.begin_nested():
+            connection = await session.connection()
+            raw = await connection.get_raw_connection()
+            return await raw.driver_connection.fetchval(
+                GET_RESOURCE_VERSIONS_QUERY, str(organization_id), list(TEMPLATE_RESOURCES)
+            )
+    except Exception as exc:
+        logger.warning("Checklist template version lookup failed: %s", exc)
+        return None
+
+
+async def get_org_templates(
+    session: AsyncSession,
+    organization_id: UUID,
+    load: Callable[[], Awaitable[list[ChecklistTemplateOut]]],
+) -> OrgTemplates:
+    """The organization's templates from the cache, calling ``load`` on a miss."""
+    # Read the version before loading, so a write racing the load leaves an
+    # entry that is already stale rather than one that hides the write.
+    version = await _shared_version(session, organization_id)
+    entry = _template_cache.get(organization_id)
+    if entry is not None and entry.version == version:
+        return entry
+    entry = OrgTemplates.build(version, await load())
+    _template_cache.set(organization_id, entry)
+    return entry
+
+
+def invalidate_templates(organization_id: UUID | None = None) -> None:
+    """Drop one organization's templates, or every organization's."""
+    if organization_id is None:
+        _template_cache.clear()
+        return
+    _template_cache.pop(organization_id)
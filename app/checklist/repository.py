@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import uuid
-from datetime import date
+from datetime import date, datetime
 
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import and_, delete, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -168,7 +168,13 @@ class ChecklistRepository:
         end_date: date | None = None,
         page: int = 1,
         limit: int = 50,
-    ) -> tuple[list[ChecklistRecord], int]:
+        after: tuple[date, datetime, uuid.UUID] | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[ChecklistRecord], int | None]:
+        """List records newest first, by OFFSET page or by keyset when ``after`` is given.
+
+        ``after`` is the (date, created_at, id) of the last row already seen.
+        """
         filters = [ChecklistRecord.organization_id == organization_id]
         if record_date:
             filters.append(ChecklistRecord.date == record_date)
@@ -183,10 +189,22 @@ class ChecklistRepository:
         if end_date:
             filters.append(ChecklistRecord.date <= end_date)
 
-        count_stmt = select(func.count()).select_from(ChecklistRecord).where(and_(*filters))
-        total = (await self.session.execute(count_stmt)).scalar_one()
+        total = None
+        if include_total:
+            count_stmt = select(func.count()).select_from(ChecklistRecord).where(and_(*filters))
+            total = (await self.session.execute(count_stmt)).scalar_one()
+
+        if after is not None:
+            after_date, after_created_at, after_id = after
+            filters.append(ChecklistRecord.date <= after_date)
+            filters.append(
+                or_(
+                    ChecklistRecord.date < after_date,
+                    tuple_(ChecklistRecord.created_at, ChecklistRecord.id)
+                    < tuple_(after_created_at, after_id),
+                )
+            )
 
-        offset = max(page - 1, 0) * limit
         stmt = (
             select(ChecklistRecord)
             .options(
@@ -195,10 +213,15 @@ class ChecklistRepository:
                 selectinload(ChecklistRecord.team),
             )
             .where(and_(*filters))
-            .order_by(ChecklistRecord.date.desc(), ChecklistRecord.created_at.desc())
-            .offset(offset)
+            .order_by(
+                ChecklistRecord.date.desc(),
+                ChecklistRecord.created_at.desc(),
+                ChecklistRecord.id.desc(),
+            )
             .limit(limit)
         )
+        if after is None:
+            stmt = stmt.offset(max(page - 1, 0) * limit)
         result = await self.session.execute(stmt)
         return list(result.scalars().unique().all()), total
 
@@ -211,7 +234,7 @@ class ChecklistRepository:
         record_date: date,
         completed_by: str,
         notes: str | None,
-        template_items: list[ChecklistItem],
+        item_ids: list[uuid.UUID],
         item_statuses: list[dict],
     ) -> ChecklistRecord:
         record = ChecklistRecord(
@@ -226,12 +249,12 @@ class ChecklistRepository:
         await self.session.flush()
 
         status_by_item = {s["checklist_item_id"]: s for s in item_statuses}
-        for item in template_items:
-            payload = status_by_item.get(item.id, {})
+        for item_id in item_ids:
+            payload = status_by_item.get(item_id, {})
             self.session.add(
                 ChecklistItemStatus(
                     checklist_record_id=record.id,
-                    checklist_item_id=item.id,
+                    checklist_item_id=item_id,
                     is_checked=payload.get("is_checked", False),
                     issue_reported=payload.get("issue_reported"),
                 )
@@ -5,10 +5,11 @@ from datetime import date
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import conditional, resource_etag
 from app.checklist.auth import AuthContext, get_checklist_context
 from app.checklist.exceptions import ChecklistError
 from app.checklist.schemas import (
@@ -47,13 +48,20 @@ def _handle_error(exc: Exception) -> JSONResponse:
 
 @router.get("/templates")
 async def list_templates(
+    request: Request,
     team_id: UUID | None = Query(None),
     auth: AuthContext = Depends(get_checklist_context),
     service: ChecklistService = Depends(get_service),
 ):
     try:
-        data = await service.list_templates(auth, team_id)
-        return _wrap([item.model_dump(mode="json") for item in data])
+        # Templates carry their team's name, so team changes count too.
+        etag = await resource_etag(request, auth.organization_id, ("checklist_templates", "teams"), team_id)
+
+        async def render() -> JSONResponse:
+            data = await service.list_templates(auth, team_id)
+            return _wrap([item.model_dump(mode="json") for item in data])
+
+        return await conditional(request, etag, render)
     except Exception as exc:
         return _handle_error(exc)
 
@@ -110,6 +118,8 @@ async def list_records(
     end_date: date | None = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
 ):
     try:
         result = await service.list_records(
@@ -122,6 +132,8 @@ async def list_records(
             end_date=end_date,
             page=page,
             limit=limit,
+            cursor=cursor,
+            include_total=include_total,
         )
         result["data"] = [item.model_dump(mode="json") for item in result["data"]]
         return JSONResponse(content=result)
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import logging
-from datetime import date
+from datetime import date, datetime
 from uuid import UUID
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth_context import AuthContext
+from app.checklist.cache import OrgTemplates, get_org_templates, invalidate_templates
 from app.checklist.constants import DEFAULT_SVC_META
 from app.checklist.exceptions import (
     ConflictError,
@@ -27,6 +28,7 @@ from app.checklist.schemas import (
     ChecklistTemplateUpdate,
     ItemStatusOut,
 )
+from app.db.pagination import decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -91,13 +93,20 @@ class ChecklistService:
             ],
         )
 
+    async def _org_templates(self, organization_id: UUID) -> OrgTemplates:
+        async def load() -> list[ChecklistTemplateOut]:
+            templates = await self.repo.list_templates(organization_id)
+            return [self._template_to_out(t) for t in templates]
+
+        return await get_org_templates(self.session, organization_id, load)
+
     async def list_templates(
         self, auth: AuthContext, team_id: UUID | None = None
     ) -> list[ChecklistTemplateOut]:
         if team_id:
             await self._assert_team_in_org(team_id, auth.organization_id)
-        templates = await self.repo.list_templates(auth.organization_id, team_id)
-        return [self._template_to_out(t) for t in templates]
+        cached = await self._org_templates(auth.organization_id)
+        return cached.for_team(team_id)
 
     async def create_template(
         self, auth: AuthContext, payload: ChecklistTemplateCreate
@@ -132,6 +141,7 @@ class ChecklistService:
             auth.organization_id,
         )
         await self._commit()
+        invalidate_templates(auth.organization_id)
         return self._template_to_out(template)
 
     async def update_template(
@@ -169,6 +179,7 @@ class ChecklistService:
 
         logger.info("Updated checklist template %s", template_id)
         await self._commit()
+        invalidate_templates(auth.organization_id)
         return self._template_to_out(template)
 
     async def delete_template(self, auth: AuthContext, template_id: UUID) -> None:
@@ -177,6 +188,7 @@ class ChecklistService:
             raise NotFoundError("Checklist template not found")
         await self.repo.delete_template(template)
         await self._commit()
+        invalidate_templates(auth.organization_id)
         logger.info("Deleted checklist template %s", template_id)
 
     async def list_records(
@@ -191,12 +203,25 @@ class ChecklistService:
         end_date: date | None = None,
         page: int = 1,
         limit: int = 50,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> dict:
+        after = None
+        if cursor:
+            try:
+                raw_date, raw_created_at, raw_id = decode_cursor(cursor, 3)
+                after = (
+                    date.fromisoformat(raw_date),
+                    datetime.fromisoformat(raw_created_at),
+                    UUID(raw_id),
+                )
+            except ValueError as exc:
+                raise ValidationError("Invalid cursor") from exc
         if team_id:
             await self._assert_team_in_org(team_id, auth.organization_id)
         if template_id:
-            template = await self.repo.get_template(template_id, auth.organization_id)
-            if template is None:
+            cached = await self._org_templates(auth.organization_id)
+            if template_id not in cached.by_id:
                 raise NotFoundError("Checklist template not found")
 
         records, total = await self.repo.list_records(
@@ -209,12 +234,19 @@ class ChecklistService:
             end_date=end_date,
             page=page,
             limit=limit,
+            after=after,
+            include_total=include_total,
         )
+        next_cursor = None
+        if len(records) == limit:
+            last = records[-1]
+            next_cursor = encode_cursor(last.date, last.created_at, last.id)
         return {
             "data": [self._record_to_out(r) for r in records],
             "total": total,
             "page": page,
             "limit": limit,
+            "next_cursor": next_cursor,
         }
 
     async def get_record(self, auth: AuthContext, record_id: UUID) -> ChecklistRecordOut:
@@ -226,12 +258,19 @@ class ChecklistService:
     async def create_record(
         self, auth: AuthContext, payload: ChecklistRecordCreate
     ) -> ChecklistRecordOut:
-        template = await self.repo.get_template(payload.template_id, auth.organization_id)
+        cached = await self._org_templates(auth.organization_id)
+        template = cached.by_id.get(payload.template_id)
         if template is None:
             raise NotFoundError("Checklist template not found")
         await self._assert_team_in_org(payload.team_id, auth.organization_id)
         if template.team_id != payload.team_id:
             raise ValidationError("team_id does not match template team")
+        item_ids = {item.id for item in template.items}
+        unknown = [s.checklist_item_id for s in payload.item_statuses if s.checklist_item_id not in item_ids]
+        if unknown:
+            raise ValidationError(
+                f"checklist_item_id {unknown[0]} is not an item of this template"
+            )
 
         existing = await self.repo.find_record_by_unique(
             auth.organization_id,
@@ -264,7 +303,7 @@ class ChecklistService:
                 record_date=payload.date,
                 completed_by=completed_by,
                 notes=notes,
-                template_items=template.items,
+                item_ids=[item.id for item in template.items],
                 item_statuses=item_statuses,
             )
         except IntegrityError as exc:
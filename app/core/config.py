@@ -16,6 +16,30 @@ class Settings(BaseSettings):
     GMAIL_USERNAME: str = Field(default='', validation_alias='GMAIL_USERNAME')
     GMAIL_PASS: str = Field(default='', validation_alias='GMAIL_PASS')
     THE_CHURCH_MANAGER_APP: str = Field(default='', validation_alias='THE_CHURCH_MANAGER_APP')
+
+    # Outbound mail: pooled SMTP connections (GMAIL_USERNAME/GMAIL_PASS log in) fed by the mail_outbox queue
+    MAIL_SMTP_HOST: str = Field(default='smtp.gmail.com', validation_alias='MAIL_SMTP_HOST')
+    MAIL_SMTP_PORT: int = Field(default=587, validation_alias='MAIL_SMTP_PORT')
+    MAIL_SMTP_STARTTLS: bool = Field(default=True, validation_alias='MAIL_SMTP_STARTTLS')
+    MAIL_SMTP_TIMEOUT_SECONDS: float = Field(default=30, validation_alias='MAIL_SMTP_TIMEOUT_SECONDS')
+    MAIL_POOL_SIZE: int = Field(default=2, validation_alias='MAIL_POOL_SIZE')
+    # Connections idle longer than this are closed rather than reused (servers drop them anyway)
+    MAIL_POOL_MAX_IDLE_SECONDS: float = Field(default=120, validation_alias='MAIL_POOL_MAX_IDLE_SECONDS')
+    MAIL_QUEUE_BATCH_SIZE: int = Field(default=50, validation_alias='MAIL_QUEUE_BATCH_SIZE')
+    MAIL_QUEUE_POLL_SECONDS: float = Field(default=5, validation_alias='MAIL_QUEUE_POLL_SECONDS')
+    MAIL_QUEUE_MAX_ATTEMPTS: int = Field(default=5, validation_alias='MAIL_QUEUE_MAX_ATTEMPTS')
+    MAIL_QUEUE_RETRY_BASE_SECONDS: float = Field(default=30, validation_alias='MAIL_QUEUE_RETRY_BASE_SECONDS')
+    # Messages claimed by a worker that died are handed out again after this long
+    MAIL_QUEUE_LEASE_SECONDS: float = Field(default=300, validation_alias='MAIL_QUEUE_LEASE_SECONDS')
+    # Bulk template sends render and enqueue recipients this many at a time
+    MAIL_BULK_BATCH_SIZE: int = Field(default=500, validation_alias='MAIL_BULK_BATCH_SIZE')
+    MAIL_BULK_MAX_RECIPIENTS: int = Field(default=20000, validation_alias='MAIL_BULK_MAX_RECIPIENTS')
+    # Compiled mail templates, keyed by (template id, updated_at)
+    MAIL_TEMPLATE_CACHE_MAX_ENTRIES: int = Field(default=500, validation_alias='MAIL_TEMPLATE_CACHE_MAX_ENTRIES')
+    MAIL_TEMPLATE_CACHE_TTL_SECONDS: int = Field(default=3600, validation_alias='MAIL_TEMPLATE_CACHE_TTL_SECONDS')
+    # Template rows by key (global plus organization overrides); bounds staleness across workers
+    MAIL_TEMPLATE_LOOKUP_CACHE_TTL_SECONDS: int = Field(default=300, validation_alias='MAIL_TEMPLATE_LOOKUP_CACHE_TTL_SECONDS')
+    MAIL_TEMPLATE_LOOKUP_CACHE_MAX_KEYS: int = Field(default=200, validation_alias='MAIL_TEMPLATE_LOOKUP_CACHE_MAX_KEYS')
     
     # Amazon SES settings
     SES_SMTP_SERVER: str = Field(default='', validation_alias='SES_SMTP_SERVER')
@@ -34,9 +58,52 @@ class Settings(BaseSettings):
     POSTGRESQL_SSL_MODE: str = Field(default='prefer', validation_alias='POSTGRESQL_SSL_MODE')
     POSTGRESQL_SSL_REJECT_UNAUTHORIZED: bool = Field(default=False, validation_alias='POSTGRESQL_SSL_REJECT_UNAUTHORIZED')
 
+    # Shared connection pool (SQLAlchemy engine, also used by the asyncpg services)
+    # Connections opened concurrently at startup, before the app reports ready
+    DB_POOL_MIN_SIZE: int = Field(default=2, validation_alias='DB_POOL_MIN_SIZE')
+    DB_POOL_SIZE: int = Field(default=10, validation_alias='DB_POOL_SIZE')
+    DB_POOL_MAX_OVERFLOW: int = Field(default=5, validation_alias='DB_POOL_MAX_OVERFLOW')
+    DB_POOL_TIMEOUT_SECONDS: float = Field(default=15, validation_alias='DB_POOL_TIMEOUT_SECONDS')
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1800, validation_alias='DB_POOL_RECYCLE_SECONDS')
+    DB_POOL_MAX_INACTIVE_SECONDS: float = Field(default=300, validation_alias='DB_POOL_MAX_INACTIVE_SECONDS')
+    DB_POOL_HEALTH_CHECK_INTERVAL_SECONDS: float = Field(default=30, validation_alias='DB_POOL_HEALTH_CHECK_INTERVAL_SECONDS')
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100, validation_alias='DB_STATEMENT_CACHE_SIZE')
+    # app/queries modules whose statements are prepared on every new connection ("*" = all)
+    DB_PREPARE_QUERY_MODULES: str = Field(default='song,expense,inventory', validation_alias='DB_PREPARE_QUERY_MODULES')
+    # Supabase pooler on port 6543 (pgbouncer transaction mode): disables prepared statement caching
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = Field(default=False, validation_alias='DB_PGBOUNCER_TRANSACTION_MODE')
+    DB_CONNECT_TIMEOUT_SECONDS: float = Field(default=15, validation_alias='DB_CONNECT_TIMEOUT_SECONDS')
+    DB_COMMAND_TIMEOUT_SECONDS: float = Field(default=30, validation_alias='DB_COMMAND_TIMEOUT_SECONDS')
+    # Requests arriving while the pool is still starting wait this long before a 503
+    READINESS_GATE_TIMEOUT_SECONDS: float = Field(default=10, validation_alias='READINESS_GATE_TIMEOUT_SECONDS')
+
+    # Import each route group on its first request instead of at startup (worker cold start)
+    ROUTERS_LAZY: bool = Field(default=True, validation_alias='ROUTERS_LAZY')
+
     # IAM handled by separate service — disable local JWT gate until wired up
     IAM_AUTH_ENABLED: bool = Field(default=False, validation_alias='IAM_AUTH_ENABLED')
 
+    # In-process cache of resolved bearer tokens and user -> organization lookups
+    AUTH_CACHE_TTL_SECONDS: int = Field(default=300, validation_alias='AUTH_CACHE_TTL_SECONDS')
+    AUTH_CACHE_MAX_ENTRIES: int = Field(default=10000, validation_alias='AUTH_CACHE_MAX_ENTRIES')
+    AUTH_ORG_CACHE_TTL_SECONDS: int = Field(default=600, validation_alias='AUTH_ORG_CACHE_TTL_SECONDS')
+    # Effective permission matrices per (organization, user); writes invalidate them in-process
+    PERMISSION_CACHE_TTL_SECONDS: int = Field(default=300, validation_alias='PERMISSION_CACHE_TTL_SECONDS')
+    PERMISSION_CACHE_MAX_ENTRIES: int = Field(default=10000, validation_alias='PERMISSION_CACHE_MAX_ENTRIES')
+    # Built checklist templates per organization; with SHARED, entries are checked against
+    # resource_versions so writes made by other workers are seen immediately
+    CHECKLIST_TEMPLATE_CACHE_TTL_SECONDS: int = Field(default=300, validation_alias='CHECKLIST_TEMPLATE_CACHE_TTL_SECONDS')
+    CHECKLIST_TEMPLATE_CACHE_MAX_ORGS: int = Field(default=1000, validation_alias='CHECKLIST_TEMPLATE_CACHE_MAX_ORGS')
+    CHECKLIST_TEMPLATE_CACHE_SHARED: bool = Field(default=True, validation_alias='CHECKLIST_TEMPLATE_CACHE_SHARED')
+
+    # Paginated listings for the asyncpg services (limit/cursor/sort)
+    LISTING_DEFAULT_LIMIT: int = Field(default=500, validation_alias='LISTING_DEFAULT_LIMIT')
+    LISTING_MAX_LIMIT: int = Field(default=1000, validation_alias='LISTING_MAX_LIMIT')
+    LISTING_STREAM_CHUNK_ROWS: int = Field(default=500, validation_alias='LISTING_STREAM_CHUNK_ROWS')
+
+    # Largest batch accepted by the bulk-save/import endpoints (JSON or CSV)
+    BULK_IMPORT_MAX_ROWS: int = Field(default=20000, validation_alias='BULK_IMPORT_MAX_ROWS')
+
     TEST_DATABASE_URL: str = Field(default='', validation_alias='TEST_DATABASE_URL')
     ROTA_USE_MONGO: bool = Field(default=False, validation_alias='ROTA_USE_MONGO')
 
@@ -0,0 +1,118 @@
+"""Helpers for bulk writes in the asyncpg services.
+
+Imports (expenses, accounts) validate every row first, then load all valid
+rows in one transaction with ``copy_records_to_table``. Each input row gets
+one entry in the report, in input order, in the shape the bulk endpoints have
+always returned::
+
+    {"success": bool, "total": n, "successful": n, "failed": n,
+     "data": [{"status": "success", "data": {...}} |
+              {"status": "failed", "error": ...}, ...]}
+
+Bulk saves that mix new and existing rows (teams, permissions, user roles)
+use ``save_by_id``: one ``unnest``-based UPDATE for the rows with an id and
+one INSERT for the rest, instead of a statement per row.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+
+def check_batch_size(rows: list) -> None:
+    if len(rows) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ROWS} rows can be imported at once",
+        )
+
+
+def read_csv(content: bytes) -> list[dict[str, Any]]:
+    """Rows of a CSV upload keyed by header; empty cells become ``None``."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV file must be UTF-8 encoded")
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise HTTPException(status_code=400, detail="CSV file must start with a header row")
+    rows = []
+    for record in reader:
+        rows.append({
+            (key or "").strip().lower(): (value.strip() or None) if isinstance(value, str) else value
+            for key, value in record.items()
+            if key
+        })
+    return rows
+
+
+def bulk_report(entries: list[dict]) -> dict:
+    successful = sum(1 for entry in entries if entry["status"] == "success")
+    return {
+        "success": successful == len(entries),
+        "total": len(entries),
+        "successful": successful,
+        "failed": len(entries) - successful,
+        "data": entries,
+    }
+
+
+def as_uuid(value) -> uuid.UUID | None:
+    """``value`` as a UUID, or ``None`` when it is missing or malformed."""
+    if not value:
+        return None
+    try:
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def _columns(records: list[tuple]) -> list[list]:
+    return [list(column) for column in zip(*records)]
+
+
+async def save_by_id(
+    conn,
+    items: Sequence[tuple[uuid.UUID | None, tuple]],
+    *,
+    update_query: str,
+    insert_query: str,
+) -> list:
+    """Write ``(id, values)`` pairs with at most two statements; rows come back in input order.
+
+    Both queries take one array per column, id first. Items whose id matches
+    an existing row are updated; the rest (no id, or an id that is not
+    found) are inserted under a freshly generated id.
+    """
+    rows: dict[int, object] = {}
+    updates = [(index, key, values) for index, (key, values) in enumerate(items) if key is not None]
+    if updates:
+        updated = await conn.fetch(
+            update_query, *_columns([(key, *values) for _, key, values in updates])
+        )
+        by_id = {row["id"]: row for row in updated}
+        for index, key, _ in updates:
+            if key in by_id:
+                rows[index] = by_id[key]
+
+    inserts = [
+        (index, uuid.uuid4(), values)
+        for index, (_, values) in enumerate(items)
+        if index not in rows
+    ]
+    if inserts:
+        inserted = await conn.fetch(
+            insert_query, *_columns([(new_id, *values) for _, new_id, values in inserts])
+        )
+        by_id = {row["id"]: row for row in inserted}
+        for index, new_id, _ in inserts:
+            rows[index] = by_id[new_id]
+    return [rows[index] for index in range(len(items))]
@@ -0,0 +1,192 @@
+"""Keyset-paginated and streamed listings for the asyncpg services.
+
+A listing wraps one of the existing ``app/queries`` filter queries::
+
+    SELECT * FROM (<filter query without ORDER BY>) AS listing
+    WHERE (<sort columns>) < (<cursor values>)
+    ORDER BY <sort columns> DESC
+    LIMIT $n
+
+Without an ORDER BY the subquery is flattened by the planner, so the filter
+and keyset conditions share the table's indexes. Every sort ends in a unique
+column so the cursor is unambiguous. Pages always have a limit (capped by
+``LISTING_MAX_LIMIT``), so no request loads a whole table.
+
+``stream_json_array`` serves exports: it reads the same query through a
+server-side cursor and yields the JSON array in chunks.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from app.core.config import settings
+from app.db.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.db.query_registry import registry
+
+_TRAILING_ORDER_BY = re.compile(r"\s+ORDER\s+BY\s+[^()]*$", re.IGNORECASE)
+
+
+class InvalidListingParams(ValueError):
+    """Raised for an unknown sort/order or an undecodable cursor."""
+
+
+@dataclass(frozen=True)
+class SortKey:
+    column: str
+    # Postgres type the cursor value is cast back to.
+    cast: str
+
+
+@dataclass(frozen=True)
+class Listing:
+    sorts: dict[str, tuple[SortKey, ...]] = field(hash=False)
+    default_sort: str
+    default_order: str = "desc"
+
+    def keys(self, sort: str | None) -> tuple[SortKey, ...]:
+        name = sort or self.default_sort
+        if name not in self.sorts:
+            raise InvalidListingParams(
+                f"sort must be one of: {', '.join(sorted(self.sorts))}"
+            )
+        return self.sorts[name]
+
+    def descending(self, order: str | None) -> bool:
+        value = (order or self.default_order).lower()
+        if value not in ("asc", "desc"):
+            raise InvalidListingParams("order must be 'asc' or 'desc'")
+        return value == "desc"
+
+
+@dataclass
+class PageRequest:
+    limit: int | None = None
+    cursor: str | None = None
+    sort: str | None = None
+    order: str | None = None
+
+    @property
+    def effective_limit(self) -> int:
+        limit = self.limit or settings.LISTING_DEFAULT_LIMIT
+        return max(1, min(limit, settings.LISTING_MAX_LIMIT))
+
+
+@dataclass
+class Page:
+    items: list[Any]
+    next_cursor: str | None = None
+
+
+def _strip_order_by(query: str) -> str:
+    return _TRAILING_ORDER_BY.sub("", query.strip().rstrip(";"))
+
+
+@lru_cache(maxsize=256)
+def build_listing_query(
+    query: str,
+    arg_count: int,
+    keys: tuple[SortKey, ...],
+    descending: bool,
+    with_cursor: bool,
+    with_limit: bool = True,
+) -> str:
+    """SQL for one page of ``query``; cached so asyncpg reuses the prepared statement."""
+    op, direction = ("<", "DESC") if descending else (">", "ASC")
+    position = arg_count
+    where = ""
+    if with_cursor:
+        columns = ", ".join(f"listing.{key.column}" for key in keys)
+        params = ", ".join(
+            f"${position + i + 1}::text::{key.cast}" for i, key in enumerate(keys)
+        )
+        where = f" WHERE ({columns}) {op} ({params})"
+        position += len(keys)
+    order_by = ", ".join(f"listing.{key.column} {direction}" for key in keys)
+    sql = f"SELECT * FROM ({_strip_order_by(query)}) AS listing{where} ORDER BY {order_by}"
+    if with_limit:
+        sql += f" LIMIT ${position + 1}"
+
+    base_name = registry.name_for(query)
+    if base_name:
+        registry.register(f"{base_name}:{'page' if with_limit else 'stream'}", sql)
+    return sql
+
+
+async def fetch_page(
+    conn,
+    query: str,
+    args: Sequence[Any],
+    listing: Listing,
+    page: PageRequest,
+) -> Page:
+    """Fetch one page of ``query``; ``Page.items`` are the raw records."""
+    keys = listing.keys(page.sort)
+    descending = listing.descending(page.order)
+    params = list(args)
+    if page.cursor:
+        try:
+            params.extend(decode_cursor(page.cursor, len(keys)))
+        except InvalidCursor as exc:
+            raise InvalidListingParams(str(exc)) from exc
+
+    limit = page.effective_limit
+    sql = build_listing_query(query, len(args), keys, descending, bool(page.cursor))
+    # One extra row tells us whether there is a next page.
+    rows = await conn.fetch(sql, *params, limit + 1)
+    if len(rows) <= limit:
+        return Page(items=list(rows))
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(
+        items=list(rows),
+        next_cursor=encode_cursor(*(last[key.column] for key in keys)),
+    )
+
+
+def stream_json_array(
+    pool,
+    query: str,
+    args: Sequence[Any],
+    listing: Listing,
+    convert: Callable[[dict], dict],
+    *,
+    sort: str | None = None,
+    order: str | None = None,
+    chunk_rows: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Return an iterator of ``query``'s rows as a JSON array, read through a server-side cursor.
+
+    Sort/order are validated here, before any bytes are sent. Only
+    ``chunk_rows`` records are held in memory at a time, and the connection
+    stays checked out until the response has been fully sent.
+    """
+    keys = listing.keys(sort)
+    descending = listing.descending(order)
+    sql = build_listing_query(query, len(args), keys, descending, False, with_limit=False)
+    return _stream_rows(pool, sql, args, convert, chunk_rows or settings.LISTING_STREAM_CHUNK_ROWS)
+
+
+async def _stream_rows(
+    pool, sql: str, args: Sequence[Any], convert: Callable[[dict], dict], chunk_rows: int
+) -> AsyncIterator[bytes]:
+    async with pool.acquire() as conn:
+        # Server-side cursors only live inside a transaction.
+        async with conn.transaction(readonly=True):
+            yield b"["
+            separator = ""
+            buffer: list[str] = []
+            async for record in conn.cursor(sql, *args, prefetch=chunk_rows):
+                buffer.append(json.dumps(convert(dict(record)), default=str))
+                if len(buffer) >= chunk_rows:
+                    yield (separator + ",".join(buffer)).encode()
+                    separator = ","
+                    buffer = []
+            if buffer:
+                yield (separator + ",".join(buffer)).encode()
+            yield b"]"
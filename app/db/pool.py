@@ -0,0 +1,360 @@
+"""Single PostgreSQL connection pool shared by asyncpg services and SQLAlchemy.
+
+The SQLAlchemy async engine owns the pool. ``SharedPool`` exposes the part of
+the ``asyncpg.Pool`` API the raw-SQL services in ``app/api/services`` use
+(``async with pool.acquire() as conn``) by checking out an engine connection and
+handing over the underlying asyncpg connection, so both layers count against
+one set of connections.
+
+Checkouts are attributed to a consumer (``asyncpg`` or ``sqlalchemy``) and
+reported by ``pool_stats()`` on ``/health-check/pool``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.util import await_only
+
+logger = logging.getLogger(__name__)
+
+RAW_CONSUMER = "asyncpg"
+ORM_CONSUMER = "sqlalchemy"
+
+# Connection record key holding the per-connection JSON decode mode.
+_JSON_MODE_KEY = "json_text_mode"
+_CHECKOUT_KEY = "pool_checkout"
+_LAST_CHECKIN_KEY = "pool_last_checkin"
+
+_consumer: ContextVar[str] = ContextVar("db_pool_consumer", default=ORM_CONSUMER)
+
+
+class ConsumerMetrics:
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.waits = 0
+        self.timeouts = 0
+
+    def stats(self) -> dict[str, Any]:
+        released = self.checkouts - self.in_use
+        data: dict[str, Any] = {
+            "checkouts": self.checkouts,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "hold_ms_avg": round(self.hold_seconds_total / released * 1000, 2) if released else 0.0,
+            "hold_ms_max": round(self.hold_seconds_max * 1000, 2),
+            "timeouts": self.timeouts,
+        }
+        if self.waits:
+            data["wait_ms_avg"] = round(self.wait_seconds_total / self.waits * 1000, 2)
+            data["wait_ms_max"] = round(self.wait_seconds_max * 1000, 2)
+        return data
+
+
+class PoolMetrics:
+    """Per-consumer checkout counters fed by SQLAlchemy pool events."""
+
+    def __init__(self) -> None:
+        self.consumers: dict[str, ConsumerMetrics] = {}
+
+    def consumer(self, name: str) -> ConsumerMetrics:
+        metrics = self.consumers.get(name)
+        if metrics is None:
+            metrics = self.consumers[name] = ConsumerMetrics()
+        return metrics
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+        # Invalidated connections may lose their record info before checkin.
+        event.listen(engine.sync_engine, "invalidate", self._on_invalidate)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        name = _consumer.get()
+        metrics = self.consumer(name)
+        metrics.checkouts += 1
+        metrics.in_use += 1
+        metrics.peak_in_use = max(metrics.peak_in_use, metrics.in_use)
+        connection_record.info[_CHECKOUT_KEY] = (name, time.monotonic())
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        checkout = connection_record.info.pop(_CHECKOUT_KEY, None)
+        if checkout is None:
+            return
+        name, started = checkout
+        held = time.monotonic() - started
+        metrics = self.consumer(name)
+        metrics.in_use -= 1
+        metrics.hold_seconds_total += held
+        metrics.hold_seconds_max = max(metrics.hold_seconds_max, held)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self._on_checkin(dbapi_connection, connection_record)
+
+    def record_wait(self, name: str, seconds: float) -> None:
+        metrics = self.consumer(name)
+        metrics.waits += 1
+        metrics.wait_seconds_total += seconds
+        metrics.wait_seconds_max = max(metrics.wait_seconds_max, seconds)
+
+    def record_timeout(self, name: str) -> None:
+        self.consumer(name).timeouts += 1
+
+    def reset(self) -> None:
+        self.consumers.clear()
+
+
+metrics = PoolMetrics()
+
+
+class HealthCheckState:
+    def __init__(self) -> None:
+        self.last_checked_at: float | None = None
+        self.last_ok: bool | None = None
+        self.last_latency_ms: float | None = None
+        self.last_error: str | None = None
+        self.failures = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "last_checked_at": self.last_checked_at,
+            "ok": self.last_ok,
+            "latency_ms": self.last_latency_ms,
+            "error": self.last_error,
+            "failures": self.failures,
+        }
+
+
+health = HealthCheckState()
+_health_task: asyncio.Task | None = None
+
+
+def install_idle_timeout(engine: AsyncEngine, max_inactive_seconds: float) -> None:
+    """Discard pooled connections that sat unused longer than ``max_inactive_seconds``.
+
+    Raising ``DisconnectionError`` from a checkout listener makes the pool
+    replace the connection with a fresh one, so idle connections that a
+    pooler or firewall may have dropped are never handed out.
+    """
+    if max_inactive_seconds <= 0:
+        return
+
+    def on_checkin(dbapi_connection, connection_record) -> None:
+        connection_record.info[_LAST_CHECKIN_KEY] = time.monotonic()
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        last = connection_record.info.get(_LAST_CHECKIN_KEY)
+        if last is not None and time.monotonic() - last > max_inactive_seconds:
+            connection_record.info.pop(_LAST_CHECKIN_KEY, None)
+            raise DisconnectionError("connection exceeded max inactive lifetime")
+
+    # insert=True so stale connections are replaced before metrics count the checkout.
+    event.listen(engine.sync_engine, "checkin", on_checkin)
+    event.listen(engine.sync_engine, "checkout", on_checkout, insert=True)
+
+
+async def warm_pool(engine: AsyncEngine, size: int) -> int:
+    """Open ``size`` connections concurrently so the first requests skip the handshake.
+
+    Each connection runs ``SELECT 1``, which doubles as the startup
+    connectivity check. Returns how many connections opened; raises the
+    first error when none did.
+    """
+    size = max(size, 1)
+
+    async def open_one() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    results = await asyncio.gather(*(open_one() for _ in range(size)), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if len(errors) == size:
+        raise errors[0]
+    for error in errors:
+        logger.warning("Pool warm-up connection failed: %s", error)
+    return size - len(errors)
+
+
+async def check_pool_health(engine: AsyncEngine) -> bool:
+    """Run ``SELECT 1`` on a pooled connection; dispose the pool if it fails.
+
+    Disposing drops every idle connection, so after a database restart or
+    failover requests get fresh connections instead of each discovering a
+    dead one.
+    """
+    started = time.monotonic()
+    health.last_checked_at = time.time()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        health.last_ok = False
+        health.last_error = str(exc)
+        health.failures += 1
+        logger.warning("Database pool health check failed: %s", exc)
+        await engine.dispose()
+        return False
+    health.last_ok = True
+    health.last_error = None
+    health.last_latency_ms = round((time.monotonic() - started) * 1000, 2)
+    return True
+
+
+def start_health_check(engine: AsyncEngine, interval_seconds: float) -> None:
+    """Start the periodic pool health check (replaces per-checkout pre-ping)."""
+    global _health_task
+    if interval_seconds <= 0 or (_health_task is not None and not _health_task.done()):
+        return
+
+    async def run() -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await check_pool_health(engine)
+
+    _health_task = asyncio.create_task(run())
+
+
+async def stop_health_check() -> None:
+    global _health_task
+    task, _health_task = _health_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def install_json_codecs(engine: AsyncEngine) -> None:
+    """Make json/jsonb decoding switchable per connection.
+
+    The SQLAlchemy dialect decodes json/jsonb into Python objects, while the
+    raw asyncpg services have always received the JSON text. The codecs
+    installed here decode to text while a ``SharedPool`` checkout holds the
+    connection and to Python objects otherwise.
+    """
+
+    def on_connect(dbapi_connection, connection_record) -> None:
+        mode = {"text": False}
+        connection_record.info[_JSON_MODE_KEY] = mode
+
+        def decode_json(data: bytes):
+            text = data.decode()
+            return text if mode["text"] else json.loads(text)
+
+        def decode_jsonb(data: bytes):
+            # Binary jsonb is prefixed with a version byte.
+            text = data[1:].decode()
+            return text if mode["text"] else json.loads(text)
+
+        conn = dbapi_connection.driver_connection
+        await_only(
+            conn.set_type_codec(
+                "json",
+                encoder=str.encode,
+                decoder=decode_json,
+                schema="pg_catalog",
+                format="binary",
+            )
+        )
+        await_only(
+            conn.set_type_codec(
+                "jsonb",
+                encoder=lambda value: b"\x01" + value.encode(),
+                decoder=decode_jsonb,
+                schema="pg_catalog",
+                format="binary",
+            )
+        )
+
+    event.listen(engine.sync_engine, "connect", on_connect)
+
+
+class SharedPool:
+    """asyncpg.Pool-compatible facade over the SQLAlchemy engine's pool."""
+
+    def __init__(self, engine: AsyncEngine, *, consumer: str = RAW_CONSUMER):
+        self._engine = engine
+        self.consumer = consumer
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        token = _consumer.set(self.consumer)
+        started = time.monotonic()
+        try:
+            connection = await self._engine.connect()
+        except PoolTimeoutError:
+            metrics.record_timeout(self.consumer)
+            raise
+        finally:
+            _consumer.reset(token)
+        metrics.record_wait(self.consumer, time.monotonic() - started)
+
+        try:
+            raw = await connection.get_raw_connection()
+            driver = raw.driver_connection
+            mode = raw.info.get(_JSON_MODE_KEY)
+            if mode is not None:
+                mode["text"] = True
+            try:
+                yield driver
+            finally:
+                if mode is not None:
+                    mode["text"] = False
+                if driver.is_closed():
+                    await connection.invalidate()
+                elif driver.is_in_transaction():
+                    # Never hand a connection with an open transaction back to the ORM.
+                    await driver.execute("ROLLBACK")
+        finally:
+            await connection.close()
+
+    async def fetch(self, query: str, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, **kwargs)
+
+    async def execute(self, query: str, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, **kwargs)
+
+
+def pool_stats(engine: AsyncEngine | None) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "consumers": {name: m.stats() for name, m in sorted(metrics.consumers.items())},
+        "health_check": health.stats(),
+    }
+    if engine is not None:
+        pool = engine.sync_engine.pool
+        data["pool"] = {
+            "size": getattr(pool, "size", lambda: None)(),
+            "checked_out": getattr(pool, "checkedout", lambda: None)(),
+            "checked_in": getattr(pool, "checkedin", lambda: None)(),
+            "overflow": getattr(pool, "overflow", lambda: None)(),
+        }
+    return data
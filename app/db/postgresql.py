@@ -1,11 +1,11 @@
 import asyncio
-import asyncpg
 import logging
-import ssl
 
 from app.core.config import settings
+from app.db.pool import SharedPool, warm_pool
+from app.db.session import get_engine
 
-pool = None
+pool: SharedPool | None = None
 
 POSTGRESQL_CONFIG_HELP = (
     "Configure PostgreSQL via DATABASE_URL "
@@ -13,19 +13,12 @@ POSTGRESQL_CONFIG_HELP = (
 )
 
 
-def _build_ssl_config():
-    ssl_mode = settings.POSTGRESQL_SSL_MODE
-    if ssl_mode in ("require", "prefer"):
-        ssl_config = ssl.create_default_context()
-        if not settings.POSTGRESQL_SSL_REJECT_UNAUTHORIZED:
-            ssl_config.check_hostname = False
-            ssl_config.verify_mode = ssl.CERT_NONE
-        return ssl_config
-    return None
-
-
 async def connect_postgresql(*, retries: int = 5, delay_seconds: float = 2.0):
-    """Create and return an asyncpg connection pool with startup retries."""
+    """Return the shared connection pool, verifying connectivity with startup retries.
+
+    The pool belongs to the SQLAlchemy engine (see ``app.db.pool``); the returned
+    ``SharedPool`` hands out asyncpg connections from it.
+    """
     global pool
 
     if pool is not None:
@@ -36,25 +29,23 @@ async def connect_postgresql(*, retries: int = 5, delay_seconds: float = 2.0):
         logging.error(message)
         raise RuntimeError(message)
 
-    ssl_config = _build_ssl_config()
     connect_kwargs = settings.get_asyncpg_connect_kwargs()
+    engine = get_engine()
     last_error = None
 
     for attempt in range(1, retries + 1):
         try:
-            pool = await asyncpg.create_pool(
-                **connect_kwargs,
-                ssl=ssl_config,
-                min_size=1,
-                max_size=10,
-                timeout=15,
-                command_timeout=30,
-            )
+            # One concurrent round: opening the minimum connections is the connectivity check.
+            warmed = await warm_pool(engine, min(settings.DB_POOL_MIN_SIZE, settings.DB_POOL_SIZE))
+            pool = SharedPool(engine)
             logging.info(
-                "PostgreSQL connected to %s:%s/%s",
+                "PostgreSQL connected to %s:%s/%s (pool_size=%s, max_overflow=%s, warmed=%s)",
                 connect_kwargs["host"],
                 connect_kwargs["port"],
                 connect_kwargs["database"],
+                settings.DB_POOL_SIZE,
+                settings.DB_POOL_MAX_OVERFLOW,
+                warmed,
             )
             print(
                 f"PostgreSQL connected to {connect_kwargs['host']}:"
@@ -82,10 +73,9 @@ async def connect_postgresql(*, retries: int = 5, delay_seconds: float = 2.0):
 
 
 async def close_postgresql():
-    """Close the PostgreSQL connection pool."""
+    """Drop the shared pool facade; the engine is disposed by ``close_sqlalchemy``."""
     global pool
     if pool is not None:
-        await pool.close()
         pool = None
         logging.info("PostgreSQL connection pool closed")
 
@@ -0,0 +1,159 @@
+"""Registry of the SQL constants in ``app.queries`` with per-query statistics.
+
+Every ``*_QUERY`` string in ``app/queries/*.py`` is registered under a
+``module.CONSTANT`` name. When the shared pool opens a connection it:
+
+* attaches an asyncpg query logger that attributes each execution back to its
+  registered name, feeding call counts and latency for ``/health-check/queries``;
+* prepares the statements of the hot modules (``DB_PREPARE_QUERY_MODULES``)
+  into the connection's statement cache, so the first request on a fresh
+  connection skips parse/plan as well.
+
+Services keep calling ``conn.fetch(SOME_QUERY, ...)`` unchanged; asyncpg looks
+the prepared statement up by its SQL text.
+"""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import logging
+import pkgutil
+from typing import Any
+
+from asyncpg.connection import Connection
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.util import await_only
+
+logger = logging.getLogger(__name__)
+
+QUERIES_PACKAGE = "app.queries"
+
+
+class QueryStats:
+    __slots__ = ("calls", "errors", "total_seconds", "max_seconds")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+class QueryRegistry:
+    def __init__(self) -> None:
+        self.queries: dict[str, str] = {}
+        self._names_by_sql: dict[str, str] = {}
+        self._stats: dict[str, QueryStats] = {}
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def register(self, name: str, sql: str) -> None:
+        self.queries[name] = sql
+        # Identical SQL under two constants is reported under the first name.
+        self._names_by_sql.setdefault(sql, name)
+
+    def load(self, package: str = QUERIES_PACKAGE) -> int:
+        """Import every module in ``package`` and register its ``*_QUERY`` constants."""
+        pkg = importlib.import_module(package)
+        for module_info in pkgutil.iter_modules(pkg.__path__):
+            module = importlib.import_module(f"{package}.{module_info.name}")
+            for attr, value in vars(module).items():
+                if attr.endswith("_QUERY") and isinstance(value, str):
+                    self.register(f"{module_info.name}.{attr}", value)
+        return len(self.queries)
+
+    def name_for(self, sql: str) -> str | None:
+        return self._names_by_sql.get(sql)
+
+    def select(self, modules: str) -> list[str]:
+        """SQL for the comma-separated ``modules`` (``*`` selects all)."""
+        wanted = {m.strip() for m in modules.split(",") if m.strip()}
+        if not wanted:
+            return []
+        return [
+            sql
+            for name, sql in self.queries.items()
+            if "*" in wanted or name.split(".", 1)[0] in wanted
+        ]
+
+    def record(self, logged_query) -> None:
+        """asyncpg query logger callback (receives a ``LoggedQuery``)."""
+        name = self._names_by_sql.get(logged_query.query)
+        if name is None:
+            return
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = QueryStats()
+        stats.calls += 1
+        stats.total_seconds += logged_query.elapsed
+        stats.max_seconds = max(stats.max_seconds, logged_query.elapsed)
+        if logged_query.exception is not None:
+            stats.errors += 1
+
+    def stats(self, limit: int | None = None) -> dict[str, Any]:
+        """Per-query stats, most total time first."""
+        ranked = sorted(self._stats.items(), key=lambda item: item[1].total_seconds, reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return {
+            "registered": len(self.queries),
+            "queries": {name: stats.stats() for name, stats in ranked},
+        }
+
+    def reset_stats(self) -> None:
+        self._stats.clear()
+
+
+registry = QueryRegistry()
+
+# asyncpg has no public call that fills the statement cache conn.fetch(sql)
+# consults: prepare() returns a statement outside it, and a first fetch would
+# run the query. Connection._prepare(use_cache=True) does, so asyncpg is
+# pinned in requirements.txt and tests/test_db_pool.py fails if it changes.
+# Should it go anyway, prepare() still validates the SQL and loads its types.
+CACHED_PREPARE = "use_cache" in inspect.signature(getattr(Connection, "_prepare", Connection.prepare)).parameters
+
+
+async def prepare_cached(conn, sql: str) -> None:
+    """Prepare ``sql`` into ``conn``'s statement cache."""
+    if CACHED_PREPARE:
+        await conn._prepare(sql, use_cache=True)
+    else:
+        await conn.prepare(sql)
+
+
+def install_query_registry(engine: AsyncEngine, *, prepare_modules: str) -> None:
+    """Load the registry and hook it into every new pool connection.
+
+    Must be installed after ``install_json_codecs``: changing a type codec
+    drops the connection's statement cache.
+    """
+    if not registry.queries:
+        registry.load()
+    prepared = registry.select(prepare_modules)
+
+    def on_connect(dbapi_connection, connection_record) -> None:
+        conn = dbapi_connection.driver_connection
+        conn.add_query_logger(registry.record)
+        for sql in prepared:
+            try:
+                await_only(prepare_cached(conn, sql))
+            except Exception as exc:
+                logger.warning(
+                    "Could not prepare %s: %s", registry.name_for(sql), exc
+                )
+
+    event.listen(engine.sync_engine, "connect", on_connect)
@@ -0,0 +1,75 @@
+"""Startup readiness of the shared database pool.
+
+The app starts serving (and answers ``/health``) before the pool is up, so a
+cold start is not held back by the database handshake. ``Readiness`` tracks
+the background init task: ``/ready`` reports it, and the request gate in
+``main`` awaits it for up to ``READINESS_GATE_TIMEOUT_SECONDS`` instead of
+letting early requests fail on a missing pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable
+from typing import Any
+
+STARTING = "starting"
+READY = "ready"
+FAILED = "failed"
+
+
+class Readiness:
+    def __init__(self) -> None:
+        self.state = STARTING
+        self.error: str | None = None
+        self.started_at = time.monotonic()
+        self.ready_after_ms: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def start(self, init: Awaitable[Any]) -> asyncio.Task:
+        """Run ``init`` in the background; the pool is ready when it returns."""
+
+        async def run() -> None:
+            try:
+                await init
+            except Exception as exc:
+                self.mark_failed(exc)
+            else:
+                if self.state == STARTING:
+                    self.mark_ready()
+
+        self._task = asyncio.create_task(run())
+        return self._task
+
+    def mark_ready(self) -> None:
+        self.state = READY
+        self.error = None
+        self.ready_after_ms = round((time.monotonic() - self.started_at) * 1000, 2)
+
+    def mark_failed(self, error: BaseException | str) -> None:
+        self.state = FAILED
+        self.error = str(error)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for startup to finish; True when ready."""
+        task = self._task
+        if self.state == STARTING and task is not None and not task.done() and timeout > 0:
+            # asyncio.wait never cancels the init task when the timeout expires.
+            await asyncio.wait({task}, timeout=timeout)
+        return self.ready
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "error": self.error,
+            "ready_after_ms": self.ready_after_ms,
+        }
@@ -1,33 +1,74 @@
 import ssl
+import uuid
 from collections.abc import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
+from app.db.pool import install_idle_timeout, install_json_codecs, metrics
+from app.db.query_registry import install_query_registry
 
 _engine = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
 def _build_connect_args() -> dict:
+    connect_args = {
+        "timeout": settings.DB_CONNECT_TIMEOUT_SECONDS,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT_SECONDS,
+    }
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        # A transaction pooler may run each statement on a different server
+        # connection, so named prepared statements cannot be reused.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = _unique_statement_name
+    else:
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
     if settings.POSTGRESQL_SSL_MODE in ("require", "prefer"):
         ctx = ssl.create_default_context()
         if not settings.POSTGRESQL_SSL_REJECT_UNAUTHORIZED:
             ctx.check_hostname = False
             ctx.verify_mode = ssl.CERT_NONE
-        return {"ssl": ctx}
-    return {}
+        connect_args["ssl"] = ctx
+    return connect_args
 
 
 def get_engine():
+    """Return the process-wide engine; its pool also backs ``app.state.db``."""
     global _engine
     if _engine is None:
         _engine = create_async_engine(
             settings.get_sqlalchemy_async_url(),
             connect_args=_build_connect_args(),
-            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            # Liveness is covered by the periodic health check and idle lifetime
+            # below instead of a round trip on every checkout.
+            pool_pre_ping=False,
             echo=False,
         )
+        install_json_codecs(_engine)
+        install_query_registry(
+            _engine,
+            prepare_modules=""
+            if settings.DB_PGBOUNCER_TRANSACTION_MODE
+            else settings.DB_PREPARE_QUERY_MODULES,
+        )
+        install_idle_timeout(_engine, settings.DB_POOL_MAX_INACTIVE_SECONDS)
+        metrics.instrument(_engine)
+    return _engine
+
+
+def peek_engine():
+    """Return the engine if it has been created, without creating it."""
     return _engine
 
 
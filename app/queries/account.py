@@ -6,6 +6,12 @@ GET_ACCOUNT_BY_ID_QUERY = """
 SELECT * FROM accounts WHERE id = $1
 """
 
+# Read inside the update's transaction: the rollup delta subtracts exactly
+# the values this transaction replaces, even with concurrent updates.
+GET_ACCOUNT_FOR_UPDATE_QUERY = """
+SELECT * FROM accounts WHERE id = $1 FOR UPDATE
+"""
+
 GET_ACCOUNTS_BY_ORGANIZATION_QUERY = """
 SELECT * FROM accounts WHERE organization_id = $1
 """
@@ -25,5 +31,111 @@ RETURNING *
 
 DELETE_ACCOUNT_QUERY = """
 DELETE FROM accounts WHERE id = $1
+RETURNING organization_id, date, payment_type, paid_in, paid_out
 """
 
+# Monthly rollups (account_monthly_rollups): one row per organization, UTC
+# month and payment type ('' when unset). Writes to accounts apply their delta
+# in the same transaction ($6 is +1 for the new row, -1 for the old one).
+APPLY_ACCOUNT_ROLLUP_QUERY = """
+INSERT INTO account_monthly_rollups (organization_id, month, payment_type, paid_in, paid_out, entry_count)
+VALUES (
+    $1,
+    date_trunc('month', $2::TIMESTAMPTZ AT TIME ZONE 'UTC')::DATE,
+    COALESCE($3, ''),
+    $6 * COALESCE($4::NUMERIC, 0),
+    $6 * COALESCE($5::NUMERIC, 0),
+    $6
+)
+ON CONFLICT (organization_id, month, payment_type) DO UPDATE SET
+    paid_in = account_monthly_rollups.paid_in + EXCLUDED.paid_in,
+    paid_out = account_monthly_rollups.paid_out + EXCLUDED.paid_out,
+    entry_count = account_monthly_rollups.entry_count + EXCLUDED.entry_count,
+    updated_at = NOW()
+"""
+
+# One row per month up to $2 (NULL = all), with the closing balance carried
+# across months by a window over the rollups.
+GET_ACCOUNT_LEDGER_QUERY = """
+SELECT
+    month,
+    SUM(paid_in) AS paid_in,
+    SUM(paid_out) AS paid_out,
+    SUM(entry_count)::INT AS entry_count,
+    array_agg(payment_type ORDER BY payment_type) AS payment_types,
+    array_agg(entry_count ORDER BY payment_type) AS payment_type_counts,
+    SUM(SUM(paid_in - paid_out)) OVER (ORDER BY month) AS closing
+FROM account_monthly_rollups
+WHERE organization_id = $1
+    AND ($2::DATE IS NULL OR month <= $2::DATE)
+GROUP BY month
+HAVING SUM(entry_count) > 0
+ORDER BY month
+"""
+
+# Balance at the end of a day: whole months from the rollups plus the
+# entries of the as-of month itself ($2 month start, $3 exclusive end).
+GET_ACCOUNT_BALANCE_AS_OF_QUERY = """
+SELECT
+    (
+        SELECT COALESCE(SUM(paid_in - paid_out), 0)
+        FROM account_monthly_rollups
+        WHERE organization_id = $1 AND month < $2::DATE
+    ) + (
+        SELECT COALESCE(SUM(COALESCE(paid_in, 0) - COALESCE(paid_out, 0)), 0)
+        FROM accounts
+        WHERE organization_id = $1
+            AND date >= ($2::DATE::TIMESTAMP AT TIME ZONE 'UTC')
+            AND date < $3::TIMESTAMPTZ
+    ) AS balance
+"""
+
+GET_ACCOUNTS_BY_IDS_QUERY = """
+SELECT * FROM accounts WHERE id = ANY($1::UUID[])
+"""
+
+# Bulk import counterpart of APPLY_ACCOUNT_ROLLUP_QUERY for freshly copied rows.
+APPLY_ACCOUNT_ROLLUPS_FOR_IDS_QUERY = """
+INSERT INTO account_monthly_rollups (organization_id, month, payment_type, paid_in, paid_out, entry_count)
+SELECT
+    organization_id,
+    date_trunc('month', date AT TIME ZONE 'UTC')::DATE,
+    COALESCE(payment_type, ''),
+    SUM(COALESCE(paid_in, 0)),
+    SUM(COALESCE(paid_out, 0)),
+    COUNT(*)
+FROM accounts
+WHERE id = ANY($1::UUID[])
+GROUP BY 1, 2, 3
+ON CONFLICT (organization_id, month, payment_type) DO UPDATE SET
+    paid_in = account_monthly_rollups.paid_in + EXCLUDED.paid_in,
+    paid_out = account_monthly_rollups.paid_out + EXCLUDED.paid_out,
+    entry_count = account_monthly_rollups.entry_count + EXCLUDED.entry_count,
+    updated_at = NOW()
+"""
+
+# Rebuild of the rollups from accounts ($1 organization, NULL = all), for
+# repairing drift. Run after LOCK_ACCOUNT_ROLLUPS_QUERY in one transaction so
+# concurrent writes apply their deltas on top of the rebuilt totals.
+LOCK_ACCOUNT_ROLLUPS_QUERY = """
+LOCK TABLE account_monthly_rollups IN SHARE ROW EXCLUSIVE MODE
+"""
+
+DELETE_ACCOUNT_ROLLUPS_QUERY = """
+DELETE FROM account_monthly_rollups
+WHERE $1::UUID IS NULL OR organization_id = $1::UUID
+"""
+
+REBUILD_ACCOUNT_ROLLUPS_QUERY = """
+INSERT INTO account_monthly_rollups (organization_id, month, payment_type, paid_in, paid_out, entry_count)
+SELECT
+    organization_id,
+    date_trunc('month', date AT TIME ZONE 'UTC')::DATE,
+    COALESCE(payment_type, ''),
+    SUM(COALESCE(paid_in, 0)),
+    SUM(COALESCE(paid_out, 0)),
+    COUNT(*)
+FROM accounts
+WHERE $1::UUID IS NULL OR organization_id = $1::UUID
+GROUP BY 1, 2, 3
+"""
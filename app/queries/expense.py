@@ -64,3 +64,48 @@ DELETE_EXPENSE_QUERY = """
 DELETE FROM expenses 
 WHERE id = $1 AND organization_id = $2
 """
+
+# Grouped totals for the finance dashboard. Dimensions that are not requested
+# collapse to NULL ($2 period unit or NULL, $5 by category, $6 by team), so one
+# prepared statement serves every grouping. running_total accumulates over
+# periods within each category/team group.
+EXPENSE_SUMMARY_QUERY = """
+SELECT
+    period,
+    category,
+    team_id,
+    total,
+    expense_count,
+    SUM(total) OVER (
+        PARTITION BY category, team_id
+        ORDER BY period
+        ROWS UNBOUNDED PRECEDING
+    ) AS running_total
+FROM (
+    SELECT
+        CASE WHEN $2::TEXT IS NULL THEN NULL
+             ELSE date_trunc($2::TEXT, expense_date)::DATE END AS period,
+        CASE WHEN $5::BOOLEAN THEN category END AS category,
+        CASE WHEN $6::BOOLEAN THEN team_id END AS team_id,
+        SUM(amount) AS total,
+        COUNT(*) AS expense_count
+    FROM expenses
+    WHERE organization_id = $1
+        AND ($3::DATE IS NULL OR expense_date >= $3::DATE)
+        AND ($4::DATE IS NULL OR expense_date <= $4::DATE)
+        AND ($7::UUID IS NULL OR team_id = $7::UUID)
+    GROUP BY 1, 2, 3
+) AS grouped
+ORDER BY period NULLS FIRST, category NULLS FIRST, team_id NULLS FIRST
+"""
+
+# Bulk import: ids are drawn up front so rows can be COPYed with their id
+# and read back afterwards.
+ALLOCATE_EXPENSE_IDS_QUERY = """
+SELECT nextval(pg_get_serial_sequence('expenses', 'id')) AS id
+FROM generate_series(1, $1::INT)
+"""
+
+GET_EXPENSES_BY_IDS_QUERY = """
+SELECT * FROM expenses WHERE id = ANY($1::INT[])
+"""
@@ -0,0 +1,76 @@
+# One array per column; ids are generated by the caller so they can be
+# returned in input order. $7 is the batch id shared by all rows (or NULL).
+ENQUEUE_MAIL_QUERY = """
+INSERT INTO mail_outbox (id, organization_id, to_email, subject, body, html, batch_id)
+SELECT id, organization_id, to_email, subject, body, html, $7::UUID
+FROM unnest($1::UUID[], $2::UUID[], $3::TEXT[], $4::TEXT[], $5::TEXT[], $6::BOOLEAN[])
+    AS m(id, organization_id, to_email, subject, body, html)
+"""
+
+# Rows left in 'sending' by a worker that died are reclaimed once their lease
+# ($1 seconds) has run out, but only while attempts remain ($2 = max attempts);
+# after that they are failed, so a message that kills workers stops coming back.
+FAIL_EXHAUSTED_MAIL_LEASES_QUERY = """
+UPDATE mail_outbox
+SET status = 'failed',
+    last_error = COALESCE(last_error, 'lease expired after ' || attempts || ' attempts'),
+    updated_at = NOW()
+WHERE status = 'sending'
+  AND updated_at < NOW() - make_interval(secs => $1)
+  AND attempts >= $2
+"""
+
+# Claims due messages for this worker, including expired leases with
+# attempts left ($3 = max attempts).
+CLAIM_MAIL_BATCH_QUERY = """
+WITH due AS (
+    SELECT id FROM mail_outbox
+    WHERE (status = 'queued' AND next_attempt_at <= NOW())
+       OR (status = 'sending' AND updated_at < NOW() - make_interval(secs => $2) AND attempts < $3)
+    ORDER BY next_attempt_at
+    LIMIT $1
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE mail_outbox m
+SET status = 'sending', attempts = m.attempts + 1, updated_at = NOW()
+FROM due
+WHERE m.id = due.id
+RETURNING m.id, m.to_email, m.subject, m.body, m.html, m.attempts
+"""
+
+# Heartbeat while a batch is sending, so rows that outlast the lease are not
+# reclaimed (and sent twice) by another worker.
+RENEW_MAIL_LEASES_QUERY = """
+UPDATE mail_outbox
+SET updated_at = NOW()
+WHERE id = ANY($1::UUID[]) AND status = 'sending'
+"""
+
+MARK_MAIL_SENT_QUERY = """
+UPDATE mail_outbox
+SET status = 'sent', sent_at = NOW(), last_error = NULL, updated_at = NOW()
+WHERE id = ANY($1::UUID[])
+"""
+
+# $2 is the retry delay in seconds; NULL marks the message as failed for good.
+MARK_MAIL_RETRY_QUERY = """
+UPDATE mail_outbox
+SET status = CASE WHEN $2::FLOAT8 IS NULL THEN 'failed' ELSE 'queued' END,
+    next_attempt_at = NOW() + make_interval(secs => COALESCE($2::FLOAT8, 0)),
+    last_error = $3,
+    updated_at = NOW()
+WHERE id = $1
+"""
+
+GET_MAIL_STATUS_QUERY = """
+SELECT id, to_email, subject, status, attempts, last_error, next_attempt_at, created_at, sent_at
+FROM mail_outbox
+WHERE id = $1
+"""
+
+GET_MAIL_BATCH_STATUS_QUERY = """
+SELECT id, to_email, status, attempts, last_error, sent_at
+FROM mail_outbox
+WHERE batch_id = $1
+ORDER BY created_at, to_email
+"""
@@ -6,6 +6,7 @@ GET_MAIL_TEMPLATE_BY_ID_QUERY = """
 SELECT * FROM mail_templates WHERE id = $1
 """
 
+# The global template (organization_id IS NULL) and every organization's override.
 GET_MAIL_TEMPLATE_BY_KEY_QUERY = """
 SELECT * FROM mail_templates WHERE key = $1
 """
@@ -8,10 +8,18 @@ SELECT * FROM organizations WHERE id = $1
 
 GET_ORGANIZATION_BY_EMAIL_QUERY = """
 SELECT * FROM organizations WHERE contact->>'email' = $1
+LIMIT 1
 """
 
 GET_ORGANIZATION_BY_SUPABASE_USER_ID_QUERY = """
 SELECT * FROM organizations WHERE additional_information->>'supabase_user_id' = $1
+LIMIT 1
+"""
+
+# Served by idx_organizations_supabase_user_id; the predicate must match the index expression.
+GET_ORGANIZATION_ID_BY_SUPABASE_USER_ID_QUERY = """
+SELECT id FROM organizations WHERE additional_information->>'supabase_user_id' = $1
+LIMIT 1
 """
 
 INSERT_ORGANIZATION_QUERY = """
@@ -28,12 +28,29 @@ VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW(), NOW())
 RETURNING *
 """
 
+# Array-per-column bulk writes; see app.db.bulk.save_by_id.
 INSERT_BULK_PERMISSIONS_QUERY = """
-INSERT INTO permissions (organization_id, role_id, module_id, team_id, view, edit, "create", "delete", created_at, updated_at)
-VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW(), NOW())
+INSERT INTO permissions (id, organization_id, role_id, module_id, team_id, view, edit, "create", "delete", created_at, updated_at)
+SELECT p.id, p.organization_id, p.role_id, p.module_id, p.team_id, p.view, p.edit, p."create", p."delete", NOW(), NOW()
+FROM unnest(
+    $1::UUID[], $2::UUID[], $3::UUID[], $4::UUID[], $5::UUID[],
+    $6::BOOLEAN[], $7::BOOLEAN[], $8::BOOLEAN[], $9::BOOLEAN[]
+) AS p(id, organization_id, role_id, module_id, team_id, view, edit, "create", "delete")
 RETURNING *
 """
 
+UPDATE_BULK_PERMISSIONS_QUERY = """
+UPDATE permissions
+SET organization_id = u.organization_id, role_id = u.role_id, module_id = u.module_id, team_id = u.team_id,
+    view = u.view, edit = u.edit, "create" = u."create", "delete" = u."delete", updated_at = NOW()
+FROM unnest(
+    $1::UUID[], $2::UUID[], $3::UUID[], $4::UUID[], $5::UUID[],
+    $6::BOOLEAN[], $7::BOOLEAN[], $8::BOOLEAN[], $9::BOOLEAN[]
+) AS u(id, organization_id, role_id, module_id, team_id, view, edit, "create", "delete")
+WHERE permissions.id = u.id
+RETURNING permissions.*
+"""
+
 UPDATE_PERMISSION_QUERY = """
 UPDATE permissions
 SET organization_id = $1, role_id = $2, module_id = $3, team_id = $4, view = $5, edit = $6, "create" = $7, "delete" = $8, updated_at = NOW()
@@ -45,3 +62,24 @@ DELETE_PERMISSION_QUERY = """
 DELETE FROM permissions WHERE id = $1
 """
 
+
+# Everything that decides what one user may do in one organization: their role
+# assignments joined to each role's module/team permission flags. A permission
+# without a team applies to the team the role was assigned for, if any.
+GET_EFFECTIVE_PERMISSIONS_QUERY = """
+SELECT
+    r.name AS role_name,
+    r.type AS role_type,
+    p.module_id,
+    m.name AS module_name,
+    COALESCE(p.team_id, ur.team_id) AS team_id,
+    p.view,
+    p.edit,
+    p."create",
+    p."delete"
+FROM user_roles ur
+JOIN roles r ON r.id = ur.role_id
+LEFT JOIN permissions p ON p.role_id = ur.role_id AND p.organization_id = ur.organization_id
+LEFT JOIN modules m ON m.id = p.module_id
+WHERE ur.organization_id = $1 AND ur.user_id = $2::UUID
+"""
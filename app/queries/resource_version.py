@@ -0,0 +1,7 @@
+# Counters are bumped by the triggers in create_resource_versions.sql; a
+# resource nobody has written to yet simply has no row.
+GET_RESOURCE_VERSIONS_QUERY = """
+SELECT COALESCE(string_agg(resource || ':' || version, ',' ORDER BY resource), '')
+FROM resource_versions
+WHERE organization_id = $1 AND resource = ANY($2::text[])
+"""
@@ -1,32 +1,76 @@
-GET_SONGS_QUERY = """
-SELECT * FROM songs
+# Explicit column list so the stored search_vector is not shipped with every row.
+SONG_COLUMNS = """
+id, title, artist, scale, tempo, chords, rhythm, lyrics, organization_id, created_at, updated_at
+""".strip()
+
+GET_SONGS_QUERY = f"""
+SELECT {SONG_COLUMNS} FROM songs
 ORDER BY created_at DESC
 """
 
-GET_SONG_BY_ID_QUERY = """
-SELECT * FROM songs WHERE id = $1
+GET_SONG_BY_ID_QUERY = f"""
+SELECT {SONG_COLUMNS} FROM songs WHERE id = $1
 """
 
-GET_SONGS_BY_ORGANIZATION_QUERY = """
-SELECT * FROM songs 
+GET_SONGS_BY_ORGANIZATION_QUERY = f"""
+SELECT {SONG_COLUMNS} FROM songs 
 WHERE organization_id = $1
 ORDER BY created_at DESC
 """
 
-SEARCH_SONGS_QUERY = """
-SELECT * FROM songs
+SEARCH_SONGS_QUERY = f"""
+SELECT {SONG_COLUMNS} FROM songs
 WHERE organization_id = $1
-    AND ($2::VARCHAR IS NULL OR LOWER(title) LIKE LOWER('%' || $2 || '%'))
-    AND ($3::VARCHAR IS NULL OR LOWER(artist) LIKE LOWER('%' || $3 || '%'))
-    AND ($4::VARCHAR IS NULL OR LOWER(scale) LIKE LOWER('%' || $4 || '%'))
-    AND ($5::VARCHAR IS NULL OR LOWER(tempo) LIKE LOWER('%' || $5 || '%'))
-    AND ($6::VARCHAR IS NULL OR LOWER(chords) LIKE LOWER('%' || $6 || '%'))
-    AND ($7::VARCHAR IS NULL OR LOWER(rhythm) LIKE LOWER('%' || $7 || '%'))
-    AND ($8::VARCHAR IS NULL OR LOWER(lyrics) LIKE LOWER('%' || $8 || '%'))
+    AND ($2::VARCHAR IS NULL OR title ILIKE '%' || $2 || '%')
+    AND ($3::VARCHAR IS NULL OR artist ILIKE '%' || $3 || '%')
+    AND ($4::VARCHAR IS NULL OR scale ILIKE '%' || $4 || '%')
+    AND ($5::VARCHAR IS NULL OR tempo ILIKE '%' || $5 || '%')
+    AND ($6::VARCHAR IS NULL OR chords ILIKE '%' || $6 || '%')
+    AND ($7::VARCHAR IS NULL OR rhythm ILIKE '%' || $7 || '%')
+    AND ($8::VARCHAR IS NULL OR lyrics ILIKE '%' || $8 || '%')
 ORDER BY created_at DESC
 """
 
-INSERT_SONG_QUERY = """
+# Ranked search over search_vector (title A, artist B, lyrics C) plus trigram
+# similarity on title/artist for typos. Headlines are computed only for the
+# page of results returned by the inner query.
+FULLTEXT_SEARCH_SONGS_QUERY = """
+SELECT
+    ranked.*,
+    ts_headline('simple', ranked.title, ranked.tsq,
+        'StartSel=<mark>, StopSel=</mark>, HighlightAll=true') AS title_highlight,
+    ts_headline('simple', coalesce(ranked.artist, ''), ranked.tsq,
+        'StartSel=<mark>, StopSel=</mark>, HighlightAll=true') AS artist_highlight,
+    ts_headline('simple', coalesce(ranked.lyrics, ''), ranked.tsq,
+        'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=12, MinWords=4') AS lyrics_highlight
+FROM (
+    SELECT
+        s.id, s.title, s.artist, s.scale, s.tempo, s.chords, s.rhythm, s.lyrics,
+        s.organization_id, s.created_at, s.updated_at,
+        q.tsq,
+        ts_rank_cd(s.search_vector, q.tsq) AS rank,
+        GREATEST(similarity(s.title, $2), similarity(coalesce(s.artist, ''), $2)) AS similarity
+    FROM songs s, websearch_to_tsquery('simple', $2) AS q(tsq)
+    WHERE s.organization_id = $1
+        AND (s.search_vector @@ q.tsq OR s.title % $2 OR s.artist % $2)
+    ORDER BY rank DESC, similarity DESC, s.id DESC
+    LIMIT $3
+) AS ranked
+ORDER BY ranked.rank DESC, ranked.similarity DESC, ranked.id DESC
+"""
+
+# $2 is a LIKE-escaped prefix; matches the start of the title, any word in
+# the title, or the start of the artist (all served by the trigram indexes).
+AUTOCOMPLETE_SONGS_QUERY = """
+SELECT id, title, artist
+FROM songs
+WHERE organization_id = $1
+    AND (title ILIKE $2 || '%' OR title ILIKE '% ' || $2 || '%' OR artist ILIKE $2 || '%')
+ORDER BY (title ILIKE $2 || '%') DESC, similarity(title, $2) DESC, title, id
+LIMIT $3
+"""
+
+INSERT_SONG_QUERY = f"""
 INSERT INTO songs (
     title,
     artist,
@@ -41,10 +85,10 @@ INSERT INTO songs (
 ) VALUES (
     $1, $2, $3, $4, $5, $6, $7, $8, NOW(), NOW()
 )
-RETURNING *
+RETURNING {SONG_COLUMNS}
 """
 
-UPDATE_SONG_QUERY = """
+UPDATE_SONG_QUERY = f"""
 UPDATE songs
 SET 
     title = $1,
@@ -56,7 +100,7 @@ SET
     lyrics = $7,
     updated_at = NOW()
 WHERE id = $8 AND organization_id = $9
-RETURNING *
+RETURNING {SONG_COLUMNS}
 """
 
 DELETE_SONG_QUERY = """
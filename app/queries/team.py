@@ -16,12 +16,22 @@ VALUES ($1, $2, $3, NOW(), NOW())
 RETURNING *
 """
 
+# Array-per-column bulk writes; see app.db.bulk.save_by_id.
 INSERT_BULK_TEAMS_QUERY = """
-INSERT INTO teams (name, description, organization_id, created_at, updated_at)
-VALUES ($1, $2, $3, NOW(), NOW())
+INSERT INTO teams (id, name, description, organization_id, created_at, updated_at)
+SELECT id, name, description, organization_id, NOW(), NOW()
+FROM unnest($1::UUID[], $2::TEXT[], $3::TEXT[], $4::UUID[]) AS t(id, name, description, organization_id)
 RETURNING *
 """
 
+UPDATE_BULK_TEAMS_QUERY = """
+UPDATE teams
+SET name = u.name, description = u.description, organization_id = u.organization_id, updated_at = NOW()
+FROM unnest($1::UUID[], $2::TEXT[], $3::TEXT[], $4::UUID[]) AS u(id, name, description, organization_id)
+WHERE teams.id = u.id
+RETURNING teams.*
+"""
+
 UPDATE_TEAM_QUERY = """
 UPDATE teams
 SET name = $1, description = $2, organization_id = $3, updated_at = NOW()
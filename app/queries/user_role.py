@@ -22,6 +22,12 @@ GET_USER_ROLES_BY_TEAM_QUERY = """
 SELECT * FROM user_roles WHERE team_id = $1
 """
 
+# Compares the uuid column directly so idx_user_roles_user_id can be used.
+GET_ORGANIZATION_ID_BY_USER_ID_QUERY = """
+SELECT organization_id FROM user_roles WHERE user_id = $1::uuid
+LIMIT 1
+"""
+
 GET_USER_ROLES_BY_USER_AND_ORGANIZATION_QUERY = """
 SELECT * FROM user_roles WHERE user_id = $1 AND organization_id = $2
 """
@@ -40,12 +46,22 @@ VALUES ($1, $2, $3, $4, NOW(), NOW())
 RETURNING *
 """
 
+# Array-per-column bulk writes; see app.db.bulk.save_by_id.
 INSERT_BULK_USER_ROLES_QUERY = """
-INSERT INTO user_roles (organization_id, user_id, role_id, team_id, created_at, updated_at)
-VALUES ($1, $2, $3, $4, NOW(), NOW())
+INSERT INTO user_roles (id, organization_id, user_id, role_id, team_id, created_at, updated_at)
+SELECT id, organization_id, user_id, role_id, team_id, NOW(), NOW()
+FROM unnest($1::UUID[], $2::UUID[], $3::UUID[], $4::UUID[], $5::UUID[]) AS r(id, organization_id, user_id, role_id, team_id)
 RETURNING *
 """
 
+UPDATE_BULK_USER_ROLES_QUERY = """
+UPDATE user_roles
+SET organization_id = u.organization_id, user_id = u.user_id, role_id = u.role_id, team_id = u.team_id, updated_at = NOW()
+FROM unnest($1::UUID[], $2::UUID[], $3::UUID[], $4::UUID[], $5::UUID[]) AS u(id, organization_id, user_id, role_id, team_id)
+WHERE user_roles.id = u.id
+RETURNING user_roles.*
+"""
+
 UPDATE_USER_ROLE_QUERY = """
 UPDATE user_roles
 SET organization_id = $1, user_id = $2, role_id = $3, team_id = $4, updated_at = NOW()
@@ -61,157 +77,72 @@ DELETE_USER_ROLE_BY_USER_AND_ROLE_QUERY = """
 DELETE FROM user_roles WHERE user_id = $1 AND role_id = $2
 """
 
-# Overview queries with role details joined
-GET_USER_ROLES_OVERVIEW_QUERY = """
-SELECT 
-    ur.id,
-    ur.organization_id,
-    ur.user_id,
-    ur.role_id,
-    ur.team_id,
-    ur.created_at,
-    ur.updated_at,
-    r.name as role_name,
-    r.description as role_description,
-    r.type as role_type,
-    r.permissions as role_permissions,
-    r.team_id as role_team_id,
-    r.organization_id as role_organization_id,
-    r.created_at as role_created_at,
-    r.updated_at as role_updated_at
-FROM user_roles ur
-LEFT JOIN roles r ON ur.role_id = r.id
-"""
-
-GET_USER_ROLE_OVERVIEW_BY_ID_QUERY = """
-SELECT 
-    ur.id,
-    ur.organization_id,
-    ur.user_id,
-    ur.role_id,
-    ur.team_id,
-    ur.created_at,
-    ur.updated_at,
-    r.name as role_name,
-    r.description as role_description,
-    r.type as role_type,
-    r.permissions as role_permissions,
-    r.team_id as role_team_id,
-    r.organization_id as role_organization_id,
-    r.created_at as role_created_at,
-    r.updated_at as role_updated_at
-FROM user_roles ur
-LEFT JOIN roles r ON ur.role_id = r.id
-WHERE ur.id = $1
-"""
-
-GET_USER_ROLES_OVERVIEW_BY_ORGANIZATION_QUERY = """
-SELECT 
-    ur.id,
-    ur.organization_id,
-    ur.user_id,
-    ur.role_id,
-    ur.team_id,
-    ur.created_at,
-    ur.updated_at,
-    r.name as role_name,
-    r.description as role_description,
-    r.type as role_type,
-    r.permissions as role_permissions,
-    r.team_id as role_team_id,
-    r.organization_id as role_organization_id,
-    r.created_at as role_created_at,
-    r.updated_at as role_updated_at
-FROM user_roles ur
-LEFT JOIN roles r ON ur.role_id = r.id
-WHERE ur.organization_id = $1
-"""
-
-GET_USER_ROLES_OVERVIEW_BY_USER_QUERY = """
-SELECT 
-    ur.id,
-    ur.organization_id,
-    ur.user_id,
-    ur.role_id,
-    ur.team_id,
-    ur.created_at,
-    ur.updated_at,
-    r.name as role_name,
-    r.description as role_description,
-    r.type as role_type,
-    r.permissions as role_permissions,
-    r.team_id as role_team_id,
-    r.organization_id as role_organization_id,
-    r.created_at as role_created_at,
-    r.updated_at as role_updated_at
-FROM user_roles ur
-LEFT JOIN roles r ON ur.role_id = r.id
-WHERE ur.user_id = $1
-"""
-
-GET_USER_ROLES_OVERVIEW_BY_USER_AND_ORGANIZATION_QUERY = """
-SELECT 
-    ur.id,
-    ur.organization_id,
-    ur.user_id,
-    ur.role_id,
-    ur.team_id,
-    ur.created_at,
-    ur.updated_at,
-    r.name as role_name,
-    r.description as role_description,
-    r.type as role_type,
-    r.permissions as role_permissions,
-    r.team_id as role_team_id,
-    r.organization_id as role_organization_id,
-    r.created_at as role_created_at,
-    r.updated_at as role_updated_at
-FROM user_roles ur
-LEFT JOIN roles r ON ur.role_id = r.id
-WHERE ur.user_id = $1 AND ur.organization_id = $2
-"""
-
-GET_USER_ROLES_OVERVIEW_BY_ROLE_QUERY = """
-SELECT 
-    ur.id,
-    ur.organization_id,
-    ur.user_id,
-    ur.role_id,
-    ur.team_id,
-    ur.created_at,
-    ur.updated_at,
-    r.name as role_name,
-    r.description as role_description,
-    r.type as role_type,
-    r.permissions as role_permissions,
-    r.team_id as role_team_id,
-    r.organization_id as role_organization_id,
-    r.created_at as role_created_at,
-    r.updated_at as role_updated_at
-FROM user_roles ur
-LEFT JOIN roles r ON ur.role_id = r.id
-WHERE ur.role_id = $1
-"""
-
-GET_USER_ROLES_OVERVIEW_BY_TEAM_QUERY = """
-SELECT 
-    ur.id,
-    ur.organization_id,
-    ur.user_id,
-    ur.role_id,
-    ur.team_id,
-    ur.created_at,
-    ur.updated_at,
-    r.name as role_name,
-    r.description as role_description,
-    r.type as role_type,
-    r.permissions as role_permissions,
-    r.team_id as role_team_id,
-    r.organization_id as role_organization_id,
-    r.created_at as role_created_at,
-    r.updated_at as role_updated_at
-FROM user_roles ur
-LEFT JOIN roles r ON ur.role_id = r.id
-WHERE ur.team_id = $1
+# Overviews read the user_role_overviews projection (user_roles with their
+# role's details copied in), which triggers keep in sync with both tables.
+USER_ROLE_OVERVIEW_COLUMNS = """
+    id,
+    organization_id,
+    user_id,
+    role_id,
+    team_id,
+    created_at,
+    updated_at,
+    role_name,
+    role_description,
+    role_type,
+    role_permissions,
+    role_team_id,
+    role_organization_id,
+    role_created_at,
+    role_updated_at
+"""
+
+GET_USER_ROLES_OVERVIEW_QUERY = f"""
+SELECT {USER_ROLE_OVERVIEW_COLUMNS}
+FROM user_role_overviews
+"""
+
+GET_USER_ROLE_OVERVIEW_BY_ID_QUERY = f"""
+SELECT {USER_ROLE_OVERVIEW_COLUMNS}
+FROM user_role_overviews
+WHERE id = $1
+"""
+
+GET_USER_ROLES_OVERVIEW_BY_ORGANIZATION_QUERY = f"""
+SELECT {USER_ROLE_OVERVIEW_COLUMNS}
+FROM user_role_overviews
+WHERE organization_id = $1
+"""
+
+GET_USER_ROLES_OVERVIEW_BY_USER_QUERY = f"""
+SELECT {USER_ROLE_OVERVIEW_COLUMNS}
+FROM user_role_overviews
+WHERE user_id = $1
+"""
+
+GET_USER_ROLES_OVERVIEW_BY_USER_AND_ORGANIZATION_QUERY = f"""
+SELECT {USER_ROLE_OVERVIEW_COLUMNS}
+FROM user_role_overviews
+WHERE user_id = $1 AND organization_id = $2
+"""
+
+GET_USER_ROLES_OVERVIEW_BY_ROLE_QUERY = f"""
+SELECT {USER_ROLE_OVERVIEW_COLUMNS}
+FROM user_role_overviews
+WHERE role_id = $1
+"""
+
+GET_USER_ROLES_OVERVIEW_BY_TEAM_QUERY = f"""
+SELECT {USER_ROLE_OVERVIEW_COLUMNS}
+FROM user_role_overviews
+WHERE team_id = $1
+"""
+
+# Bumped by the projection triggers on every change in the organization.
+GET_USER_ROLE_OVERVIEW_VERSION_QUERY = """
+SELECT COALESCE(
+    (SELECT version FROM user_role_overview_versions WHERE organization_id = $1),
+    0
+)
 """
 
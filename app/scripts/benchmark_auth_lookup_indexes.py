@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Compare auth lookup query plans with and without the 003 expression indexes.
+
+Builds TEMP copies of organizations/user_roles (nothing persistent is touched),
+fills them with synthetic tenants, and prints EXPLAIN ANALYZE for each lookup
+before and after indexing.
+
+Usage:
+    python -m app.scripts.benchmark_auth_lookup_indexes [--organizations 100000]
+
+Requires DATABASE_URL or POSTGRESQL_DB_* in .env (same as the rest of the app).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+import asyncpg
+
+from app.core.config import settings
+
+SETUP_SQL = """
+CREATE TEMP TABLE organizations (
+    id UUID PRIMARY KEY,
+    name TEXT NOT NULL,
+    contact JSONB DEFAULT '{}'::jsonb,
+    additional_information JSONB DEFAULT '{}'::jsonb
+) ON COMMIT PRESERVE ROWS;
+
+CREATE TEMP TABLE user_roles (
+    id UUID PRIMARY KEY,
+    organization_id UUID NOT NULL,
+    user_id UUID NOT NULL
+) ON COMMIT PRESERVE ROWS;
+
+INSERT INTO organizations (id, name, contact, additional_information)
+SELECT
+    gen_random_uuid(),
+    'Church ' || g,
+    jsonb_build_object('email', 'church' || g || '@example.com'),
+    jsonb_build_object('supabase_user_id', md5(g::text)::uuid::text)
+FROM generate_series(1, $1::int) AS g;
+
+INSERT INTO user_roles (id, organization_id, user_id)
+SELECT gen_random_uuid(), o.id, gen_random_uuid()
+FROM organizations o, generate_series(1, 3);
+
+ANALYZE organizations;
+ANALYZE user_roles;
+"""
+
+INDEX_SQL = """
+CREATE INDEX ON organizations ((additional_information->>'supabase_user_id'));
+CREATE INDEX ON organizations ((contact->>'email'));
+CREATE INDEX ON user_roles (user_id);
+ANALYZE organizations;
+ANALYZE user_roles;
+"""
+
+LOOKUPS = {
+    "organization by supabase_user_id": (
+        "SELECT id FROM organizations "
+        "WHERE additional_information->>'supabase_user_id' = $1 LIMIT 1"
+    ),
+    "organization by contact email": (
+        "SELECT * FROM organizations WHERE contact->>'email' = $1 LIMIT 1"
+    ),
+    "user_roles by user_id (old text cast)": (
+        "SELECT organization_id FROM user_roles WHERE user_id::text = $1 LIMIT 1"
+    ),
+    "user_roles by user_id (uuid)": (
+        "SELECT organization_id FROM user_roles WHERE user_id = $1::uuid LIMIT 1"
+    ),
+}
+
+
+async def _explain(conn, sql: str, arg) -> str:
+    rows = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS, TIMING) {sql}", arg)
+    return "\n".join(f"    {r[0]}" for r in rows)
+
+
+async def _report(conn, label: str, args: dict[str, object]) -> None:
+    print(f"\n=== {label} ===")
+    for name, sql in LOOKUPS.items():
+        print(f"\n-- {name}")
+        print(await _explain(conn, sql, args[name]))
+
+
+async def run(organizations: int) -> None:
+    if not settings.is_postgresql_configured():
+        raise SystemExit("DATABASE_URL / POSTGRESQL_DB_* is not configured")
+
+    kwargs = settings.get_asyncpg_connect_kwargs()
+    if settings.POSTGRESQL_SSL_MODE and settings.POSTGRESQL_SSL_MODE != "disable":
+        kwargs["ssl"] = settings.POSTGRESQL_SSL_MODE
+
+    conn = await asyncpg.connect(**kwargs)
+    try:
+        print(f"Seeding {organizations} temporary organizations ...")
+        # Temp tables shadow the real ones for this session only.
+        statements = [s for s in SETUP_SQL.split(";\n") if s.strip()]
+        for statement in statements:
+            if "$1" in statement:
+                await conn.execute(statement, organizations)
+            else:
+                await conn.execute(statement)
+
+        probe = organizations // 2
+        supabase_user_id = await conn.fetchval("SELECT md5($1::text)::uuid::text", str(probe))
+        user_id = await conn.fetchval("SELECT user_id FROM user_roles OFFSET $1 LIMIT 1", probe)
+        args = {
+            "organization by supabase_user_id": supabase_user_id,
+            "organization by contact email": f"church{probe}@example.com",
+            "user_roles by user_id (old text cast)": str(user_id),
+            "user_roles by user_id (uuid)": str(user_id),
+        }
+
+        await _report(conn, "before indexes", args)
+        await conn.execute(INDEX_SQL)
+        await _report(conn, "after indexes", args)
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark auth lookup indexes")
+    parser.add_argument("--organizations", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.organizations))
+
+
+if __name__ == "__main__":
+    main()
@@ -35,3 +35,18 @@ CREATE TRIGGER trigger_update_accounts_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_accounts_updated_at();
 
+
+-- Index for per-organization date ranges (ledger balance-as-of, listings)
+CREATE INDEX IF NOT EXISTS idx_accounts_org_date ON accounts(organization_id, date);
+
+-- Monthly ledger rollups, maintained by AccountService on every write
+CREATE TABLE IF NOT EXISTS account_monthly_rollups (
+    organization_id UUID NOT NULL,
+    month DATE NOT NULL,
+    payment_type VARCHAR(10) NOT NULL DEFAULT '',
+    paid_in DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    paid_out DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    entry_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (organization_id, month, payment_type)
+);
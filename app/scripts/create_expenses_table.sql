@@ -29,6 +29,7 @@ CREATE INDEX IF NOT EXISTS idx_expenses_team_id ON expenses(team_id);
 CREATE INDEX IF NOT EXISTS idx_expenses_expense_date ON expenses(expense_date);
 CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category);
 CREATE INDEX IF NOT EXISTS idx_expenses_created_at ON expenses(created_at);
+CREATE INDEX IF NOT EXISTS idx_expenses_org_expense_date ON expenses(organization_id, expense_date);
 
 -- Trigger to update updated_at
 CREATE OR REPLACE FUNCTION update_expenses_updated_at()
@@ -0,0 +1,39 @@
+-- =====================================================
+-- MAIL OUTBOX - durable queue of outbound e-mail
+-- =====================================================
+-- Requests insert rows here and get 202 with the row id; the mail worker
+-- (app/utils/mail_queue.py) claims due rows with SKIP LOCKED, sends them over
+-- pooled SMTP connections and marks them sent, or schedules a retry with
+-- backoff until MAIL_QUEUE_MAX_ATTEMPTS.
+-- status: queued -> sending -> sent | failed (sending -> queued on retry)
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS mail_outbox (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    organization_id UUID,
+    -- Set for bulk template sends; groups the recipients of one request.
+    batch_id UUID,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    html BOOLEAN NOT NULL DEFAULT FALSE,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    sent_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Only unfinished rows are ever scanned by the worker.
+CREATE INDEX IF NOT EXISTS idx_mail_outbox_due
+    ON mail_outbox (next_attempt_at)
+    WHERE status IN ('queued', 'sending');
+
+-- Columns added after the table was first created.
+ALTER TABLE mail_outbox ADD COLUMN IF NOT EXISTS batch_id UUID;
+
+CREATE INDEX IF NOT EXISTS idx_mail_outbox_batch_id
+    ON mail_outbox (batch_id)
+    WHERE batch_id IS NOT NULL;
@@ -1,16 +1,27 @@
 -- Create mail_templates table
 CREATE TABLE IF NOT EXISTS mail_templates (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    key VARCHAR(255) NOT NULL UNIQUE,
+    key VARCHAR(255) NOT NULL,
     subject TEXT NOT NULL,
     body TEXT NOT NULL,
+    -- NULL for the global template; set for an organization's override of it
+    organization_id UUID,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+ALTER TABLE mail_templates ADD COLUMN IF NOT EXISTS organization_id UUID;
+ALTER TABLE mail_templates DROP CONSTRAINT IF EXISTS mail_templates_key_key;
+
 -- Create index on key for faster lookups
 CREATE INDEX IF NOT EXISTS idx_mail_templates_key ON mail_templates(key);
 
+-- One global template per key, and at most one override per organization and key
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mail_templates_global_key
+    ON mail_templates(key) WHERE organization_id IS NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mail_templates_org_key
+    ON mail_templates(organization_id, key) WHERE organization_id IS NOT NULL;
+
 
 -- Create trigger to automatically update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_mail_templates_updated_at()
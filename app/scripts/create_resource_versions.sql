@@ -0,0 +1,130 @@
+-- =====================================================
+-- RESOURCE VERSIONS - per-organization change counters
+-- =====================================================
+-- One counter per (organization, resource), bumped once per statement that
+-- writes to the resource's tables. List endpoints build their ETag from it
+-- (app/api/conditional.py) and answer If-None-Match with 304 without
+-- running the list query. organization_id is text because songs use
+-- integer organization ids and everything else uses UUIDs.
+-- Run after the songs, teams, checklist and service rota tables exist.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS resource_versions (
+    organization_id TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (organization_id, resource)
+);
+
+CREATE OR REPLACE FUNCTION touch_resource_version(org TEXT, res TEXT)
+RETURNS VOID AS $$
+BEGIN
+    IF org IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO resource_versions (organization_id, resource) VALUES (org, res)
+    ON CONFLICT (organization_id, resource) DO UPDATE
+        SET version = resource_versions.version + 1, updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement triggers on tables with an organization_id column: each
+-- organization the statement wrote to is bumped once, however many rows it
+-- touched, so a bulk upsert costs one counter update per organization. The
+-- resource name is the trigger argument; the transition tables are named
+-- old_rows/new_rows by the triggers below.
+CREATE OR REPLACE FUNCTION bump_resource_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM touch_resource_version(o.org, TG_ARGV[0])
+        FROM (SELECT DISTINCT organization_id::text AS org FROM new_rows ORDER BY 1) AS o;
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM touch_resource_version(o.org, TG_ARGV[0])
+        FROM (
+            SELECT organization_id::text AS org FROM old_rows
+            UNION SELECT organization_id::text FROM new_rows
+            ORDER BY 1
+        ) AS o;
+    ELSE
+        PERFORM touch_resource_version(o.org, TG_ARGV[0])
+        FROM (SELECT DISTINCT organization_id::text AS org FROM old_rows ORDER BY 1) AS o;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- checklist_items has no organization_id; changes count against the
+-- owning templates' organizations.
+CREATE OR REPLACE FUNCTION bump_checklist_item_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM touch_resource_version(o.org, 'checklist_templates')
+        FROM (
+            SELECT DISTINCT t.organization_id::text AS org
+            FROM new_rows i JOIN checklist_templates t ON t.id = i.template_id
+            ORDER BY 1
+        ) AS o;
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM touch_resource_version(o.org, 'checklist_templates')
+        FROM (
+            SELECT t.organization_id::text AS org
+            FROM (SELECT template_id FROM old_rows UNION SELECT template_id FROM new_rows) AS i
+            JOIN checklist_templates t ON t.id = i.template_id
+            GROUP BY 1
+            ORDER BY 1
+        ) AS o;
+    ELSE
+        PERFORM touch_resource_version(o.org, 'checklist_templates')
+        FROM (
+            SELECT DISTINCT t.organization_id::text AS org
+            FROM old_rows i JOIN checklist_templates t ON t.id = i.template_id
+            ORDER BY 1
+        ) AS o;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Postgres allows transition tables only on single-event triggers, so each
+-- table gets one trigger per event. trigger_resource_version is the row
+-- trigger earlier versions of this script created.
+DO $$
+DECLARE
+    target RECORD;
+BEGIN
+    FOR target IN
+        SELECT * FROM (VALUES
+            ('songs', 'bump_resource_version(''songs'')'),
+            ('teams', 'bump_resource_version(''teams'')'),
+            ('checklist_templates', 'bump_resource_version(''checklist_templates'')'),
+            ('checklist_items', 'bump_checklist_item_version()'),
+            ('rota_services', 'bump_resource_version(''rota_services'')'),
+            ('rota_availability', 'bump_resource_version(''rota_availability'')'),
+            ('rota_assignments', 'bump_resource_version(''rota_assignments'')')
+        ) AS t(tbl, fn)
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trigger_resource_version ON %I', target.tbl);
+        EXECUTE format('DROP TRIGGER IF EXISTS trigger_resource_version_insert ON %I', target.tbl);
+        EXECUTE format('DROP TRIGGER IF EXISTS trigger_resource_version_update ON %I', target.tbl);
+        EXECUTE format('DROP TRIGGER IF EXISTS trigger_resource_version_delete ON %I', target.tbl);
+        EXECUTE format(
+            'CREATE TRIGGER trigger_resource_version_insert AFTER INSERT ON %I '
+            'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION %s',
+            target.tbl, target.fn
+        );
+        EXECUTE format(
+            'CREATE TRIGGER trigger_resource_version_update AFTER UPDATE ON %I '
+            'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION %s',
+            target.tbl, target.fn
+        );
+        EXECUTE format(
+            'CREATE TRIGGER trigger_resource_version_delete AFTER DELETE ON %I '
+            'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION %s',
+            target.tbl, target.fn
+        );
+    END LOOP;
+END;
+$$;
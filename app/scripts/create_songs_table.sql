@@ -4,6 +4,8 @@
 -- This table stores worship songs with lyrics, chords, and metadata
 -- =====================================================
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE IF NOT EXISTS songs (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
@@ -14,6 +16,11 @@ CREATE TABLE IF NOT EXISTS songs (
     rhythm VARCHAR(50),
     lyrics TEXT,
     organization_id INTEGER NOT NULL,
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(artist, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(lyrics, '')), 'C')
+    ) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
@@ -27,6 +34,9 @@ CREATE INDEX IF NOT EXISTS idx_songs_organization_id ON songs(organization_id);
 CREATE INDEX IF NOT EXISTS idx_songs_title ON songs(title);
 CREATE INDEX IF NOT EXISTS idx_songs_artist ON songs(artist);
 CREATE INDEX IF NOT EXISTS idx_songs_created_at ON songs(created_at);
+CREATE INDEX IF NOT EXISTS idx_songs_search_vector ON songs USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_songs_title_trgm ON songs USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_songs_artist_trgm ON songs USING GIN (artist gin_trgm_ops);
 
 -- Trigger to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_songs_updated_at()
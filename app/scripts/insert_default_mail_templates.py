@@ -23,7 +23,7 @@ async def insert_default_templates():
         welcome_result = await conn.execute("""
             INSERT INTO mail_templates (key, subject, body, created_at, updated_at)
             VALUES ($1, $2, $3, NOW(), NOW())
-            ON CONFLICT (key) DO UPDATE SET
+            ON CONFLICT (key) WHERE organization_id IS NULL DO UPDATE SET
                 subject = EXCLUDED.subject,
                 body = EXCLUDED.body,
                 updated_at = NOW()
@@ -38,7 +38,7 @@ async def insert_default_templates():
         forgot_password_result = await conn.execute("""
             INSERT INTO mail_templates (key, subject, body, created_at, updated_at)
             VALUES ($1, $2, $3, NOW(), NOW())
-            ON CONFLICT (key) DO UPDATE SET
+            ON CONFLICT (key) WHERE organization_id IS NULL DO UPDATE SET
                 subject = EXCLUDED.subject,
                 body = EXCLUDED.body,
                 updated_at = NOW()
@@ -53,7 +53,7 @@ async def insert_default_templates():
         user_created_result = await conn.execute("""
             INSERT INTO mail_templates (key, subject, body, created_at, updated_at)
             VALUES ($1, $2, $3, NOW(), NOW())
-            ON CONFLICT (key) DO UPDATE SET
+            ON CONFLICT (key) WHERE organization_id IS NULL DO UPDATE SET
                 subject = EXCLUDED.subject,
                 body = EXCLUDED.body,
                 updated_at = NOW()
@@ -9,7 +9,7 @@ VALUES (
     NOW(),
     NOW()
 )
-ON CONFLICT (key) DO NOTHING;
+ON CONFLICT (key) WHERE organization_id IS NULL DO NOTHING;
 
 -- Forgot password email template
 INSERT INTO mail_templates (key, subject, body, created_at, updated_at)
@@ -20,7 +20,7 @@ VALUES (
     NOW(),
     NOW()
 )
-ON CONFLICT (key) DO NOTHING;
+ON CONFLICT (key) WHERE organization_id IS NULL DO NOTHING;
 
 -- User created by organization email template
 INSERT INTO mail_templates (key, subject, body, created_at, updated_at)
@@ -31,5 +31,5 @@ VALUES (
     NOW(),
     NOW()
 )
-ON CONFLICT (key) DO NOTHING;
+ON CONFLICT (key) WHERE organization_id IS NULL DO NOTHING;
 
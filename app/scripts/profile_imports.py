@@ -0,0 +1,101 @@
+"""Report worker import cost per module group, from ``python -X importtime``.
+
+Runs ``import main`` in a fresh interpreter and sums the self time of every
+imported module by group (third-party packages by top-level name, app code
+by package, e.g. ``app.api.services``). With ``--groups`` each lazy route
+group is then imported in turn and its first-hit cost reported on its own.
+
+Usage (from the repository root):
+    python -m app.scripts.profile_imports
+    python -m app.scripts.profile_imports --groups
+    python -m app.scripts.profile_imports --eager --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SECTION_MARKER = "#section "
+
+CHILD = f"""
+import sys
+import main
+if {{groups}}:
+    from app.api.routers import ROUTER_GROUPS
+    for group in ROUTER_GROUPS:
+        sys.stderr.write("{SECTION_MARKER}" + group.prefix + "\\n")
+        group.load()
+"""
+
+
+def module_group(name: str) -> str:
+    parts = name.split(".")
+    if parts[0] != "app":
+        return parts[0]
+    return ".".join(parts[:3] if parts[:2] == ["app", "api"] else parts[:2])
+
+
+def run_importtime(groups: bool, eager: bool) -> str:
+    env = dict(os.environ, ROUTERS_LAZY="false" if eager else "true")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(groups=groups)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    return result.stderr
+
+
+def parse(output: str) -> dict[str, list[tuple[str, int]]]:
+    """(module, self µs) per section; the first section is ``startup``."""
+    sections: dict[str, list[tuple[str, int]]] = {"startup": []}
+    current = sections["startup"]
+    for line in output.splitlines():
+        if line.startswith(SECTION_MARKER):
+            current = sections.setdefault(line[len(SECTION_MARKER):], [])
+            continue
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        current.append((name.strip(), int(self_us)))
+    return sections
+
+
+def report(title: str, modules: list[tuple[str, int]], top: int) -> None:
+    totals: dict[str, int] = defaultdict(int)
+    counts: dict[str, int] = defaultdict(int)
+    for name, self_us in modules:
+        group = module_group(name)
+        totals[group] += self_us
+        counts[group] += 1
+    total = sum(totals.values())
+    print(f"\n{title}: {total / 1000:.1f} ms, {len(modules)} modules")
+    if not total:
+        return
+    print(f"  {'group':<36}{'modules':>8}{'ms':>10}{'%':>7}")
+    for group, self_us in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {group:<36}{counts[group]:>8}{self_us / 1000:>10.1f}{100 * self_us / total:>7.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", action="store_true", help="also report each route group's first-hit import cost")
+    parser.add_argument("--eager", action="store_true", help="profile with ROUTERS_LAZY=false")
+    parser.add_argument("--top", type=int, default=25, help="module groups to list per section")
+    args = parser.parse_args()
+
+    sections = parse(run_importtime(args.groups, args.eager))
+    report("startup (import main)", sections.pop("startup"), args.top)
+    for prefix, modules in sections.items():
+        report(f"route group {prefix}", modules, args.top)
+
+
+if __name__ == "__main__":
+    main()
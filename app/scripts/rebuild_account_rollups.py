@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Rebuild account_monthly_rollups from accounts.
+
+Account writes maintain the monthly rollups incrementally; this recomputes
+them from the accounts table for one organization (or all) and replaces the
+stored rows. Concurrent account writes wait for the rebuild and then apply
+their deltas on top of it.
+
+Usage:
+    python -m app.scripts.rebuild_account_rollups [--organization-id UUID]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import uuid
+
+from app.core.config import settings
+from app.db.pool import SharedPool
+from app.db.session import close_sqlalchemy, get_engine
+from app.queries.account import (
+    DELETE_ACCOUNT_ROLLUPS_QUERY,
+    LOCK_ACCOUNT_ROLLUPS_QUERY,
+    REBUILD_ACCOUNT_ROLLUPS_QUERY,
+)
+
+
+async def rebuild(organization_id: uuid.UUID | None) -> int:
+    pool = SharedPool(get_engine(), consumer="rebuild_account_rollups")
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(LOCK_ACCOUNT_ROLLUPS_QUERY)
+                await conn.execute(DELETE_ACCOUNT_ROLLUPS_QUERY, organization_id)
+                status = await conn.execute(REBUILD_ACCOUNT_ROLLUPS_QUERY, organization_id)
+    finally:
+        await close_sqlalchemy()
+    rebuilt = int(status.split()[-1])
+    scope = f"organization {organization_id}" if organization_id else "all organizations"
+    print(f"Rebuilt account rollups for {scope}: {rebuilt} month/payment type row(s)")
+    return rebuilt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild monthly account rollups")
+    parser.add_argument("--organization-id", help="Limit to one organization UUID")
+    args = parser.parse_args()
+    if not settings.is_postgresql_configured():
+        raise SystemExit("DATABASE_URL is not configured")
+    org_id = uuid.UUID(args.organization_id) if args.organization_id else None
+    asyncio.run(rebuild(org_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Repair drift in rota_services.volunteer_count.
+
+Availability writes maintain volunteer_count incrementally; this recounts from
+rota_availability and fixes any service whose stored count disagrees.
+
+Usage:
+    python -m app.scripts.reconcile_rota_volunteer_counts [--organization-id UUID]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import uuid
+
+from app.core.config import settings
+from app.db.session import close_sqlalchemy, get_session_factory, init_sqlalchemy
+from app.service_rota.repository import RotaRepository
+
+
+async def reconcile(organization_id: uuid.UUID | None) -> int:
+    await init_sqlalchemy()
+    factory = get_session_factory()
+    try:
+        async with factory() as session:
+            fixed = await RotaRepository(session).reconcile_volunteer_counts(organization_id)
+            await session.commit()
+    finally:
+        await close_sqlalchemy()
+    scope = f"organization {organization_id}" if organization_id else "all organizations"
+    print(f"Reconciled volunteer_count for {scope}: {fixed} service(s) corrected")
+    return fixed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconcile Service Rota volunteer counts")
+    parser.add_argument("--organization-id", help="Limit to one organization UUID")
+    args = parser.parse_args()
+    if not settings.is_postgresql_configured():
+        raise SystemExit("DATABASE_URL is not configured")
+    org_id = uuid.UUID(args.organization_id) if args.organization_id else None
+    asyncio.run(reconcile(org_id))
+
+
+if __name__ == "__main__":
+    main()
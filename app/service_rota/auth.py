@@ -1,7 +1,11 @@
 from app.api.auth_context import AuthContext, get_auth_context, get_checklist_context
+from app.api.permission_matrix import load_permission_matrix
 from app.core.config import settings
 from fastapi import Header, Query, Request
 from uuid import UUID
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 async def get_service_rota_context(
@@ -10,17 +14,32 @@ async def get_service_rota_context(
     organization_id: UUID | None = Query(None),
     x_organization_id: UUID | None = Header(None, alias="X-Organization-Id"),
 ) -> AuthContext:
-    """Service Rota auth — same IAM bypass pattern as checklist when disabled."""
+    """Service Rota auth — same IAM bypass pattern as checklist when disabled.
+
+    The returned context carries the caller's permission matrix, which
+    ``resolve_rota_role`` reads.
+    """
     if not settings.IAM_AUTH_ENABLED:
-        return await get_checklist_context(
+        auth = await get_checklist_context(
+            request=request,
+            authorization=authorization,
+            organization_id=organization_id,
+            x_organization_id=x_organization_id,
+        )
+    else:
+        auth = await get_auth_context(
             request=request,
             authorization=authorization,
             organization_id=organization_id,
             x_organization_id=x_organization_id,
         )
-    return await get_auth_context(
-        request=request,
-        authorization=authorization,
-        organization_id=organization_id,
-        x_organization_id=x_organization_id,
-    )
+    try:
+        matrix = await load_permission_matrix(
+            getattr(request.app.state, "db", None), auth.organization_id, auth.user_id
+        )
+    except Exception as exc:
+        # Without a matrix real users fall back to volunteer access.
+        logger.warning("Permission lookup failed for user %s: %s", auth.user_id, exc)
+        return auth
+    # Copy: contexts are shared through the auth cache.
+    return auth.model_copy(update={"permissions": matrix})
@@ -4,17 +4,39 @@ from typing import Literal
 from uuid import UUID
 
 from app.api.auth_context import AuthContext
-from app.service_rota.constants import ROTA_ROLES
+from app.api.permission_matrix import BYPASS_USER_IDS
+from app.service_rota.constants import ROTA_MODULE, ROTA_ROLES
 from app.service_rota.exceptions import ForbiddenError
 
 RotaRole = Literal["admin", "pastor", "team_head", "volunteer"]
 
 
+# Role names/types (case and separators ignored) that map onto rota roles, most privileged first.
+ROLE_NAME_ALIASES: dict[RotaRole, tuple[str, ...]] = {
+    "admin": ("admin", "administrator", "super_admin"),
+    "pastor": ("pastor", "senior_pastor"),
+    "team_head": ("team_head", "team_lead", "team_leader"),
+}
+
+
 def resolve_rota_role(auth: AuthContext) -> RotaRole:
-    """Resolve role from auth context. Defaults to admin when IAM is bypassed."""
-    if auth.user_id in ("anonymous", "legacy-user", "unknown"):
+    """Resolve the rota role from the caller's effective permissions.
+
+    IAM bypass users are admins. Otherwise the user's role names decide, and
+    edit access to the service rota module counts as team head. Without a
+    loaded permission matrix (see ``get_service_rota_context``) real users
+    are volunteers.
+    """
+    if auth.user_id in BYPASS_USER_IDS:
         return "admin"
-    # Future: lookup user_roles table; default volunteer for real users
+    matrix = auth.permissions
+    if matrix is None:
+        return "volunteer"
+    for role in ROTA_ROLES:
+        if role in ROLE_NAME_ALIASES and matrix.has_role(*ROLE_NAME_ALIASES[role]):
+            return role
+    if matrix.can(ROTA_MODULE, "edit"):
+        return "team_head"
     return "volunteer"
 
 
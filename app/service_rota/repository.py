@@ -4,9 +4,12 @@ import uuid
 from datetime import date, datetime, timedelta
 from typing import Any
 
-from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy import and_, any_, delete, func, literal, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, distinct_on
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.service_rota.constants import VOLUNTEER_AVAILABILITY_STATUSES
 from app.service_rota.models import (
     RotaAssignment,
     RotaAttendance,
@@ -17,6 +20,24 @@ from app.service_rota.models import (
 )
 
 
+def volunteer_count_delta(previous: str | None, current: str | None) -> int:
+    """Change in ``volunteer_count`` when availability moves from ``previous`` to ``current``."""
+    was_counted = previous in VOLUNTEER_AVAILABILITY_STATUSES
+    is_counted = current in VOLUNTEER_AVAILABILITY_STATUSES
+    return int(is_counted) - int(was_counted)
+
+
+def _uuid_array(values: list[uuid.UUID]):
+    return literal(list(values), ARRAY(UUID(as_uuid=True)))
+
+
+GRID_GROUP_COLUMNS = {
+    "team": (RotaAssignment.team_id, RotaAssignment.team_name),
+    "user": (RotaAssignment.user_id, RotaAssignment.user_name),
+    "role": (RotaAssignment.role, RotaAssignment.role),
+}
+
+
 class RotaRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -41,7 +62,14 @@ class RotaRepository:
         order: str = "asc",
         page: int = 1,
         limit: int = 50,
-    ) -> tuple[list[RotaService], int]:
+        after: tuple[date, uuid.UUID] | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[RotaService], int | None]:
+        """List services by OFFSET page, or by keyset when ``after`` is given.
+
+        ``after`` is the (date, id) of the last row already seen and only applies
+        to ``sort="date"``; it seeks via ``idx_rota_services_org_date``.
+        """
         filters = [RotaService.organization_id == org_id]
         if status:
             filters.append(RotaService.status == status)
@@ -53,20 +81,32 @@ class RotaRepository:
             pattern = f"%{search}%"
             filters.append(or_(RotaService.name.ilike(pattern), RotaService.location.ilike(pattern)))
 
-        count_stmt = select(func.count()).select_from(RotaService).where(*filters)
-        total = (await self.session.execute(count_stmt)).scalar_one()
+        total = None
+        if include_total:
+            count_stmt = select(func.count()).select_from(RotaService).where(*filters)
+            total = (await self.session.execute(count_stmt)).scalar_one()
 
+        descending = order.lower() == "desc"
         sort_col = getattr(RotaService, sort, RotaService.date)
-        order_clause = sort_col.asc() if order.lower() != "desc" else sort_col.desc()
-        offset = max(page - 1, 0) * limit
-
-        stmt = (
-            select(RotaService)
-            .where(*filters)
-            .order_by(order_clause)
-            .offset(offset)
-            .limit(limit)
-        )
+        order_clause = [sort_col.desc() if descending else sort_col.asc()]
+        if sort_col is RotaService.date:
+            order_clause.append(RotaService.id.desc() if descending else RotaService.id.asc())
+
+        stmt = select(RotaService).where(*filters).order_by(*order_clause).limit(limit)
+        if after is not None:
+            after_date, after_id = after
+            if descending:
+                stmt = stmt.where(
+                    RotaService.date <= after_date,
+                    or_(RotaService.date < after_date, RotaService.id < after_id),
+                )
+            else:
+                stmt = stmt.where(
+                    RotaService.date >= after_date,
+                    or_(RotaService.date > after_date, RotaService.id > after_id),
+                )
+        else:
+            stmt = stmt.offset(max(page - 1, 0) * limit)
         rows = (await self.session.execute(stmt)).scalars().all()
         return list(rows), total
 
@@ -101,19 +141,54 @@ class RotaRepository:
         await self.session.flush()
         return row
 
-    async def recompute_volunteer_count(self, org_id: uuid.UUID, service_id: uuid.UUID) -> int:
-        stmt = select(func.count()).select_from(RotaAvailability).where(
-            RotaAvailability.organization_id == org_id,
-            RotaAvailability.service_id == service_id,
-            RotaAvailability.availability.in_(("available", "available_all_day")),
+    async def lock_service(self, org_id: uuid.UUID, service_id: uuid.UUID) -> bool:
+        """Lock the service row for the rest of the transaction; False if it does not exist.
+
+        Availability writes take it before reading the current statuses:
+        row locks only cover availability that already exists, so two
+        requests creating the same (service, user) would both count it as new.
+        """
+        stmt = (
+            select(RotaService.id)
+            .where(RotaService.id == service_id, RotaService.organization_id == org_id)
+            .with_for_update()
         )
-        count = (await self.session.execute(stmt)).scalar_one()
+        return (await self.session.execute(stmt)).scalar_one_or_none() is not None
+
+    async def adjust_volunteer_count(
+        self, org_id: uuid.UUID, service_id: uuid.UUID, delta: int
+    ) -> None:
+        if not delta:
+            return
         await self.session.execute(
             update(RotaService)
             .where(RotaService.id == service_id, RotaService.organization_id == org_id)
-            .values(volunteer_count=count)
+            .values(volunteer_count=RotaService.volunteer_count + delta)
+            .execution_options(synchronize_session=False)
         )
-        return count
+
+    async def reconcile_volunteer_counts(self, org_id: uuid.UUID | None = None) -> int:
+        """Repair drifted ``volunteer_count`` values from ``rota_availability``.
+
+        Returns the number of services whose count was corrected.
+        """
+        actual = (
+            select(func.count())
+            .select_from(RotaAvailability)
+            .where(
+                RotaAvailability.organization_id == RotaService.organization_id,
+                RotaAvailability.service_id == RotaService.id,
+                RotaAvailability.availability.in_(VOLUNTEER_AVAILABILITY_STATUSES),
+            )
+            .scalar_subquery()
+        )
+        stmt = update(RotaService).where(RotaService.volunteer_count != actual)
+        if org_id:
+            stmt = stmt.where(RotaService.organization_id == org_id)
+        result = await self.session.execute(
+            stmt.values(volunteer_count=actual).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     async def list_availability(
         self, org_id: uuid.UUID, service_id: uuid.UUID | None = None
@@ -124,23 +199,91 @@ class RotaRepository:
         stmt = select(RotaAvailability).where(*filters).order_by(RotaAvailability.user_name)
         return list((await self.session.execute(stmt)).scalars().all())
 
-    async def upsert_availability(self, data: dict[str, Any]) -> RotaAvailability:
-        stmt = select(RotaAvailability).where(
-            RotaAvailability.organization_id == data["organization_id"],
-            RotaAvailability.service_id == data["service_id"],
-            RotaAvailability.user_id == data["user_id"],
+    async def upsert_availability(
+        self, data: dict[str, Any]
+    ) -> tuple[RotaAvailability, str | None]:
+        """Insert or update one availability row.
+
+        Returns the row and its availability before the write (``None`` when inserted).
+        """
+        stmt = (
+            select(RotaAvailability)
+            .where(
+                RotaAvailability.organization_id == data["organization_id"],
+                RotaAvailability.service_id == data["service_id"],
+                RotaAvailability.user_id == data["user_id"],
+            )
+            .with_for_update()
         )
         existing = (await self.session.execute(stmt)).scalar_one_or_none()
         if existing:
+            previous = existing.availability
             for key, value in data.items():
                 if key not in ("organization_id", "service_id", "user_id") and value is not None:
                     setattr(existing, key, value)
             await self.session.flush()
-            return existing
+            return existing, previous
         row = RotaAvailability(**data)
         self.session.add(row)
         await self.session.flush()
-        return row
+        return row, None
+
+    async def availability_statuses(
+        self, org_id: uuid.UUID, service_id: uuid.UUID, user_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, str]:
+        """Current availability per user for a service; call after ``lock_service``."""
+        if not user_ids:
+            return {}
+        stmt = (
+            select(RotaAvailability.user_id, RotaAvailability.availability)
+            .where(
+                RotaAvailability.organization_id == org_id,
+                RotaAvailability.service_id == service_id,
+                RotaAvailability.user_id.in_(user_ids),
+            )
+            .with_for_update()
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return {r.user_id: r.availability for r in rows}
+
+    async def bulk_upsert_availability(
+        self, records: list[dict[str, Any]]
+    ) -> list[RotaAvailability]:
+        """Upsert a batch of availability rows in one INSERT ... ON CONFLICT statement.
+
+        Mirrors ``upsert_availability``: key columns are never overwritten and
+        ``None`` values keep the stored value. Records for the same user are
+        merged field by field, later non-``None`` values winning, as they
+        would when applied one at a time.
+        """
+        if not records:
+            return []
+        keyed: dict[tuple[Any, Any, Any], dict[str, Any]] = {}
+        for data in records:
+            key = (data["organization_id"], data["service_id"], data["user_id"])
+            merged = keyed.setdefault(key, {})
+            for name, value in data.items():
+                if value is not None or name not in merged:
+                    merged[name] = value
+        rows = list(keyed.values())
+
+        stmt = pg_insert(RotaAvailability).values(rows)
+        key_columns = ("organization_id", "service_id", "user_id")
+        table = RotaAvailability.__table__
+        update_columns = {
+            name: func.coalesce(stmt.excluded[name], table.c[name])
+            for name in rows[0]
+            if name not in key_columns
+        }
+        update_columns["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_=update_columns,
+        ).returning(RotaAvailability)
+        result = await self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        )
+        return list(result.all())
 
     async def list_assignments(
         self, org_id: uuid.UUID, service_id: uuid.UUID | None = None
@@ -211,6 +354,75 @@ class RotaRepository:
         await self.session.flush()
         return row
 
+    def _attendance_sync_source(self, org_id: uuid.UUID, service_id: uuid.UUID):
+        """One row per assigned user; the highest ``sort_order`` assignment wins."""
+        return (
+            select(
+                RotaAssignment.organization_id,
+                RotaAssignment.service_id,
+                RotaAssignment.id.label("assignment_id"),
+                RotaAssignment.user_id,
+                RotaAssignment.user_name,
+                RotaAssignment.team_id,
+                RotaAssignment.team_name,
+                RotaAssignment.role,
+            )
+            .where(
+                RotaAssignment.organization_id == org_id,
+                RotaAssignment.service_id == service_id,
+            )
+            .ext(distinct_on(RotaAssignment.user_id))
+            .order_by(
+                RotaAssignment.user_id,
+                RotaAssignment.sort_order.desc(),
+                RotaAssignment.id.desc(),
+            )
+        )
+
+    async def sync_attendance_from_assignments(
+        self, org_id: uuid.UUID, service_id: uuid.UUID
+    ) -> list[RotaAttendance]:
+        """Create or reset attendance for every assigned user in one INSERT ... SELECT."""
+        source = self._attendance_sync_source(org_id, service_id)
+        columns = [c.name for c in source.selected_columns]
+        stmt = pg_insert(RotaAttendance).from_select(columns, source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["organization_id", "service_id", "user_id"],
+            set_={
+                "assignment_id": stmt.excluded.assignment_id,
+                "user_name": stmt.excluded.user_name,
+                "team_id": stmt.excluded.team_id,
+                "team_name": stmt.excluded.team_name,
+                "role": func.coalesce(stmt.excluded.role, RotaAttendance.__table__.c.role),
+                "status": literal_column("'pending'"),
+                "updated_at": func.now(),
+            },
+        ).returning(RotaAttendance)
+        result = await self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        )
+        return list(result.all())
+
+    async def attendance_sync_diff(
+        self, org_id: uuid.UUID, service_id: uuid.UUID
+    ) -> list[tuple[Any, RotaAttendance | None]]:
+        """Pair each sync source row with the attendance row it would overwrite."""
+        source = self._attendance_sync_source(org_id, service_id).subquery()
+        stmt = (
+            select(source, RotaAttendance)
+            .outerjoin(
+                RotaAttendance,
+                and_(
+                    RotaAttendance.organization_id == source.c.organization_id,
+                    RotaAttendance.service_id == source.c.service_id,
+                    RotaAttendance.user_id == source.c.user_id,
+                ),
+            )
+            .order_by(source.c.user_name)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return [(row, row.RotaAttendance) for row in rows]
+
     async def list_clock_sessions(
         self,
         org_id: uuid.UUID,
@@ -335,20 +547,34 @@ class RotaRepository:
         org_id: uuid.UUID,
         week_start: date,
         week_end: date,
-        team_id: uuid.UUID | None = None,
+        *,
+        team_ids: list[uuid.UUID] | None = None,
+        user_ids: list[uuid.UUID] | None = None,
+        group_by: str | None = None,
     ) -> list[tuple[RotaAssignment, RotaService]]:
+        """Assignments for services in the week, filtered in one query.
+
+        With ``group_by`` rows come back ordered by group, then day, ready to pivot.
+        """
         filters = [
             RotaAssignment.organization_id == org_id,
             RotaService.date >= week_start,
             RotaService.date <= week_end,
         ]
-        if team_id:
-            filters.append(RotaAssignment.team_id == team_id)
+        if team_ids:
+            filters.append(RotaAssignment.team_id == any_(_uuid_array(team_ids)))
+        if user_ids:
+            filters.append(RotaAssignment.user_id == any_(_uuid_array(user_ids)))
         stmt = (
             select(RotaAssignment, RotaService)
             .join(RotaService, RotaService.id == RotaAssignment.service_id)
             .where(*filters)
         )
+        if group_by:
+            key_col, label_col = GRID_GROUP_COLUMNS.get(group_by, GRID_GROUP_COLUMNS["team"])
+            stmt = stmt.order_by(
+                label_col, key_col, RotaService.date, RotaService.time, RotaAssignment.sort_order
+            )
         return list((await self.session.execute(stmt)).all())
 
     async def dashboard_stats(self, org_id: uuid.UUID) -> dict[str, Any]:
@@ -5,14 +5,16 @@ from datetime import date
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth_context import AuthContext
+from app.api.conditional import conditional, resource_etag
 from app.db.session import get_db_session
 from app.service_rota.auth import get_service_rota_context
 from app.service_rota.exceptions import RotaError
+from app.service_rota.permissions import resolve_rota_role
 from app.service_rota.schemas import (
     AssignmentCreate,
     AssignmentUpdate,
@@ -61,11 +63,18 @@ def _require_org(auth: AuthContext, organization_id: UUID | None) -> UUID:
     return org_id
 
 
+async def _rota_etag(request: Request, auth: AuthContext, resources: tuple[str, ...], *parts: Any) -> str | None:
+    # The caller's rota role is part of the tag, so a permission change never
+    # turns into a 304 for data the caller may no longer see.
+    return await resource_etag(request, auth.organization_id, resources, resolve_rota_role(auth), *parts)
+
+
 # --- A. Services ---
 
 
 @router.get("/get")
 async def get_services(
+    request: Request,
     organization_id: UUID = Query(...),
     status: str | None = Query(None),
     start_date: date | None = Query(None),
@@ -75,23 +84,32 @@ async def get_services(
     order: str = Query("asc"),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
     auth: AuthContext = Depends(get_service_rota_context),
     service: ServiceRotaService = Depends(get_service),
 ):
     try:
         _require_org(auth, organization_id)
-        data = await service.list_services(
-            auth,
-            status=status,
-            start_date=start_date,
-            end_date=end_date,
-            search=search,
-            sort=sort,
-            order=order,
-            page=page,
-            limit=limit,
-        )
-        return _ok(data)
+        etag = await _rota_etag(request, auth, ("rota_services",), sorted(request.query_params.multi_items()))
+
+        async def render() -> JSONResponse:
+            data = await service.list_services(
+                auth,
+                status=status,
+                start_date=start_date,
+                end_date=end_date,
+                search=search,
+                sort=sort,
+                order=order,
+                page=page,
+                limit=limit,
+                cursor=cursor,
+                include_total=include_total,
+            )
+            return _ok(data)
+
+        return await conditional(request, etag, render)
     except Exception as exc:
         return _err(exc)
 
@@ -159,6 +177,7 @@ async def set_service_status(
 
 @router.get("/availability")
 async def get_availability(
+    request: Request,
     organization_id: UUID = Query(...),
     service_id: UUID | None = Query(None),
     auth: AuthContext = Depends(get_service_rota_context),
@@ -166,8 +185,12 @@ async def get_availability(
 ):
     try:
         _require_org(auth, organization_id)
-        data = await service.get_availability(auth, service_id)
-        return _ok(data)
+        etag = await _rota_etag(request, auth, ("rota_availability",), service_id)
+
+        async def render() -> JSONResponse:
+            return _ok(await service.get_availability(auth, service_id))
+
+        return await conditional(request, etag, render)
     except Exception as exc:
         return _err(exc)
 
@@ -204,6 +227,7 @@ async def bulk_save_availability(
 
 @router.get("/assignments")
 async def get_assignments(
+    request: Request,
     organization_id: UUID = Query(...),
     service_id: UUID = Query(...),
     auth: AuthContext = Depends(get_service_rota_context),
@@ -211,8 +235,12 @@ async def get_assignments(
 ):
     try:
         _require_org(auth, organization_id)
-        data = await service.get_assignments(auth, service_id)
-        return _ok(data)
+        etag = await _rota_etag(request, auth, ("rota_assignments",), service_id)
+
+        async def render() -> JSONResponse:
+            return _ok(await service.get_assignments(auth, service_id))
+
+        return await conditional(request, etag, render)
     except Exception as exc:
         return _err(exc)
 
@@ -280,12 +308,13 @@ async def patch_attendance(
 async def sync_attendance(
     service_id: UUID,
     organization_id: UUID = Query(...),
+    dry_run: bool = Query(False),
     auth: AuthContext = Depends(get_service_rota_context),
     service: ServiceRotaService = Depends(get_service),
 ):
     try:
         _require_org(auth, organization_id)
-        data = await service.sync_attendance(auth, service_id)
+        data = await service.sync_attendance(auth, service_id, dry_run=dry_run)
         return _ok(data)
     except Exception as exc:
         return _err(exc)
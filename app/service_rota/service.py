@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+import time
 import uuid
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
@@ -7,6 +9,7 @@ from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth_context import AuthContext
+from app.db.pagination import decode_cursor, encode_cursor
 from app.service_rota.exceptions import ConflictError, ForbiddenError, NotFoundError, ValidationError
 from app.service_rota.permissions import (
     assert_can_manage_services,
@@ -14,7 +17,7 @@ from app.service_rota.permissions import (
     assert_volunteer_own_record,
     resolve_rota_role,
 )
-from app.service_rota.repository import RotaRepository
+from app.service_rota.repository import GRID_GROUP_COLUMNS, RotaRepository, volunteer_count_delta
 from app.service_rota.schemas import (
     AssignmentCreate,
     AssignmentUpdate,
@@ -34,6 +37,8 @@ from app.service_rota.serializers import (
     service_to_dict,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def _parse_uuid(value: str | uuid.UUID | None, field: str = "id") -> uuid.UUID:
     if value is None:
@@ -44,6 +49,10 @@ def _parse_uuid(value: str | uuid.UUID | None, field: str = "id") -> uuid.UUID:
         raise ValidationError(f"Invalid {field}") from exc
 
 
+def _json_value(value: Any) -> Any:
+    return str(value) if isinstance(value, uuid.UUID) else value
+
+
 def _user_uuid(auth: AuthContext) -> uuid.UUID:
     try:
         return uuid.UUID(str(auth.user_id))
@@ -91,8 +100,19 @@ class ServiceRotaService:
         order: str = "asc",
         page: int = 1,
         limit: int = 50,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> dict[str, Any]:
         assert_can_manage_services(auth, auth.organization_id)
+        after = None
+        if cursor:
+            if sort != "date":
+                raise ValidationError("cursor pagination requires sort=date")
+            try:
+                raw_date, raw_id = decode_cursor(cursor, 2)
+                after = (date.fromisoformat(raw_date), uuid.UUID(raw_id))
+            except ValueError as exc:
+                raise ValidationError("Invalid cursor") from exc
         rows, total = await self.repo.list_services(
             auth.organization_id,
             status=status,
@@ -103,12 +123,18 @@ class ServiceRotaService:
             order=order,
             page=page,
             limit=limit,
+            after=after,
+            include_total=include_total,
         )
+        next_cursor = None
+        if sort == "date" and len(rows) == limit:
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
         return {
             "items": [service_to_dict(r) for r in rows],
             "total": total,
             "page": page,
             "limit": limit,
+            "next_cursor": next_cursor,
         }
 
     async def save_service(self, auth: AuthContext, payload: RotaServiceCreate) -> dict[str, Any]:
@@ -181,8 +207,14 @@ class ServiceRotaService:
         data = payload.model_dump()
         data["updated_by_id"] = _user_uuid(auth)
         data["updated_by_name"] = auth.user_id
-        row = await self.repo.upsert_availability(data)
-        await self.repo.recompute_volunteer_count(auth.organization_id, payload.service_id)
+        if not await self.repo.lock_service(auth.organization_id, payload.service_id):
+            raise NotFoundError("Service not found")
+        row, previous = await self.repo.upsert_availability(data)
+        await self.repo.adjust_volunteer_count(
+            auth.organization_id,
+            payload.service_id,
+            volunteer_count_delta(previous, row.availability),
+        )
         await self._audit(auth, action="save_availability", service_id=payload.service_id)
         await self.session.commit()
         return availability_to_dict(row)
@@ -190,7 +222,8 @@ class ServiceRotaService:
     async def bulk_save_availability(
         self, auth: AuthContext, service_id: uuid.UUID, records: list[AvailabilityCreate]
     ) -> list[dict[str, Any]]:
-        results = []
+        started = time.perf_counter()
+        batch = []
         for record in records:
             if record.organization_id != auth.organization_id:
                 raise ForbiddenError("Organization mismatch")
@@ -199,11 +232,27 @@ class ServiceRotaService:
             data["organization_id"] = auth.organization_id
             data["updated_by_id"] = _user_uuid(auth)
             data["updated_by_name"] = auth.user_id
-            row = await self.repo.upsert_availability(data)
-            results.append(availability_to_dict(row))
-        await self.repo.recompute_volunteer_count(auth.organization_id, service_id)
+            batch.append(data)
+        if not await self.repo.lock_service(auth.organization_id, service_id):
+            raise NotFoundError("Service not found")
+        previous = await self.repo.availability_statuses(
+            auth.organization_id, service_id, [data["user_id"] for data in batch]
+        )
+        rows = await self.repo.bulk_upsert_availability(batch)
+        delta = sum(
+            volunteer_count_delta(previous.get(row.user_id), row.availability) for row in rows
+        )
+        await self.repo.adjust_volunteer_count(auth.organization_id, service_id, delta)
+        by_user = {row.user_id: availability_to_dict(row) for row in rows}
+        results = [by_user[data["user_id"]] for data in batch]
         await self._audit(auth, action="bulk_save_availability", service_id=service_id)
         await self.session.commit()
+        logger.info(
+            "bulk_save_availability service_id=%s batch_size=%d elapsed_ms=%.1f",
+            service_id,
+            len(batch),
+            (time.perf_counter() - started) * 1000,
+        )
         return results
 
     async def get_assignments(
@@ -263,29 +312,61 @@ class ServiceRotaService:
         return attendance_to_dict(row)
 
     async def sync_attendance(
-        self, auth: AuthContext, service_id: uuid.UUID
-    ) -> list[dict[str, Any]]:
+        self, auth: AuthContext, service_id: uuid.UUID, *, dry_run: bool = False
+    ) -> list[dict[str, Any]] | dict[str, Any]:
         assert_can_manage_services(auth, auth.organization_id)
-        assignments = await self.repo.list_assignments(auth.organization_id, service_id)
-        results = []
-        for assignment in assignments:
-            row = await self.repo.upsert_attendance(
-                {
-                    "organization_id": auth.organization_id,
-                    "service_id": service_id,
-                    "assignment_id": assignment.id,
-                    "user_id": assignment.user_id,
-                    "user_name": assignment.user_name,
-                    "team_id": assignment.team_id,
-                    "team_name": assignment.team_name,
-                    "role": assignment.role,
-                    "status": "pending",
-                }
-            )
-            results.append(attendance_to_dict(row))
+        if dry_run:
+            return await self._sync_attendance_diff(auth, service_id)
+        rows = await self.repo.sync_attendance_from_assignments(auth.organization_id, service_id)
         await self._audit(auth, action="sync_attendance", service_id=service_id)
         await self.session.commit()
-        return results
+        return [attendance_to_dict(r) for r in rows]
+
+    async def _sync_attendance_diff(
+        self, auth: AuthContext, service_id: uuid.UUID
+    ) -> dict[str, Any]:
+        pairs = await self.repo.attendance_sync_diff(auth.organization_id, service_id)
+        create, changed, unchanged = [], [], []
+        for source, existing in pairs:
+            target = {
+                "assignment_id": source.assignment_id,
+                "user_name": source.user_name,
+                "team_id": source.team_id,
+                "team_name": source.team_name,
+                "role": source.role if source.role is not None else getattr(existing, "role", None),
+                "status": "pending",
+            }
+            if existing is None:
+                create.append(
+                    {
+                        "user_id": str(source.user_id),
+                        **{field: _json_value(value) for field, value in target.items()},
+                    }
+                )
+                continue
+            changes = {
+                field: {"from": _json_value(getattr(existing, field)), "to": _json_value(value)}
+                for field, value in target.items()
+                if getattr(existing, field) != value
+            }
+            if changes:
+                changed.append(
+                    {
+                        "id": str(existing.id),
+                        "user_id": str(existing.user_id),
+                        "user_name": existing.user_name,
+                        "changes": changes,
+                    }
+                )
+            else:
+                unchanged.append(str(existing.user_id))
+        return {
+            "dry_run": True,
+            "service_id": str(service_id),
+            "create": create,
+            "update": changed,
+            "unchanged": unchanged,
+        }
 
     async def dashboard(self, auth: AuthContext) -> dict[str, Any]:
         assert_can_manage_services(auth, auth.organization_id)
@@ -308,27 +389,41 @@ class ServiceRotaService:
         group_by: str = "team",
     ) -> dict[str, Any]:
         week_end = week_start + timedelta(days=6)
+        if group_by not in GRID_GROUP_COLUMNS:
+            group_by = "team"
         services = await self.repo.week_services(auth.organization_id, week_start, week_end)
+        rows = await self.repo.week_assignments(
+            auth.organization_id,
+            week_start,
+            week_end,
+            team_ids=team_ids,
+            user_ids=user_ids,
+            group_by=group_by,
+        )
+        days = [(week_start + timedelta(days=i)).isoformat() for i in range(7)]
         assignments = []
-        for team_id in team_ids or [None]:
-            rows = await self.repo.week_assignments(
-                auth.organization_id, week_start, week_end, team_id=team_id
-            )
-            assignments.extend(rows)
-        if user_ids:
-            user_set = {str(u) for u in user_ids}
-            assignments = [
-                (a, s) for a, s in assignments if str(a.user_id) in user_set
-            ]
+        grid: dict[str, dict[str, Any]] = {}
+        key_col, label_col = GRID_GROUP_COLUMNS[group_by]
+        for a, s in rows:
+            item = assignment_to_dict(a, service_date=s.date, service_time=s.time, service_name=s.name)
+            assignments.append(item)
+            key = item[key_col.key]
+            group = grid.get(key)
+            if group is None:
+                group = grid[key] = {
+                    "key": key,
+                    "label": item[label_col.key],
+                    "days": {day: [] for day in days},
+                }
+            group["days"][item["date"]].append(item)
         return {
             "week_start": week_start.isoformat(),
             "week_end": week_end.isoformat(),
             "group_by": group_by,
+            "days": days,
             "services": [service_to_dict(s) for s in services],
-            "assignments": [
-                assignment_to_dict(a, service_date=s.date, service_time=s.time, service_name=s.name)
-                for a, s in assignments
-            ],
+            "assignments": assignments,
+            "rows": list(grid.values()),
         }
 
     async def timesheets(
@@ -336,7 +431,10 @@ class ServiceRotaService:
     ) -> dict[str, Any]:
         week_end = week_start + timedelta(days=6)
         rows = await self.repo.week_assignments(
-            auth.organization_id, week_start, week_end, team_id=team_id
+            auth.organization_id,
+            week_start,
+            week_end,
+            team_ids=[team_id] if team_id else None,
         )
         return {
             "week_start": week_start.isoformat(),
@@ -6,15 +6,15 @@ import logging
 import asyncio
 from fastapi import HTTPException
 from app.core.config import settings
-from email.mime.multipart import MIMEMultipart
+from app.utils.smtp_pool import build_message, get_smtp_pool
 
 # Get environment variables safely
 EMAIL = settings.GMAIL_USERNAME
 PASSWORD = settings.GMAIL_PASS
 
 # SMTP Configuration for Gmail
-SMTP_HOST = "smtp.gmail.com"
-SMTP_PORT = 587
+SMTP_HOST = settings.MAIL_SMTP_HOST
+SMTP_PORT = settings.MAIL_SMTP_PORT
 
 # # Amazon SES Configuration from .env
 # SES_SMTP_SERVER = getattr(settings, 'SES_SMTP_SERVER', '')
@@ -162,42 +162,16 @@ def test_smtp_connection():
 
 
 
-def _send_email_gmail_sync(to_email, subject, body, html=False):
-    """
-    Synchronous helper function to send an email using Gmail SMTP
-    """
-    if not EMAIL or not PASSWORD:
-        raise ValueError("Gmail credentials are missing")
-
-    # Create message
-    msg = MIMEMultipart()
-    msg["From"] = EMAIL
-    msg["To"] = to_email
-    msg["Subject"] = subject
-
-    if html:
-        msg.attach(MIMEText(body, "html"))
-    else:
-        msg.attach(MIMEText(body, "plain"))
-
-    context = ssl.create_default_context()
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-        server.ehlo()
-        server.starttls(context=context)
-        server.ehlo()
-        server.login(EMAIL, PASSWORD)
-        server.send_message(msg)
-
-    logging.info(f"✅ Email sent to {to_email}")
-
 async def send_email_gmail(to_email, subject, body, html=False):
     """
-    Send an email using Gmail SMTP asynchronously
+    Send an email right away over the pooled SMTP connections.
+    Requests should queue mail with app.utils.mail_queue.enqueue_mail instead.
     """
+    if not EMAIL or not PASSWORD:
+        raise HTTPException(status_code=500, detail="Failed to send email: Gmail credentials are missing")
     try:
-        # Run SMTP operations in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, _send_email_gmail_sync, to_email, subject, body, html)
+        await get_smtp_pool().send(build_message(to_email, subject, body, html=html))
+        logging.info(f"✅ Email sent to {to_email}")
         return {"message": "Email sent successfully"}
     except Exception as e:
         logging.error(f"❌ Failed to send email via Gmail: {e}")
@@ -0,0 +1,203 @@
+"""Durable outbound mail queue (``mail_outbox``) and its worker.
+
+``enqueue_mail`` stores messages and returns their ids straight away; the
+worker started from the app lifespan claims due rows in batches, sends them
+concurrently over the SMTP pool and records the outcome. Transient failures
+are retried with exponential backoff. A message the server rejects outright
+(5xx other than authentication), a malformed one, or one that runs out of
+attempts is marked ``failed`` with the last error; so is a row whose lease
+expired (its worker died mid-send) after its last attempt. The worker renews
+the lease on its claimed rows until their outcome is recorded, so only a dead
+worker's rows expire. Several app instances can run workers against the same
+table: claims use ``FOR UPDATE SKIP LOCKED``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from typing import Any
+
+import aiosmtplib
+
+from app.core.config import settings
+from app.queries.mail_outbox import (
+    CLAIM_MAIL_BATCH_QUERY,
+    ENQUEUE_MAIL_QUERY,
+    FAIL_EXHAUSTED_MAIL_LEASES_QUERY,
+    MARK_MAIL_RETRY_QUERY,
+    MARK_MAIL_SENT_QUERY,
+    RENEW_MAIL_LEASES_QUERY,
+)
+from app.utils.smtp_pool import SMTPPool, build_message, get_smtp_pool
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 3600
+
+_wake = asyncio.Event()
+_worker_task: asyncio.Task | None = None
+
+
+def header_error(to: str, subject: str) -> str | None:
+    """Why ``to``/``subject`` cannot go into a message header, or None.
+
+    A CR or LF would make ``build_message`` raise (or, elsewhere, inject
+    headers), so such messages are refused before they are queued.
+    """
+    for field, value in (("to", to), ("subject", subject)):
+        if not isinstance(value, str):
+            return f"{field} must be a string"
+        if "\r" in value or "\n" in value:
+            return f"{field} must not contain line breaks"
+    return None
+
+
+async def enqueue_mail(
+    db, messages: list[dict], organization_id: Any = None, batch_id: uuid.UUID | None = None
+) -> list[str]:
+    """Queue ``messages`` (``to``, ``subject``, ``body``, optional ``html``) in one
+    statement; returns their ids in input order. Raises ValueError, queueing
+    nothing, when a recipient or subject contains a line break."""
+    if not messages:
+        return []
+    for m in messages:
+        error = header_error(m["to"], m["subject"])
+        if error:
+            raise ValueError(error)
+    ids = [uuid.uuid4() for _ in messages]
+    await db.execute(
+        ENQUEUE_MAIL_QUERY,
+        ids,
+        [m.get("organization_id") or organization_id for m in messages],
+        [m["to"] for m in messages],
+        [m["subject"] for m in messages],
+        [m["body"] for m in messages],
+        [bool(m.get("html", False)) for m in messages],
+        batch_id,
+    )
+    _wake.set()
+    return [str(message_id) for message_id in ids]
+
+
+def retry_delay(attempts: int) -> float | None:
+    """Seconds until the next try after ``attempts`` failed ones; None when out of attempts."""
+    if attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS:
+        return None
+    return min(settings.MAIL_QUEUE_RETRY_BASE_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+
+def _is_permanent(exc: BaseException) -> bool:
+    # ValueError: the message itself is malformed (e.g. no sender configured).
+    if isinstance(exc, ValueError):
+        return True
+    if isinstance(exc, aiosmtplib.SMTPRecipientsRefused):
+        # 4xx refusals (greylisting, mailbox busy) are worth retrying.
+        return bool(exc.recipients) and all(r.code >= 500 for r in exc.recipients)
+    return (
+        isinstance(exc, aiosmtplib.SMTPResponseException)
+        and not isinstance(exc, aiosmtplib.SMTPAuthenticationError)
+        and exc.code >= 500
+    )
+
+
+class MailWorker:
+    def __init__(self, db, smtp: SMTPPool):
+        self.db = db
+        self.smtp = smtp
+
+    async def _send(self, row) -> BaseException | None:
+        # Every failure, building the message included, is returned rather than
+        # raised, so one bad row cannot keep the batch from being recorded.
+        try:
+            message = build_message(row["to_email"], row["subject"], row["body"], html=row["html"])
+            await self.smtp.send(message)
+        except Exception as exc:
+            return exc
+        return None
+
+    async def _renew_leases(self, ids: list) -> None:
+        interval = settings.MAIL_QUEUE_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.db.execute(RENEW_MAIL_LEASES_QUERY, ids)
+            except Exception as exc:
+                logger.warning("Mail lease renewal failed: %s", exc)
+
+    async def run_once(self) -> int:
+        """Claim and send one batch; returns how many messages were claimed."""
+        await self.db.execute(
+            FAIL_EXHAUSTED_MAIL_LEASES_QUERY,
+            settings.MAIL_QUEUE_LEASE_SECONDS,
+            settings.MAIL_QUEUE_MAX_ATTEMPTS,
+        )
+        rows = await self.db.fetch(
+            CLAIM_MAIL_BATCH_QUERY,
+            settings.MAIL_QUEUE_BATCH_SIZE,
+            settings.MAIL_QUEUE_LEASE_SECONDS,
+            settings.MAIL_QUEUE_MAX_ATTEMPTS,
+        )
+        if not rows:
+            return 0
+        # A batch can outlast the lease (pool size x SMTP timeout); keep it
+        # until every outcome below is recorded.
+        renewer = asyncio.create_task(self._renew_leases([row["id"] for row in rows]))
+        try:
+            return await self._send_batch(rows)
+        finally:
+            renewer.cancel()
+
+    async def _send_batch(self, rows) -> int:
+        # The pool caps concurrency at its size; each connection sends many.
+        errors = await asyncio.gather(*(self._send(row) for row in rows))
+        sent = [row["id"] for row, error in zip(rows, errors) if error is None]
+        if sent:
+            await self.db.execute(MARK_MAIL_SENT_QUERY, sent)
+        for row, error in zip(rows, errors):
+            if error is None:
+                continue
+            delay = None if _is_permanent(error) else retry_delay(row["attempts"])
+            logger.warning(
+                "Mail %s to %s failed (attempt %s, %s): %s",
+                row["id"], row["to_email"], row["attempts"],
+                "giving up" if delay is None else f"retry in {delay:.0f}s", error,
+            )
+            await self.db.execute(MARK_MAIL_RETRY_QUERY, row["id"], delay, str(error))
+        return len(rows)
+
+    async def run(self) -> None:
+        while True:
+            # Cleared before claiming so an enqueue during the run is not lost.
+            _wake.clear()
+            claimed = 0
+            try:
+                claimed = await self.run_once()
+            except Exception as exc:
+                logger.warning("Mail queue run failed: %s", exc)
+            if claimed >= settings.MAIL_QUEUE_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(_wake.wait(), timeout=settings.MAIL_QUEUE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+def start_mail_worker(db) -> None:
+    global _worker_task
+    if _worker_task is not None and not _worker_task.done():
+        return
+    _worker_task = asyncio.create_task(MailWorker(db, get_smtp_pool()).run())
+
+
+async def stop_mail_worker() -> None:
+    global _worker_task
+    task, _worker_task = _worker_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
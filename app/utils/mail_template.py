@@ -0,0 +1,146 @@
+"""Compiled ``{{variable}}`` mail templates.
+
+A template's subject and body are split into literal text and placeholder
+names once; rendering a recipient is then a single join instead of one
+``str.replace`` pass per variable. Compiled templates are cached by
+(template id, updated_at), so editing a template recompiles it and old
+versions simply age out.
+
+Template rows are cached too, per template key: the global template and
+every organization's override of it are loaded together, so choosing the
+right one for a send happens in memory. Template writes in this process
+invalidate the cache; the TTL bounds staleness across workers.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+_MISSING = object()
+
+
+class CompiledText:
+    __slots__ = ("literals", "names")
+
+    def __init__(self, text: str):
+        parts = _PLACEHOLDER.split(text or "")
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+
+    def render(self, variables: Mapping[str, Any]) -> str:
+        out = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = variables.get(name, _MISSING)
+            if value is _MISSING:
+                # Unknown variables stay visible, as they did with str.replace.
+                out.append("{{" + name + "}}")
+            elif value is not None:
+                out.append(str(value))
+            out.append(literal)
+        return "".join(out)
+
+
+class CompiledMailTemplate:
+    __slots__ = ("key", "subject", "body")
+
+    def __init__(self, template: Mapping[str, Any]):
+        self.key = template.get("key")
+        self.subject = CompiledText(template.get("subject", ""))
+        self.body = CompiledText(template.get("body", ""))
+
+    def render(self, variables: Mapping[str, Any]) -> tuple[str, str]:
+        return self.subject.render(variables), self.body.render(variables)
+
+
+_compiled: TTLCache[tuple[str, str], CompiledMailTemplate] = TTLCache(
+    "mail_template_renderers",
+    maxsize=settings.MAIL_TEMPLATE_CACHE_MAX_ENTRIES,
+    ttl=settings.MAIL_TEMPLATE_CACHE_TTL_SECONDS,
+)
+
+
+def compile_mail_template(template: Mapping[str, Any]) -> CompiledMailTemplate:
+    """The compiled form of a ``mail_templates`` row, compiled at most once per version."""
+    key = (str(template.get("id")), str(template.get("updated_at")))
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = CompiledMailTemplate(template)
+        _compiled.set(key, compiled)
+    return compiled
+
+
+class TemplateVariants:
+    """Every ``mail_templates`` row sharing one key: the global template and
+    per-organization overrides of it."""
+
+    __slots__ = ("default", "overrides")
+
+    def __init__(self, rows: list[Mapping[str, Any]]):
+        self.default: Mapping[str, Any] | None = None
+        self.overrides: dict[str, Mapping[str, Any]] = {}
+        for row in rows:
+            organization_id = row.get("organization_id")
+            if organization_id is None:
+                self.default = row
+            else:
+                self.overrides[str(organization_id)] = row
+
+    def resolve(self, organization_id: Any = None) -> Mapping[str, Any] | None:
+        """The organization's override when it has one, else the global template."""
+        if organization_id is not None:
+            override = self.overrides.get(str(organization_id))
+            if override is not None:
+                return override
+        return self.default
+
+
+_variants: TTLCache[str, TemplateVariants] = TTLCache(
+    "mail_templates",
+    maxsize=settings.MAIL_TEMPLATE_LOOKUP_CACHE_MAX_KEYS,
+    ttl=settings.MAIL_TEMPLATE_LOOKUP_CACHE_TTL_SECONDS,
+)
+
+
+async def get_template_variants(
+    key: str, load: Callable[[], Awaitable[list[Mapping[str, Any]]]]
+) -> TemplateVariants:
+    """The rows for template ``key`` from the cache, calling ``load`` on a miss.
+    Unknown keys are cached as empty until a template with that key is saved."""
+    variants = _variants.get(key)
+    if variants is None:
+        variants = TemplateVariants(await load())
+        _variants.set(key, variants)
+    return variants
+
+
+def invalidate_mail_templates(key: str | None = None) -> None:
+    """Drop one template key, or every key."""
+    if key is None:
+        _variants.clear()
+        return
+    _variants.pop(key)
+
+
+def recipient_variables(user: Mapping[str, Any], extra_variables: Mapping[str, Any] | None = None) -> dict[str, Any]:
+    """Template variables for one recipient; ``extra_variables`` win over user fields."""
+    first_name = user.get("first_name") or ""
+    last_name = user.get("last_name") or ""
+    organization = user.get("organization") or {}
+    variables = {
+        "email": user.get("email") or "",
+        "phone": user.get("phone") or "",
+        "name": user.get("name") or f"{first_name} {last_name}".strip(),
+        "first_name": first_name,
+        "last_name": last_name,
+        "organization_name": organization.get("name", "") if isinstance(organization, Mapping) else "",
+        "reset_link": f"{settings.THE_CHURCH_MANAGER_APP}/pages/authentication/forgotpassword/",
+    }
+    if extra_variables:
+        variables.update(extra_variables)
+    return variables
@@ -0,0 +1,193 @@
+"""Pool of long-lived, authenticated SMTP connections.
+
+Opening a connection costs a TCP + STARTTLS handshake and a login; the pool
+pays that once per connection and then sends message after message over it.
+At most ``size`` connections are open at a time, and a connection idle for
+longer than ``max_idle`` is closed instead of reused, since servers drop
+quiet sessions. A connection found dropped when sending is replaced once.
+
+Nothing connects at startup: the first send opens the first connection, and
+its outcome is what ``/ready`` reports as the SMTP state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import Any, AsyncIterator
+
+import aiosmtplib
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def build_message(to_email: str, subject: str, body: str, *, html: bool = False, sender: str | None = None) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = sender or settings.GMAIL_USERNAME
+    message["To"] = to_email
+    message["Subject"] = subject
+    message.set_content(body, subtype="html" if html else "plain")
+    return message
+
+
+class SMTPPool:
+    def __init__(
+        self,
+        *,
+        hostname: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        start_tls: bool = True,
+        size: int = 2,
+        max_idle: float = 120,
+        timeout: float = 30,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username or None
+        self.password = password or None
+        self.start_tls = start_tls
+        self.size = size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        # (last used, client); used LIFO so the warmest connection goes first.
+        self._idle: list[tuple[float, aiosmtplib.SMTP]] = []
+        self.connections_opened = 0
+        self.messages_sent = 0
+        self.reconnects = 0
+        self.last_connected_at: float | None = None
+        self.last_error: str | None = None
+
+    @classmethod
+    def from_settings(cls) -> SMTPPool:
+        return cls(
+            hostname=settings.MAIL_SMTP_HOST,
+            port=settings.MAIL_SMTP_PORT,
+            username=settings.GMAIL_USERNAME,
+            password=settings.GMAIL_PASS,
+            start_tls=settings.MAIL_SMTP_STARTTLS,
+            size=settings.MAIL_POOL_SIZE,
+            max_idle=settings.MAIL_POOL_MAX_IDLE_SECONDS,
+            timeout=settings.MAIL_SMTP_TIMEOUT_SECONDS,
+        )
+
+    async def _open(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        try:
+            await client.connect()
+        except Exception as exc:
+            self.last_error = str(exc)
+            if isinstance(exc, aiosmtplib.SMTPAuthenticationError):
+                logger.error("SMTP login to %s failed; GMAIL_PASS must be an app password: %s", self.hostname, exc)
+            raise
+        self.connections_opened += 1
+        self.last_connected_at = time.time()
+        self.last_error = None
+        return client
+
+    async def _discard(self, client: aiosmtplib.SMTP) -> None:
+        try:
+            if client.is_connected:
+                await client.quit()
+        except Exception:
+            client.close()
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        now = time.monotonic()
+        while self._idle:
+            last_used, client = self._idle.pop()
+            if client.is_connected and now - last_used <= self.max_idle:
+                return client
+            await self._discard(client)
+        return await self._open()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        async with self._slots:
+            client = await self._checkout()
+            try:
+                yield client
+            except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+                # The server refused this message; the session itself is fine.
+                if client.is_connected:
+                    try:
+                        await client.rset()
+                        self._idle.append((time.monotonic(), client))
+                    except aiosmtplib.SMTPException:
+                        await self._discard(client)
+                raise
+            except BaseException:
+                await self._discard(client)
+                raise
+            else:
+                self._idle.append((time.monotonic(), client))
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send ``message`` on a pooled connection."""
+        try:
+            async with self.connection() as client:
+                await client.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # The pooled connection went away while idle; one fresh try.
+            self.reconnects += 1
+            async with self.connection() as client:
+                await client.send_message(message)
+        self.messages_sent += 1
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, client in idle:
+            await self._discard(client)
+
+    def state(self) -> str:
+        """``ok`` or ``error`` from the latest connection attempt; ``unverified`` before the first."""
+        if self.last_error is not None:
+            return "error"
+        return "unverified" if self.last_connected_at is None else "ok"
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state(),
+            "last_error": self.last_error,
+            "size": self.size,
+            "idle": len(self._idle),
+            "connections_opened": self.connections_opened,
+            "messages_sent": self.messages_sent,
+            "reconnects": self.reconnects,
+        }
+
+
+_pool: SMTPPool | None = None
+
+
+def get_smtp_pool() -> SMTPPool:
+    global _pool
+    if _pool is None:
+        _pool = SMTPPool.from_settings()
+    return _pool
+
+
+def peek_smtp_pool() -> SMTPPool | None:
+    """The pool if anything has used it yet, without creating it."""
+    return _pool
+
+
+async def close_smtp_pool() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
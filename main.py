@@ -1,18 +1,21 @@
-import asyncio
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import os
 
 from app.db.postgresql import close_postgresql, get_connection
-from app.db.session import init_sqlalchemy, close_sqlalchemy
-from app.api.routers import router
-from app.utils.mail import test_smtp_connection
+from app.db.pool import start_health_check, stop_health_check
+from app.db.readiness import Readiness
+from app.db.session import get_engine, init_sqlalchemy, close_sqlalchemy
+from app.api.routers import include_routers
+from app.utils.mail_queue import start_mail_worker, stop_mail_worker
+from app.utils.smtp_pool import close_smtp_pool, peek_smtp_pool
 from app.core.config import settings
 
 logging.basicConfig(level=logging.INFO)
@@ -21,36 +24,35 @@ logging.basicConfig(level=logging.INFO)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.db = None
+    app.state.readiness = readiness = Readiness()
 
     async def init_databases():
+        if not settings.is_postgresql_configured():
+            logging.error(
+                "DATABASE_URL is not set. Add it in Railway Variables."
+            )
+            raise RuntimeError("DATABASE_URL is not set")
         try:
-            if not settings.is_postgresql_configured():
-                logging.error(
-                    "DATABASE_URL is not set. Add it in Railway Variables."
-                )
-                return
             app.state.db = await get_connection(retries=3, delay_seconds=2.0)
             await init_sqlalchemy()
+            start_health_check(get_engine(), settings.DB_POOL_HEALTH_CHECK_INTERVAL_SECONDS)
+            start_mail_worker(app.state.db)
             logging.info("PostgreSQL pool ready")
         except Exception as exc:
             logging.error("Database initialization failed: %s", exc)
             app.state.db = None
+            raise
 
-    app.state.db_init_task = asyncio.create_task(init_databases())
-
-    async def test_smtp_later():
-        try:
-            await asyncio.to_thread(test_smtp_connection)
-        except Exception as exc:
-            logging.warning("Gmail SMTP test failed: %s", exc)
-
-    asyncio.create_task(test_smtp_later())
+    # SMTP is not probed here: the mail pool's first connection is the check,
+    # and its outcome is reported by /ready.
+    app.state.db_init_task = readiness.start(init_databases())
 
     yield
 
-    task = getattr(app.state, "db_init_task", None)
-    if task and not task.done():
-        task.cancel()
+    readiness.cancel()
+    await stop_mail_worker()
+    await close_smtp_pool()
+    await stop_health_check()
     await close_sqlalchemy()
     await close_postgresql()
 
@@ -60,7 +62,7 @@ app = FastAPI(title="The Church Manager", lifespan=lifespan)
 
 @app.get("/health", tags=["Health"], include_in_schema=True)
 async def health_check():
-    """Railway liveness probe — must respond before DB init completes."""
+    """Liveness probe — answers before DB init completes (readiness is /ready)."""
     db_ready = getattr(app.state, "db", None) is not None
     return {
         "status": "ok",
@@ -69,6 +71,50 @@ async def health_check():
     }
 
 
+@app.get("/ready", tags=["Health"], include_in_schema=True)
+async def readiness_check():
+    """Readiness probe — 200 once the database pool is up, 503 until then."""
+    readiness = getattr(app.state, "readiness", None)
+    ready = readiness is not None and readiness.ready
+    smtp = peek_smtp_pool()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "db": readiness.stats() if readiness is not None else None,
+            "smtp": smtp.state() if smtp is not None else "unverified",
+            "time": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+
+
+# Probes, docs and static files answer without waiting for the database.
+UNGATED_PATH_PREFIXES = ("/health", "/ready", "/public", "/docs", "/redoc", "/openapi.json")
+
+
+@app.middleware("http")
+async def readiness_gate(request: Request, call_next):
+    """Hold requests that arrive during a cold start until the pool is ready."""
+    readiness = getattr(request.app.state, "readiness", None)
+    if (
+        readiness is not None
+        and not readiness.ready
+        and not request.url.path.startswith(UNGATED_PATH_PREFIXES)
+        and not await readiness.wait(settings.READINESS_GATE_TIMEOUT_SECONDS)
+    ):
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": "5"},
+            content={
+                "success": False,
+                "message": "Service is starting, please retry shortly",
+                "error": readiness.error,
+            },
+        )
+    return await call_next(request)
+
+
+# Added after the readiness gate so CORS wraps it and 503s still carry CORS headers.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -101,7 +147,7 @@ PUBLIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "public")
 os.makedirs(PUBLIC_DIR, exist_ok=True)
 app.mount("/public", StaticFiles(directory=PUBLIC_DIR), name="public")
 
-app.include_router(router)
+include_routers(app)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", 8000)))
@@ -0,0 +1,73 @@
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.services.account import AccountService
+from app.queries.account import APPLY_ACCOUNT_ROLLUP_QUERY, GET_ACCOUNT_FOR_UPDATE_QUERY
+
+
+def _service(conn):
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    conn.transaction.return_value = transaction
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    return AccountService(MagicMock(acquire=acquire))
+
+
+@pytest.mark.asyncio
+async def test_update_moves_amounts_between_monthly_rollups():
+    org = "6f1c1f7e-0000-4000-8000-000000000001"
+    old = {
+        "id": "a", "organization_id": org, "date": datetime(2026, 1, 31, tzinfo=timezone.utc),
+        "type": "income", "payment_type": "CR", "description": "Offering",
+        "paid_in": Decimal("50.00"), "paid_out": Decimal("0"),
+    }
+    new = {**old, "date": datetime(2026, 2, 1, tzinfo=timezone.utc), "paid_in": Decimal("60.00")}
+    conn = MagicMock()
+    conn.fetchrow = AsyncMock(side_effect=[old, new])
+    conn.execute = AsyncMock()
+    service = _service(conn)
+
+    await service.update_account_data("a", {"date": "2026-02-01T00:00:00Z", "paid_in": 60})
+
+    # The old values are read with a row lock inside the update's transaction.
+    assert conn.fetchrow.await_args_list[0].args == (GET_ACCOUNT_FOR_UPDATE_QUERY, "a")
+    assert conn.transaction.return_value.__aenter__.await_count == 1
+    calls = [c.args for c in conn.execute.await_args_list]
+    assert [c[0] for c in calls] == [APPLY_ACCOUNT_ROLLUP_QUERY] * 2
+    assert calls[0][1:] == (org, old["date"], "CR", Decimal("50.00"), Decimal("0"), -1)
+    assert calls[1][1:] == (org, new["date"], "CR", Decimal("60.00"), Decimal("0"), 1)
+
+
+@pytest.mark.asyncio
+async def test_ledger_derives_opening_from_running_closing():
+    rows = [
+        {"month": date(2026, 1, 1), "paid_in": Decimal("100"), "paid_out": Decimal("30"),
+         "entry_count": 3, "payment_types": ["", "CR"], "payment_type_counts": [1, 2],
+         "closing": Decimal("70")},
+        {"month": date(2026, 2, 1), "paid_in": Decimal("10"), "paid_out": Decimal("50"),
+         "entry_count": 2, "payment_types": ["BP", "CR"], "payment_type_counts": [2, 0],
+         "closing": Decimal("30")},
+    ]
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=rows)
+    conn.fetchval = AsyncMock(return_value=Decimal("25"))
+    service = _service(conn)
+
+    ledger = await service.get_account_ledger("org", "2026-02-14")
+
+    assert conn.fetch.await_args.args[2] == date(2026, 2, 1)
+    assert conn.fetchval.await_args.args[3] == datetime(2026, 2, 15, tzinfo=timezone.utc)
+    assert ledger["months"][1]["opening"] == 70.0
+    assert ledger["months"][1]["closing"] == 30.0
+    assert ledger["months"][0]["payment_type_counts"] == {"unspecified": 1, "CR": 2}
+    assert ledger["months"][1]["payment_type_counts"] == {"BP": 2}
+    assert ledger["balance"] == 25.0
@@ -0,0 +1,91 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from jose import jwt
+
+from app.api import auth_context
+from app.api.auth_context import get_auth_context
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    auth_context._auth_cache.clear()
+    auth_context._org_cache.clear()
+    yield
+    auth_context._auth_cache.clear()
+    auth_context._org_cache.clear()
+
+
+def _request():
+    request = MagicMock()
+    request.app.state.db = None
+    return request
+
+
+def test_ttl_cache_expiry_and_eviction():
+    cache = TTLCache("pytest_ttl", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+    cache.set("expired", 4, expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_auth_context_caches_decoded_token():
+    org_id = uuid4()
+    token = jwt.encode(
+        {"organization_id": str(org_id), "sub": "cache-user", "exp": int(time.time()) + 3600},
+        settings.JWT_SECRET,
+        algorithm="HS256",
+    )
+    with patch.object(auth_context, "decode_bearer_token", wraps=auth_context.decode_bearer_token) as decode:
+        first = await get_auth_context(_request(), f"Bearer {token}", None, None)
+        second = await get_auth_context(_request(), f"Bearer {token}", None, None)
+
+    assert first.organization_id == org_id
+    assert second is first
+    assert decode.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_auth_cache_is_scoped_by_requested_org():
+    token = jwt.encode({"sub": "cache-user"}, settings.JWT_SECRET, algorithm="HS256")
+    org_a, org_b = uuid4(), uuid4()
+    ctx_a = await get_auth_context(_request(), f"Bearer {token}", org_a, None)
+    ctx_b = await get_auth_context(_request(), f"Bearer {token}", org_b, None)
+    assert ctx_a.organization_id == org_a
+    assert ctx_b.organization_id == org_b
+
+
+@pytest.mark.asyncio
+async def test_org_lookup_is_memoized():
+    org_id = uuid4()
+    auth_context._org_cache.set("cached-user", org_id)
+    request = _request()
+    assert await auth_context.lookup_organization_id_for_user(request, "cached-user") == org_id
+
+
+@pytest.mark.asyncio
+async def test_org_lookup_skips_user_roles_for_non_uuid_key():
+    conn = MagicMock()
+    conn.fetchrow = AsyncMock(return_value=None)
+    acquire = MagicMock()
+    acquire.__aenter__ = AsyncMock(return_value=conn)
+    acquire.__aexit__ = AsyncMock(return_value=False)
+    request = _request()
+    request.app.state.db = MagicMock()
+    request.app.state.db.acquire.return_value = acquire
+
+    assert await auth_context.lookup_organization_id_for_user(request, "someone@example.com") is None
+    assert conn.fetchrow.await_count == 1
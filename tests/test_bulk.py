@@ -0,0 +1,36 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db.bulk import as_uuid, save_by_id
+
+
+@pytest.mark.asyncio
+async def test_save_by_id_updates_then_inserts_missing_in_input_order():
+    existing, missing = uuid.uuid4(), uuid.uuid4()
+
+    async def fetch(sql, ids, names):
+        if sql == "UPDATE":
+            return [{"id": existing, "name": "updated"}]
+        return [{"id": key, "name": name} for key, name in zip(ids, names)]
+
+    conn = MagicMock()
+    conn.fetch = AsyncMock(side_effect=fetch)
+    items = [(None, ("new",)), (existing, ("updated",)), (missing, ("fallback",))]
+
+    rows = await save_by_id(conn, items, update_query="UPDATE", insert_query="INSERT")
+
+    assert [row["name"] for row in rows] == ["new", "updated", "fallback"]
+    assert conn.fetch.await_count == 2
+    update_call, insert_call = conn.fetch.await_args_list
+    assert update_call.args[1:] == ([existing, missing], ["updated", "fallback"])
+    assert insert_call.args[2] == ["new", "fallback"]
+    assert rows[2]["id"] not in (existing, missing)
+
+
+def test_as_uuid_treats_malformed_ids_as_new():
+    assert as_uuid("not-a-uuid") is None
+    assert as_uuid("") is None
+    value = uuid.uuid4()
+    assert as_uuid(str(value)) == value
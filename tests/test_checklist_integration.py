@@ -1,11 +1,15 @@
 import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from uuid import uuid4
 from unittest.mock import AsyncMock, MagicMock
 
 from app.api.auth_context import AuthContext, decode_bearer_token, resolve_organization_id
-from app.checklist.exceptions import ConflictError, ForbiddenError, NotFoundError
-from app.checklist.schemas import ChecklistRecordCreate, ChecklistTemplateCreate
+from app.checklist.cache import invalidate_templates
+from app.checklist.exceptions import ConflictError, ForbiddenError, NotFoundError, ValidationError
+from app.checklist.schemas import ChecklistRecordCreate, ChecklistTemplateCreate, ItemStatusInput
 from app.checklist.service import ChecklistService
+from app.core.config import settings
 
 ORG_ID = uuid4()
 OTHER_ORG_ID = uuid4()
@@ -18,6 +22,35 @@ def auth() -> AuthContext:
     return AuthContext(organization_id=ORG_ID, user_id=USER_ID, token="test-token")
 
 
+@pytest.fixture(autouse=True)
+def template_cache(monkeypatch):
+    monkeypatch.setattr(settings, "CHECKLIST_TEMPLATE_CACHE_SHARED", False)
+    invalidate_templates()
+    yield
+    invalidate_templates()
+
+
+def _template(template_id=None, item_ids=()):
+    template_id = template_id or uuid4()
+    return SimpleNamespace(
+        id=template_id,
+        team_id=TEAM_ID,
+        team=None,
+        name="Opening",
+        description=None,
+        is_active=True,
+        created_at=datetime(2026, 5, 1, tzinfo=timezone.utc),
+        created_by=USER_ID,
+        items=[
+            SimpleNamespace(
+                id=item_id, template_id=template_id, title=f"Item {n}",
+                description=None, order=n, is_required=False,
+            )
+            for n, item_id in enumerate(item_ids)
+        ],
+    )
+
+
 @pytest.fixture
 def service() -> ChecklistService:
     session = MagicMock()
@@ -53,14 +86,12 @@ async def test_create_template_rejects_foreign_team(service: ChecklistService, a
 
 @pytest.mark.asyncio
 async def test_create_record_conflict(service: ChecklistService, auth: AuthContext):
-    template = MagicMock()
-    template.team_id = TEAM_ID
-    template.items = []
-    service.repo.get_template.return_value = template
+    template = _template()
+    service.repo.list_templates.return_value = [template]
     service.repo.get_team.return_value = MagicMock(organization_id=ORG_ID)
     service.repo.find_record_by_unique.return_value = MagicMock()
     payload = ChecklistRecordCreate(
-        template_id=uuid4(),
+        template_id=template.id,
         team_id=TEAM_ID,
         date=__import__("datetime").date(2026, 5, 23),
     )
@@ -86,4 +117,92 @@ async def test_delete_template_not_found(service: ChecklistService, auth: AuthCo
 async def test_org_isolation_list_templates(service: ChecklistService, auth: AuthContext):
     service.repo.list_templates.return_value = []
     await service.list_templates(auth, team_id=None)
-    service.repo.list_templates.assert_awaited_once_with(ORG_ID, None)
+    service.repo.list_templates.assert_awaited_once_with(ORG_ID)
+
+
+@pytest.mark.asyncio
+async def test_templates_cached_per_org_until_written(service: ChecklistService, auth: AuthContext):
+    service.repo.list_templates.return_value = [_template()]
+    service.repo.get_team.return_value = MagicMock(organization_id=ORG_ID)
+    first = await service.list_templates(auth)
+    assert await service.list_templates(auth) == first
+    assert await service.list_templates(auth, team_id=uuid4()) == []
+    service.repo.list_templates.assert_awaited_once()
+
+    service.repo.create_template.return_value = _template()
+    service.session.commit = AsyncMock()
+    await service.create_template(auth, ChecklistTemplateCreate(team_id=TEAM_ID, name="Closing"))
+    await service.list_templates(auth)
+    assert service.repo.list_templates.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_version_is_read_over_the_request_session(
+    service: ChecklistService, auth: AuthContext, monkeypatch
+):
+    monkeypatch.setattr(settings, "CHECKLIST_TEMPLATE_CACHE_SHARED", True)
+    driver = MagicMock()
+    driver.fetchval = AsyncMock(side_effect=["checklist_templates:1", "checklist_templates:1", "checklist_templates:2"])
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=SimpleNamespace(driver_connection=driver))
+    savepoint = MagicMock()
+    savepoint.__aenter__ = AsyncMock()
+    savepoint.__aexit__ = AsyncMock(return_value=False)
+    service.session.begin_nested.return_value = savepoint
+    service.session.connection = AsyncMock(return_value=connection)
+    service.repo.list_templates.return_value = [_template()]
+
+    await service.list_templates(auth)
+    await service.list_templates(auth)
+    assert service.repo.list_templates.await_count == 1
+    await service.list_templates(auth)
+    assert service.repo.list_templates.await_count == 2
+    assert driver.fetchval.await_args.args[1] == str(ORG_ID)
+
+
+@pytest.mark.asyncio
+async def test_create_record_rejects_items_from_other_templates(service: ChecklistService, auth: AuthContext):
+    template = _template(item_ids=[uuid4()])
+    service.repo.list_templates.return_value = [template]
+    service.repo.get_team.return_value = MagicMock(organization_id=ORG_ID)
+    payload = ChecklistRecordCreate(
+        template_id=template.id,
+        team_id=TEAM_ID,
+        date=datetime(2026, 5, 23).date(),
+        item_statuses=[ItemStatusInput(checklist_item_id=uuid4(), is_checked=True)],
+    )
+    with pytest.raises(ValidationError):
+        await service.create_record(auth, payload)
+    service.repo.create_record.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_list_records_cursor_round_trip(service: ChecklistService, auth: AuthContext):
+    from datetime import date, datetime, timezone
+
+    from app.db.pagination import encode_cursor
+
+    record = MagicMock(
+        id=uuid4(),
+        date=date(2026, 5, 23),
+        created_at=datetime(2026, 5, 23, 9, 30, tzinfo=timezone.utc),
+    )
+    service.repo.list_records.return_value = ([record], None)
+    service._record_to_out = MagicMock()
+
+    cursor = encode_cursor(record.date, record.created_at, record.id)
+    result = await service.list_records(auth, limit=1, cursor=cursor, include_total=False)
+
+    kwargs = service.repo.list_records.await_args.kwargs
+    assert kwargs["after"] == (record.date, record.created_at, record.id)
+    assert kwargs["include_total"] is False
+    assert result["total"] is None
+    assert result["next_cursor"] == cursor
+
+
+@pytest.mark.asyncio
+async def test_list_records_rejects_bad_cursor(service: ChecklistService, auth: AuthContext):
+    from app.checklist.exceptions import ValidationError
+
+    with pytest.raises(ValidationError):
+        await service.list_records(auth, cursor="not-a-cursor")
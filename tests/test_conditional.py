@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+
+from app.api.conditional import conditional, etag_matches, make_etag, resource_etag
+from app.api.controllers.user_role import UserRoleController
+
+
+def _request(if_none_match=None, db=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    app = SimpleNamespace(state=SimpleNamespace(db=db))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b"", "app": app})
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    etag = make_etag("resource", 3)
+    assert etag.startswith('W/"')
+    assert etag_matches(_request(f'"other", {etag.removeprefix("W/")}'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request(make_etag("resource", 4)), etag)
+    assert not etag_matches(_request(), etag)
+
+
+@pytest.mark.asyncio
+async def test_user_role_overview_returns_304_without_loading_rows():
+    service = MagicMock()
+    service.get_user_role_overview_version = AsyncMock(return_value=7)
+    service.get_user_role_overview_data = AsyncMock(return_value=[{"id": "a", "role_name": "Usher"}])
+    controller = UserRoleController(service)
+    filters = {"organization_id": "org"}
+
+    first = await controller.fetch_user_role_overview_controller(filters, _request())
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    second = await controller.fetch_user_role_overview_controller(filters, _request(etag))
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert service.get_user_role_overview_data.await_count == 1
+
+    service.get_user_role_overview_version.return_value = 8
+    third = await controller.fetch_user_role_overview_controller(filters, _request(etag))
+    assert third.status_code == 200 and third.headers["etag"] != etag
+
+
+class _VersionDb:
+    def __init__(self, version="songs:1", error=None):
+        self.version, self.error, self.calls = version, error, []
+
+    async def fetchval(self, query, *args):
+        self.calls.append(args)
+        if self.error:
+            raise self.error
+        return self.version
+
+
+@pytest.mark.asyncio
+async def test_resource_etag_follows_version_and_degrades_to_none():
+    db = _VersionDb()
+    request = _request(db=db)
+    etag = await resource_etag(request, 42, ("songs",), "page=1")
+    assert db.calls == [("42", ["songs"])]
+    assert etag == await resource_etag(request, 42, ("songs",), "page=1")
+    assert etag != await resource_etag(request, 42, ("songs",), "page=2")
+    db.version = "songs:2"
+    assert etag != await resource_etag(request, 42, ("songs",), "page=1")
+    # Equal (or empty) counters in another organization must not share a tag.
+    db.version = ""
+    assert await resource_etag(request, 42, ("songs",)) != await resource_etag(request, 43, ("songs",))
+
+    assert await resource_etag(request, None, ("songs",)) is None
+    assert await resource_etag(_request(), 42, ("songs",)) is None
+    failing = _request(db=_VersionDb(error=RuntimeError("no table")))
+    assert await resource_etag(failing, 42, ("songs",)) is None
+
+
+@pytest.mark.asyncio
+async def test_conditional_skips_render_on_match():
+    render = AsyncMock(side_effect=lambda: JSONResponse({"data": []}))
+    etag = make_etag("songs", 1)
+
+    response = await conditional(_request(etag), etag, render)
+    assert response.status_code == 304 and render.await_count == 0
+    assert response.headers["vary"] == "Authorization, X-Organization-Id"
+
+    response = await conditional(_request(), etag, render)
+    assert response.status_code == 200 and response.headers["etag"] == etag
+    assert response.headers["vary"] == "Authorization, X-Organization-Id"
+
+    response = await conditional(_request(etag), None, render)
+    assert response.status_code == 200 and "etag" not in response.headers
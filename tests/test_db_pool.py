@@ -0,0 +1,144 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db import pool as db_pool
+from app.db.pool import SharedPool, _consumer
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    db_pool.metrics.reset()
+    yield
+    db_pool.metrics.reset()
+
+
+def _engine(driver):
+    raw = MagicMock(driver_connection=driver, info={db_pool._JSON_MODE_KEY: {"text": False}})
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=raw)
+    connection.close = AsyncMock()
+    connection.invalidate = AsyncMock()
+    engine = MagicMock()
+    engine.connect = AsyncMock(return_value=connection)
+    return engine, connection, raw
+
+
+def test_checkout_events_attribute_consumer():
+    record = MagicMock(info={})
+    token = _consumer.set(db_pool.RAW_CONSUMER)
+    try:
+        db_pool.metrics._on_checkout(None, record, None)
+    finally:
+        _consumer.reset(token)
+    db_pool.metrics._on_checkout(None, MagicMock(info={}), None)
+
+    assert db_pool.metrics.consumer("asyncpg").in_use == 1
+    assert db_pool.metrics.consumer("sqlalchemy").in_use == 1
+
+    db_pool.metrics._on_checkin(None, record)
+    stats = db_pool.metrics.consumer("asyncpg").stats()
+    assert stats["checkouts"] == 1
+    assert stats["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_hands_out_driver_connection_in_text_json_mode():
+    driver = MagicMock()
+    driver.is_closed.return_value = False
+    driver.is_in_transaction.return_value = False
+    engine, connection, raw = _engine(driver)
+
+    async with SharedPool(engine).acquire() as conn:
+        assert conn is driver
+        assert raw.info[db_pool._JSON_MODE_KEY]["text"] is True
+
+    assert raw.info[db_pool._JSON_MODE_KEY]["text"] is False
+    connection.close.assert_awaited_once()
+    assert db_pool.metrics.consumer("asyncpg").stats()["wait_ms_max"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_rolls_back_open_transaction_on_release():
+    driver = MagicMock()
+    driver.is_closed.return_value = False
+    driver.is_in_transaction.return_value = True
+    driver.execute = AsyncMock()
+    engine, connection, _ = _engine(driver)
+
+    with pytest.raises(RuntimeError):
+        async with SharedPool(engine).acquire():
+            raise RuntimeError("boom")
+
+    driver.execute.assert_awaited_once_with("ROLLBACK")
+    connection.close.assert_awaited_once()
+
+
+def test_idle_connections_are_replaced_on_checkout(monkeypatch):
+    from sqlalchemy.exc import DisconnectionError
+
+    listeners = {}
+    monkeypatch.setattr(
+        db_pool.event, "listen", lambda target, name, fn, **kw: listeners.setdefault(name, fn)
+    )
+    db_pool.install_idle_timeout(MagicMock(), 60)
+
+    record = MagicMock(info={})
+    listeners["checkin"](None, record)
+    listeners["checkout"](None, record, None)
+
+    record.info[db_pool._LAST_CHECKIN_KEY] -= 120
+    with pytest.raises(DisconnectionError):
+        listeners["checkout"](None, record, None)
+
+
+@pytest.mark.asyncio
+async def test_failed_health_check_disposes_pool():
+    engine = MagicMock()
+    engine.connect.side_effect = OSError("connection refused")
+    engine.dispose = AsyncMock()
+
+    assert await db_pool.check_pool_health(engine) is False
+    engine.dispose.assert_awaited_once()
+    assert db_pool.health.stats()["ok"] is False
+
+
+def test_query_registry_names_and_records_queries():
+    from types import SimpleNamespace
+
+    from app.db.query_registry import QueryRegistry
+    from app.queries.song import GET_SONG_BY_ID_QUERY
+
+    registry = QueryRegistry()
+    assert registry.load() > 0
+    assert registry.name_for(GET_SONG_BY_ID_QUERY) == "song.GET_SONG_BY_ID_QUERY"
+    assert GET_SONG_BY_ID_QUERY in registry.select("song")
+    assert registry.select("") == []
+
+    registry.record(SimpleNamespace(query=GET_SONG_BY_ID_QUERY, elapsed=0.002, exception=None))
+    registry.record(SimpleNamespace(query=GET_SONG_BY_ID_QUERY, elapsed=0.004, exception=ValueError()))
+    registry.record(SimpleNamespace(query="SELECT 1", elapsed=1.0, exception=None))
+
+    stats = registry.stats()["queries"]
+    assert list(stats) == ["song.GET_SONG_BY_ID_QUERY"]
+    assert stats["song.GET_SONG_BY_ID_QUERY"]["calls"] == 2
+    assert stats["song.GET_SONG_BY_ID_QUERY"]["errors"] == 1
+    assert stats["song.GET_SONG_BY_ID_QUERY"]["max_ms"] == 4.0
+
+
+@pytest.mark.asyncio
+async def test_statements_are_prepared_into_the_fetch_cache(monkeypatch):
+    from app.db import query_registry
+
+    # Guards the private asyncpg API behind the pin in requirements.txt.
+    assert query_registry.CACHED_PREPARE
+
+    conn = MagicMock()
+    conn._prepare = AsyncMock()
+    conn.prepare = AsyncMock()
+    await query_registry.prepare_cached(conn, "SELECT 1")
+    conn._prepare.assert_awaited_once_with("SELECT 1", use_cache=True)
+
+    monkeypatch.setattr(query_registry, "CACHED_PREPARE", False)
+    await query_registry.prepare_cached(conn, "SELECT 2")
+    conn.prepare.assert_awaited_once_with("SELECT 2")
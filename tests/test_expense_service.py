@@ -0,0 +1,118 @@
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.services.expense import ExpenseService
+
+
+def _service(rows):
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=rows)
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    return ExpenseService(MagicMock(acquire=acquire)), conn
+
+
+@pytest.mark.asyncio
+async def test_expense_summary_groups_and_running_total():
+    rows = [
+        {"period": date(2026, 1, 1), "category": "Food", "team_id": None,
+         "total": Decimal("10.50"), "expense_count": 2, "running_total": Decimal("10.50")},
+        {"period": date(2026, 2, 1), "category": "Food", "team_id": None,
+         "total": Decimal("4.50"), "expense_count": 1, "running_total": Decimal("15.00")},
+    ]
+    service, conn = _service(rows)
+
+    summary = await service.get_expense_summary(
+        "org", group_by="period,category", start_date="2026-01-01", running_total=True
+    )
+
+    args = conn.fetch.await_args.args[1:]
+    assert args == ("org", "month", date(2026, 1, 1), None, True, False, None)
+    assert summary["groups"][1] == {
+        "total": 4.5, "expense_count": 1, "period": "2026-02-01", "category": "Food", "running_total": 15.0,
+    }
+    assert summary["total"] == Decimal("15.00")
+    assert summary["expense_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_expense_summary_rejects_bad_params():
+    service, conn = _service([])
+    with pytest.raises(HTTPException) as exc:
+        await service.get_expense_summary("org", group_by="period,owner")
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        await service.get_expense_summary("org", start_date="2026-03-01", end_date="2026-01-01")
+    conn.fetch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_copies_valid_rows_and_reports_in_input_order():
+    from app.db.bulk import read_csv
+
+    csv_rows = read_csv(
+        "﻿title,amount,expense_date,category\n"
+        "Bottles,20,2026-02-27,Food\n"
+        ",5,2026-02-27,\n"
+        "Chairs,100.50,2026-03-01,\n".encode()
+    )
+    assert csv_rows[0] == {"title": "Bottles", "amount": "20", "expense_date": "2026-02-27", "category": "Food"}
+    assert csv_rows[2]["category"] is None
+
+    service, conn = _service([])
+    conn.fetch = AsyncMock(side_effect=[
+        [{"id": 41}, {"id": 42}],
+        [{"id": 42, "title": "Chairs"}, {"id": 41, "title": "Bottles"}],
+    ])
+    conn.copy_records_to_table = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    conn.transaction.return_value = transaction
+
+    org = uuid.uuid4()
+    result = await service.save_bulk_expense_data(csv_rows, organization_id=str(org))
+
+    records = conn.copy_records_to_table.await_args.kwargs["records"]
+    assert [r[:3] for r in records] == [(41, "Bottles", Decimal("20")), (42, "Chairs", Decimal("100.50"))]
+    assert records[0][6] == org
+    assert result["total"] == 3 and result["successful"] == 2 and result["failed"] == 1
+    assert result["success"] is False
+    assert [entry["status"] for entry in result["data"]] == ["success", "failed", "success"]
+    assert result["data"][1]["error"] == "title is required and cannot be empty"
+    assert result["data"][2]["data"] == {"id": 42, "title": "Chairs"}
+
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_rejects_rows_copy_would_choke_on():
+    service, conn = _service([])
+    conn.fetch = AsyncMock(side_effect=[[{"id": 7}], [{"id": 7, "title": "Ok"}]])
+    conn.copy_records_to_table = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    conn.transaction.return_value = transaction
+    org = str(uuid.uuid4())
+    base = {"title": "Ok", "amount": "1", "expense_date": "2026-02-27", "organization_id": org}
+
+    result = await service.save_bulk_expense_data([
+        {**base, "organization_id": "not-a-uuid"},
+        {**base, "team_id": "nope"},
+        {**base, "category": 12},
+        {**base, "description": ["x"]},
+        {**base, "title": 5},
+        base,
+    ])
+
+    assert [entry["status"] for entry in result["data"]] == ["failed"] * 5 + ["success"]
+    assert len(conn.copy_records_to_table.await_args.kwargs["records"]) == 1
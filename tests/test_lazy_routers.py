@@ -0,0 +1,37 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routers import ROUTER_GROUPS, include_routers
+from app.api.routers.lazy import LazyRouterGroup
+
+pytestmark = pytest.mark.asyncio
+
+
+def _app(lazy):
+    app = FastAPI()
+    include_routers(app, lazy=lazy)
+    app.state.db = None
+    return app
+
+
+def _stand_ins(app):
+    return [route.group.prefix for route in app.routes if isinstance(route, LazyRouterGroup)]
+
+
+async def test_first_request_loads_only_its_group():
+    app = _app(lazy=True)
+    assert len(_stand_ins(app)) == len(ROUTER_GROUPS)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.delete("/song/get")).status_code == 405
+        # Unknown paths under a group still fall through to the root catch-all.
+        assert (await client.get("/user/nowhere")).status_code == 307
+    assert "/song" not in _stand_ins(app) and "/user" not in _stand_ins(app)
+    assert len(_stand_ins(app)) == len(ROUTER_GROUPS) - 2
+
+
+async def test_lazy_and_eager_apps_expose_the_same_api():
+    lazy, eager = _app(lazy=True), _app(lazy=False)
+    assert sorted(lazy.openapi()["paths"]) == sorted(eager.openapi()["paths"])
+    assert _stand_ins(lazy) == []
+    assert [type(r) for r in lazy.routes] == [type(r) for r in eager.routes]
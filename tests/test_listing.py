@@ -0,0 +1,77 @@
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.services.expense import EXPENSE_LISTING
+from app.db.listing import (
+    InvalidListingParams,
+    PageRequest,
+    build_listing_query,
+    fetch_page,
+    stream_json_array,
+)
+from app.db.pagination import decode_cursor
+from app.queries.expense import GET_EXPENSES_BY_ORGANIZATION_QUERY
+
+
+def test_listing_query_strips_order_and_appends_keyset():
+    keys = EXPENSE_LISTING.keys("date")
+    sql = build_listing_query(GET_EXPENSES_BY_ORGANIZATION_QUERY, 1, keys, True, True)
+    assert "created_at DESC" not in sql
+    assert "WHERE (listing.expense_date, listing.id) < ($2::text::date, $3::text::int4)" in sql
+    assert sql.endswith("ORDER BY listing.expense_date DESC, listing.id DESC LIMIT $4")
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_returns_cursor_only_when_more_rows():
+    rows = [{"expense_date": date(2026, 3, 1), "id": n} for n in (3, 2, 1)]
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=rows)
+
+    page = await fetch_page(conn, GET_EXPENSES_BY_ORGANIZATION_QUERY, ["org"], EXPENSE_LISTING, PageRequest(limit=2))
+    assert [r["id"] for r in page.items] == [3, 2]
+    assert decode_cursor(page.next_cursor, 2) == ["2026-03-01", "2"]
+    assert conn.fetch.await_args.args[-1] == 3
+
+    conn.fetch = AsyncMock(return_value=rows[:2])
+    page = await fetch_page(conn, GET_EXPENSES_BY_ORGANIZATION_QUERY, ["org"], EXPENSE_LISTING, PageRequest(limit=2))
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_rejects_bad_sort_and_cursor():
+    conn = MagicMock()
+    with pytest.raises(InvalidListingParams):
+        await fetch_page(conn, GET_EXPENSES_BY_ORGANIZATION_QUERY, ["org"], EXPENSE_LISTING, PageRequest(sort="nope"))
+    with pytest.raises(InvalidListingParams):
+        await fetch_page(conn, GET_EXPENSES_BY_ORGANIZATION_QUERY, ["org"], EXPENSE_LISTING, PageRequest(cursor="!!"))
+
+
+@pytest.mark.asyncio
+async def test_stream_json_array_yields_chunks():
+    async def cursor(*args, **kwargs):
+        for n in range(5):
+            yield {"id": n}
+
+    conn = MagicMock()
+    conn.cursor = cursor
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    conn.transaction.return_value = transaction
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    pool = MagicMock(acquire=acquire)
+    body = stream_json_array(
+        pool, GET_EXPENSES_BY_ORGANIZATION_QUERY, ["org"], EXPENSE_LISTING, dict, chunk_rows=2
+    )
+    chunks = [chunk async for chunk in body]
+    assert len(chunks) == 5  # "[", 2 + 2 + 1 rows, "]"
+    assert json.loads(b"".join(chunks)) == [{"id": n} for n in range(5)]
+
@@ -0,0 +1,200 @@
+import asyncio
+import uuid
+
+import aiosmtplib
+import pytest
+
+from app.core.config import settings
+from app.queries.mail_outbox import (
+    FAIL_EXHAUSTED_MAIL_LEASES_QUERY,
+    MARK_MAIL_RETRY_QUERY,
+    MARK_MAIL_SENT_QUERY,
+    RENEW_MAIL_LEASES_QUERY,
+)
+from app.utils.mail_queue import MailWorker, enqueue_mail, retry_delay
+from app.utils.smtp_pool import SMTPPool, build_message
+
+
+class StandInSMTP:
+    """Just enough of an SMTP server on localhost to count sessions and messages."""
+
+    def __init__(self):
+        self.connections = 0
+        self.messages: list[str] = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+
+        async def reply(line):
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        await reply("220 stand-in ready")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO") or command.startswith("HELO"):
+                await reply("250 stand-in")
+            elif command.startswith("RCPT TO") and "REJECT" in command:
+                await reply("550 no such user")
+            elif command.startswith("RCPT TO") and "GREYLIST" in command:
+                await reply("450 try again later")
+            elif command == "DATA":
+                await reply("354 go ahead")
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    data += await reader.readline()
+                self.messages.append(data.decode())
+                await reply("250 queued")
+            elif command == "QUIT":
+                await reply("221 bye")
+                break
+            else:
+                await reply("250 ok")
+        writer.close()
+
+
+def _pool(port, size=1):
+    return SMTPPool(hostname="127.0.0.1", port=port, start_tls=False, size=size, timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_pool_sends_many_messages_per_connection():
+    async with StandInSMTP() as server:
+        pool = _pool(server.port)
+        for n in range(5):
+            await pool.send(build_message("volunteer@example.com", f"Rota {n}", "See you Sunday", sender="rota@example.com"))
+        await pool.close()
+    assert len(server.messages) == 5
+    assert server.connections == 1
+    assert pool.stats()["messages_sent"] == 5
+
+
+@pytest.mark.asyncio
+async def test_rejected_recipient_keeps_connection():
+    async with StandInSMTP() as server:
+        pool = _pool(server.port)
+        with pytest.raises(aiosmtplib.SMTPRecipientsRefused):
+            await pool.send(build_message("reject@example.com", "Hi", "Body", sender="rota@example.com"))
+        await pool.send(build_message("ok@example.com", "Hi", "Body", sender="rota@example.com"))
+        await pool.close()
+    assert server.connections == 1
+    assert len(server.messages) == 1
+
+
+class _Outbox:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    async def fetch(self, query, *args):
+        rows, self.rows = self.rows, []
+        return rows
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+
+@pytest.mark.asyncio
+async def test_worker_marks_sent_and_schedules_retries(monkeypatch):
+    monkeypatch.setattr(settings, "MAIL_QUEUE_RETRY_BASE_SECONDS", 30)
+    monkeypatch.setattr(settings, "MAIL_QUEUE_MAX_ATTEMPTS", 5)
+    monkeypatch.setattr(settings, "GMAIL_USERNAME", "rota@example.com")
+    rows = [
+        {"id": uuid.uuid4(), "to_email": f"v{n}@example.com", "subject": "Rota", "body": "Sunday", "html": False, "attempts": 1}
+        for n in range(3)
+    ]
+    rows.append({"id": uuid.uuid4(), "to_email": "reject@example.com", "subject": "Rota", "body": "Sunday", "html": False, "attempts": 1})
+    async with StandInSMTP() as server:
+        pool = _pool(server.port, size=2)
+        outbox = _Outbox(rows)
+        assert await MailWorker(outbox, pool).run_once() == 4
+        await pool.close()
+
+    assert server.connections <= 2 and len(server.messages) == 3
+    (lease_query, lease_args), (sent_query, (sent_ids,)), (retry_query, retry_args) = outbox.executed
+    assert lease_query == FAIL_EXHAUSTED_MAIL_LEASES_QUERY and lease_args == (settings.MAIL_QUEUE_LEASE_SECONDS, 5)
+    assert sent_query == MARK_MAIL_SENT_QUERY and set(sent_ids) == {r["id"] for r in rows[:3]}
+    # A 5xx refusal is permanent: no retry delay, the message is failed.
+    assert retry_query == MARK_MAIL_RETRY_QUERY and retry_args[:2] == (rows[3]["id"], None)
+
+
+def test_retry_delay_backs_off_until_attempts_run_out(monkeypatch):
+    monkeypatch.setattr(settings, "MAIL_QUEUE_RETRY_BASE_SECONDS", 30)
+    monkeypatch.setattr(settings, "MAIL_QUEUE_MAX_ATTEMPTS", 4)
+    assert [retry_delay(n) for n in (1, 2, 3, 4)] == [30, 60, 120, None]
+
+
+def _row(to_email, subject="Rota", attempts=1):
+    return {"id": uuid.uuid4(), "to_email": to_email, "subject": subject, "body": "Sunday", "html": False, "attempts": attempts}
+
+
+@pytest.mark.asyncio
+async def test_unbuildable_row_does_not_stall_the_batch(monkeypatch):
+    monkeypatch.setattr(settings, "GMAIL_USERNAME", "rota@example.com")
+    good, bad = _row("ok@example.com"), _row("v@example.com", subject="Rota\nBcc: x@example.com")
+    async with StandInSMTP() as server:
+        pool = _pool(server.port)
+        outbox = _Outbox([good, bad])
+        assert await MailWorker(outbox, pool).run_once() == 2
+        await pool.close()
+
+    assert len(server.messages) == 1
+    _, (sent_query, (sent_ids,)), (retry_query, retry_args) = outbox.executed
+    assert sent_query == MARK_MAIL_SENT_QUERY and sent_ids == [good["id"]]
+    assert retry_query == MARK_MAIL_RETRY_QUERY and retry_args[:2] == (bad["id"], None)
+
+
+@pytest.mark.asyncio
+async def test_greylisted_recipient_is_retried(monkeypatch):
+    monkeypatch.setattr(settings, "GMAIL_USERNAME", "rota@example.com")
+    monkeypatch.setattr(settings, "MAIL_QUEUE_RETRY_BASE_SECONDS", 30)
+    monkeypatch.setattr(settings, "MAIL_QUEUE_MAX_ATTEMPTS", 5)
+    row = _row("greylist@example.com")
+    async with StandInSMTP() as server:
+        pool = _pool(server.port)
+        outbox = _Outbox([row])
+        await MailWorker(outbox, pool).run_once()
+        await pool.close()
+
+    _, (retry_query, retry_args) = outbox.executed
+    assert retry_query == MARK_MAIL_RETRY_QUERY and retry_args[:2] == (row["id"], 30)
+
+
+class _SlowSMTP:
+    async def send(self, message):
+        await asyncio.sleep(0.1)
+
+
+@pytest.mark.asyncio
+async def test_worker_renews_the_lease_while_a_batch_is_sending(monkeypatch):
+    monkeypatch.setattr(settings, "GMAIL_USERNAME", "rota@example.com")
+    monkeypatch.setattr(settings, "MAIL_QUEUE_LEASE_SECONDS", 0.03)
+    rows = [_row("a@example.com"), _row("b@example.com")]
+    outbox = _Outbox(rows)
+    assert await MailWorker(outbox, _SlowSMTP()).run_once() == 2
+
+    renewals = [args for query, args in outbox.executed if query == RENEW_MAIL_LEASES_QUERY]
+    assert renewals and all(ids == [r["id"] for r in rows] for (ids,) in renewals)
+    # Renewal stops once the outcome is recorded.
+    count = len(outbox.executed)
+    await asyncio.sleep(0.05)
+    assert len(outbox.executed) == count
+    assert outbox.executed[-1][0] == MARK_MAIL_SENT_QUERY
+
+
+@pytest.mark.asyncio
+async def test_enqueue_refuses_line_breaks_in_headers():
+    outbox = _Outbox([])
+    with pytest.raises(ValueError):
+        await enqueue_mail(outbox, [{"to": "a@example.com", "subject": "Hi\r\nBcc: b@example.com", "body": "x"}])
+    assert outbox.executed == []
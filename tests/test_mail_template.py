@@ -0,0 +1,148 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.services.mail import MailTemplateService
+from app.core.config import settings
+from app.queries.mail_outbox import ENQUEUE_MAIL_QUERY
+from app.utils.mail_template import (
+    CompiledMailTemplate,
+    compile_mail_template,
+    invalidate_mail_templates,
+    recipient_variables,
+)
+
+TEMPLATE = {
+    "id": uuid.uuid4(),
+    "key": "rota_reminder",
+    "subject": "Hi {{first_name}}",
+    "body": "{{ name }}, you are serving at {{organization_name}}. {{unknown}}",
+    "updated_at": datetime(2026, 1, 1),
+    "organization_id": None,
+}
+OVERRIDE = {**TEMPLATE, "id": uuid.uuid4(), "subject": "Welcome to {{organization_name}}", "organization_id": uuid.uuid4()}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_template_cache():
+    invalidate_mail_templates()
+    yield
+    invalidate_mail_templates()
+
+
+def test_render_fills_known_variables_and_keeps_unknown():
+    subject, body = CompiledMailTemplate(TEMPLATE).render(
+        recipient_variables({"email": "a@example.com", "first_name": "Ada", "last_name": "Lovelace"}, {"organization_name": "St Mark's"})
+    )
+    assert subject == "Hi Ada"
+    assert body == "Ada Lovelace, you are serving at St Mark's. {{unknown}}"
+
+
+def test_compiled_template_is_reused_until_updated():
+    first = compile_mail_template(TEMPLATE)
+    assert compile_mail_template(dict(TEMPLATE)) is first
+    edited = {**TEMPLATE, "subject": "Hello {{first_name}}", "updated_at": datetime(2026, 2, 1)}
+    assert compile_mail_template(edited).render({"first_name": "Ada"})[0] == "Hello Ada"
+
+
+class _Conn:
+    def __init__(self, db):
+        self.db = db
+
+    async def fetch(self, query, *args):
+        self.db.lookups += 1
+        return [row for row in self.db.templates if row["key"] == args[0]]
+
+    async def fetchrow(self, query, *args):
+        return {"id": uuid.uuid4(), "key": args[0], "subject": args[1], "body": args[2], "organization_id": args[3]}
+
+
+class _Acquire:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return _Conn(self.db)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Db:
+    def __init__(self, templates=(TEMPLATE,)):
+        self.templates = list(templates)
+        self.lookups = 0
+        self.executed = []
+
+    def acquire(self):
+        return _Acquire(self)
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+
+@pytest.mark.asyncio
+async def test_bulk_send_queues_in_batches_with_shared_batch_id(monkeypatch):
+    monkeypatch.setattr(settings, "MAIL_BULK_BATCH_SIZE", 2)
+    db = _Db()
+    users = [{"email": f"v{n}@example.com", "first_name": f"V{n}"} for n in range(5)]
+    users.insert(2, {"first_name": "No email"})
+
+    result = await MailTemplateService(db).send_bulk_mail_with_template("rota_reminder", users, organization_id="org-1")
+
+    assert result["total_users"] == 6 and result["queued"] == 5 and result["failed"] == 1
+    assert [d["status"] for d in result["details"]].count("failed") == 1
+    assert all(d.get("message_id") for d in result["details"] if d["status"] == "queued")
+    assert [q for q, _ in db.executed] == [ENQUEUE_MAIL_QUERY] * 3
+    batch_ids = {args[-1] for _, args in db.executed}
+    assert batch_ids == {uuid.UUID(result["batch_id"])}
+    subjects = [s for _, args in db.executed for s in args[3]]
+    assert subjects == [f"Hi V{n}" for n in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_send_rejects_too_many_recipients(monkeypatch):
+    monkeypatch.setattr(settings, "MAIL_BULK_MAX_RECIPIENTS", 2)
+    with pytest.raises(HTTPException) as err:
+        await MailTemplateService(_Db()).send_bulk_mail_with_template("rota_reminder", [{"email": "a@x"}] * 3)
+    assert err.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_template_lookup_is_cached_and_resolves_org_overrides():
+    db = _Db([TEMPLATE, OVERRIDE])
+    service = MailTemplateService(db)
+
+    assert (await service.get_template_by_key("rota_reminder"))["id"] == TEMPLATE["id"]
+    assert (await service.get_template_by_key("rota_reminder", str(OVERRIDE["organization_id"])))["id"] == OVERRIDE["id"]
+    assert (await service.get_template_by_key("rota_reminder", str(uuid.uuid4())))["id"] == TEMPLATE["id"]
+    assert (await service.get_mail_template_data({"key": "rota_reminder"}))[0]["id"] == TEMPLATE["id"]
+    assert db.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_saving_a_template_invalidates_its_key():
+    db = _Db([])
+    service = MailTemplateService(db)
+    with pytest.raises(HTTPException) as err:
+        await service.get_template_by_key("rota_reminder")
+    assert err.value.status_code == 404
+
+    await service.save_mail_template_data({"key": "rota_reminder", "subject": "s", "body": "b"})
+    db.templates.append(TEMPLATE)
+    assert (await service.get_template_by_key("rota_reminder"))["id"] == TEMPLATE["id"]
+    assert db.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_send_fails_recipients_whose_subject_would_break_headers():
+    db = _Db()
+    users = [{"email": "a@example.com", "first_name": "Ada\nBcc: x@example.com"}, {"email": "b@example.com", "first_name": "Bo"}]
+
+    result = await MailTemplateService(db).send_bulk_mail_with_template("rota_reminder", users)
+
+    assert result["queued"] == 1 and result["failed"] == 1
+    assert result["details"][0]["status"] == "failed"
+    assert [s for _, args in db.executed for s in args[3]] == ["Hi Bo"]
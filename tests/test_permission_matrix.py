@@ -0,0 +1,73 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.auth_context import AuthContext
+from app.api.permission_matrix import (
+    NO_PERMISSIONS,
+    PermissionMatrix,
+    invalidate_permissions,
+    load_permission_matrix,
+)
+from app.service_rota.permissions import resolve_rota_role
+
+MODULE = uuid.uuid4()
+TEAM = uuid.uuid4()
+OTHER_TEAM = uuid.uuid4()
+
+
+def _row(role_name, module_id=None, module_name=None, team_id=None, **flags):
+    return {
+        "role_name": role_name, "role_type": None, "module_id": module_id, "module_name": module_name,
+        "team_id": team_id, "view": False, "edit": False, "create": False, "delete": False, **flags,
+    }
+
+
+def test_matrix_combines_org_wide_and_team_grants():
+    matrix = PermissionMatrix.from_rows([
+        _row("Volunteer", MODULE, "Service Rota", None, view=True),
+        _row("Team Lead", MODULE, "Service Rota", TEAM, edit=True, create=True),
+    ])
+    assert matrix.can(MODULE, "view", OTHER_TEAM)
+    assert matrix.can("service rota", "edit", TEAM)
+    assert matrix.can(str(MODULE), "create")
+    assert not matrix.can(MODULE, "edit", OTHER_TEAM)
+    assert not matrix.can(MODULE, "delete", TEAM)
+    assert not matrix.can("inventory", "view")
+    assert matrix.has_role("team_lead")
+
+
+@pytest.mark.asyncio
+async def test_matrix_is_cached_per_user_until_invalidated():
+    org, user = uuid.uuid4(), str(uuid.uuid4())
+    pool = MagicMock()
+    pool.fetch = AsyncMock(return_value=[_row("Pastor")])
+
+    first = await load_permission_matrix(pool, org, user)
+    assert await load_permission_matrix(pool, org, user) is first
+    assert pool.fetch.await_count == 1
+
+    invalidate_permissions(org)
+    await load_permission_matrix(pool, org, user)
+    assert pool.fetch.await_count == 2
+
+    assert (await load_permission_matrix(pool, org, "anonymous")).superuser
+    assert await load_permission_matrix(pool, org, "unknown") is NO_PERMISSIONS
+    assert await load_permission_matrix(pool, org, "legacy-user") is NO_PERMISSIONS
+    assert not (await load_permission_matrix(pool, org, "someone@example.com")).roles
+
+
+def test_resolve_rota_role_uses_roles_and_module_grants():
+    org = uuid.uuid4()
+
+    def auth(matrix, user_id=None):
+        return AuthContext(organization_id=org, user_id=user_id or str(uuid.uuid4()), token="t", permissions=matrix)
+
+    assert resolve_rota_role(auth(None, "anonymous")) == "admin"
+    assert resolve_rota_role(auth(None, "unknown")) == "volunteer"
+    assert resolve_rota_role(auth(None)) == "volunteer"
+    assert resolve_rota_role(auth(PermissionMatrix.from_rows([_row("Senior Pastor")]))) == "pastor"
+    rota_editor = PermissionMatrix.from_rows([_row("Usher", MODULE, "Service Rota", edit=True)])
+    assert resolve_rota_role(auth(rota_editor)) == "team_head"
+    assert resolve_rota_role(auth(PermissionMatrix.from_rows([_row("Usher")]))) == "volunteer"
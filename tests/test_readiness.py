@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.db.pool import warm_pool
+from app.db.readiness import FAILED, READY, Readiness
+from main import app
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_wait_returns_once_init_finishes():
+    readiness = Readiness()
+    readiness.start(asyncio.sleep(0.01))
+    assert await readiness.wait(1) is True
+    assert readiness.state == READY and readiness.ready_after_ms is not None
+
+
+async def test_wait_times_out_without_cancelling_init():
+    readiness = Readiness()
+    task = readiness.start(asyncio.sleep(0.2))
+    assert await readiness.wait(0.01) is False
+    assert not task.cancelled()
+    assert await readiness.wait(1) is True
+
+
+async def test_failed_init_is_reported():
+    async def init():
+        raise RuntimeError("DATABASE_URL is not set")
+
+    readiness = Readiness()
+    readiness.start(init())
+    assert await readiness.wait(1) is False
+    assert readiness.state == FAILED and "DATABASE_URL" in readiness.error
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+    if hasattr(app.state, "readiness"):
+        del app.state.readiness
+
+
+async def test_gate_holds_requests_until_ready(client):
+    app.state.readiness = readiness = Readiness()
+    readiness.start(asyncio.sleep(0.05))
+
+    assert (await client.get("/ready")).status_code == 503
+    assert (await client.get("/health")).status_code == 200
+    assert (await client.get("/")).status_code == 200
+    ready = await client.get("/ready")
+    assert ready.status_code == 200 and ready.json()["smtp"] == "unverified"
+
+
+async def test_gate_answers_503_when_startup_failed(client, monkeypatch):
+    monkeypatch.setattr(settings, "READINESS_GATE_TIMEOUT_SECONDS", 0.01)
+    app.state.readiness = readiness = Readiness()
+    readiness.mark_failed("connection refused")
+
+    response = await client.get("/")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert response.json()["error"] == "connection refused"
+
+
+class _Connection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def __aenter__(self):
+        self.engine.attempts += 1
+        if self.engine.attempts in self.engine.failing:
+            raise OSError("connection refused")
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        return None
+
+
+class _Engine:
+    def __init__(self, failing=()):
+        self.attempts = 0
+        self.failing = set(failing)
+
+    def connect(self):
+        return _Connection(self)
+
+
+async def test_warm_pool_opens_connections_concurrently_and_tolerates_some_failures():
+    assert await warm_pool(_Engine(failing={2}), 3) == 2
+    with pytest.raises(OSError):
+        await warm_pool(_Engine(failing={1, 2}), 2)
@@ -0,0 +1,224 @@
+"""Service Rota repository unit tests (statement shape, no database)."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.service_rota.repository import RotaRepository, volunteer_count_delta
+
+ORG_ID = uuid4()
+SERVICE_ID = uuid4()
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.scalars = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+    session.execute = AsyncMock()
+    return session
+
+
+def _availability(user_id, availability: str = "available") -> dict:
+    return {
+        "organization_id": ORG_ID,
+        "service_id": SERVICE_ID,
+        "user_id": user_id,
+        "user_name": "Volunteer",
+        "team_id": None,
+        "team_name": None,
+        "role": None,
+        "availability": availability,
+        "comment": "",
+        "comments": [],
+        "updated_by_id": None,
+        "updated_by_name": "pytest",
+    }
+
+
+def _compiled(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_availability_single_statement(session):
+    repo = RotaRepository(session)
+    user_a, user_b = uuid4(), uuid4()
+    await repo.bulk_upsert_availability(
+        [
+            _availability(user_a, "not_sure"),
+            _availability(user_b),
+            _availability(user_a, "available"),
+        ]
+    )
+
+    session.scalars.assert_awaited_once()
+    stmt = session.scalars.await_args.args[0]
+    sql = _compiled(stmt)
+    assert "ON CONFLICT (organization_id, service_id, user_id) DO UPDATE" in sql
+    assert "RETURNING" in sql
+    # Duplicate users collapse to the last record so the statement touches each row once.
+    assert "user_id_m1" in sql
+    assert "user_id_m2" not in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_availability_merges_duplicate_users(session):
+    repo = RotaRepository(session)
+    user = uuid4()
+    team = uuid4()
+    first = {**_availability(user, "not_sure"), "team_id": team, "role": "Usher"}
+    second = {**_availability(user, "available"), "role": None}
+    await repo.bulk_upsert_availability([first, second])
+
+    params = session.scalars.await_args.args[0].compile(dialect=postgresql.dialect()).params
+    assert params["availability_m0"] == "available"
+    # None in the later record keeps the earlier value, as coalesce would.
+    assert params["team_id_m0"] == team
+    assert params["role_m0"] == "Usher"
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_availability_empty(session):
+    repo = RotaRepository(session)
+    assert await repo.bulk_upsert_availability([]) == []
+    session.scalars.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    ("previous", "current", "expected"),
+    [
+        (None, "available", 1),
+        (None, "not_sure", 0),
+        ("not_sure", "available_all_day", 1),
+        ("available", "available_all_day", 0),
+        ("available", "unavailable", -1),
+        ("unavailable", "not_sure", 0),
+    ],
+)
+def test_volunteer_count_delta(previous, current, expected):
+    assert volunteer_count_delta(previous, current) == expected
+
+
+@pytest.mark.asyncio
+async def test_adjust_volunteer_count_skips_zero_delta(session):
+    repo = RotaRepository(session)
+    await repo.adjust_volunteer_count(ORG_ID, SERVICE_ID, 0)
+    session.execute.assert_not_awaited()
+
+    await repo.adjust_volunteer_count(ORG_ID, SERVICE_ID, -2)
+    sql = _compiled(session.execute.await_args.args[0])
+    assert "volunteer_count=(rota_services.volunteer_count + " in sql.replace(" = ", "=")
+    assert "count(" not in sql
+
+
+@pytest.mark.asyncio
+async def test_reconcile_volunteer_counts_only_updates_drift(session):
+    session.execute.return_value = MagicMock(rowcount=3)
+    repo = RotaRepository(session)
+    assert await repo.reconcile_volunteer_counts(ORG_ID) == 3
+    sql = _compiled(session.execute.await_args.args[0])
+    assert sql.startswith("UPDATE rota_services SET volunteer_count=(SELECT count(*)")
+    assert "rota_services.volunteer_count != (SELECT count(*)" in sql
+
+
+@pytest.mark.asyncio
+async def test_week_assignments_filters_with_any(session):
+    from datetime import date
+
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+    repo = RotaRepository(session)
+    await repo.week_assignments(
+        ORG_ID,
+        date(2026, 6, 1),
+        date(2026, 6, 7),
+        team_ids=[uuid4() for _ in range(20)],
+        user_ids=[uuid4()],
+        group_by="user",
+    )
+    session.execute.assert_awaited_once()
+    sql = _compiled(session.execute.await_args.args[0])
+    assert "rota_assignments.team_id = ANY (" in sql
+    assert "rota_assignments.user_id = ANY (" in sql
+    assert "ORDER BY rota_assignments.user_name, rota_assignments.user_id, rota_services.date" in sql
+
+
+@pytest.mark.asyncio
+async def test_sync_attendance_is_one_insert_select(session):
+    repo = RotaRepository(session)
+    await repo.sync_attendance_from_assignments(ORG_ID, SERVICE_ID)
+    session.scalars.assert_awaited_once()
+    session.execute.assert_not_awaited()
+    sql = _compiled(session.scalars.await_args.args[0])
+    assert sql.startswith("INSERT INTO rota_attendance")
+    assert "SELECT DISTINCT ON (rota_assignments.user_id)" in sql
+    assert "ON CONFLICT (organization_id, service_id, user_id) DO UPDATE" in sql
+    assert "status = 'pending'" in sql
+    assert "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_attendance_sync_diff_outer_joins_existing_rows(session):
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+    repo = RotaRepository(session)
+    assert await repo.attendance_sync_diff(ORG_ID, SERVICE_ID) == []
+    sql = _compiled(session.execute.await_args.args[0])
+    assert "LEFT OUTER JOIN rota_attendance" in sql
+
+
+@pytest.mark.asyncio
+async def test_list_services_keyset_skips_count_and_offset(session):
+    from datetime import date
+
+    session.execute.return_value = MagicMock(
+        scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+    )
+    repo = RotaRepository(session)
+    rows, total = await repo.list_services(
+        ORG_ID,
+        limit=25,
+        after=(date(2026, 6, 7), uuid4()),
+        include_total=False,
+    )
+    assert rows == [] and total is None
+    session.execute.assert_awaited_once()
+    sql = _compiled(session.execute.await_args.args[0])
+    assert "count(" not in sql
+    assert "OFFSET" not in sql
+    assert "rota_services.date >= " in sql
+    assert "ORDER BY rota_services.date ASC, rota_services.id ASC" in sql
+
+
+@pytest.mark.asyncio
+async def test_lock_service_selects_for_update(session):
+    repo = RotaRepository(session)
+    session.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+    assert await repo.lock_service(ORG_ID, SERVICE_ID) is False
+    assert _compiled(session.execute.await_args.args[0]).rstrip().endswith("FOR UPDATE")
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_availability_locks_service_before_reading_statuses(session):
+    from app.api.auth_context import AuthContext
+    from app.service_rota.schemas import AvailabilityCreate
+    from app.service_rota.service import ServiceRotaService
+
+    service = ServiceRotaService(session)
+    repo = service.repo = AsyncMock()
+    session.commit = AsyncMock()
+    user = uuid4()
+    repo.availability_statuses.return_value = {}
+    repo.bulk_upsert_availability.return_value = [MagicMock(user_id=user, availability="available")]
+    auth = AuthContext(organization_id=ORG_ID, user_id=str(uuid4()), token="t")
+    record = AvailabilityCreate(organization_id=ORG_ID, service_id=SERVICE_ID, user_id=user, user_name="V")
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("app.service_rota.service.availability_to_dict", lambda row: {"user_id": row.user_id})
+        await service.bulk_save_availability(auth, SERVICE_ID, [record])
+
+    calls = [name for name, _, _ in repo.mock_calls]
+    assert calls.index("lock_service") < calls.index("availability_statuses")
+    repo.adjust_volunteer_count.assert_awaited_once_with(ORG_ID, SERVICE_ID, 1)
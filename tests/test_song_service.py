@@ -0,0 +1,15 @@
+from app.api.services.song import _like_prefix, _search_result
+
+
+def test_song_search_result_shape_and_like_escaping():
+    row = {
+        "id": 7, "title": "Way Maker", "artist": "Sinach", "lyrics": "…", "organization_id": 1,
+        "tsq": "'way'", "rank": 0.25, "similarity": 0.4,
+        "title_highlight": "<mark>Way</mark> Maker", "artist_highlight": "Sinach", "lyrics_highlight": "",
+    }
+    song = _search_result(row)
+    assert song["rank"] == 0.25
+    assert song["highlights"] == {"title": "<mark>Way</mark> Maker", "artist": "Sinach", "lyrics": None}
+    assert "tsq" not in song and "title_highlight" not in song
+
+    assert _like_prefix("100%_") == "100\\%\\_"